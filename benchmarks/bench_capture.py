@@ -0,0 +1,57 @@
+"""Capture benchmark
+
+Records the game at the target FPS in each format, and reports the time recording adds to each frame along with how
+many frames the worker could not keep up with and dropped. Frames are written to a temporary directory.
+
+Usage:
+    python benchmarks/bench_capture.py [frames]
+
+Author: Josh Rogers
+"""
+
+import sys
+import tempfile
+import time
+
+from common import setup
+
+setup()
+
+import pygame
+
+from dindins.capture import Recorder, FORMATS
+from dindins.main import GameScreen
+from dindins.settings import FPS
+
+FRAMES = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+
+
+def main():
+    screen = GameScreen()
+    window = pygame.display.get_surface()
+
+    for format in FORMATS:
+        with tempfile.TemporaryDirectory() as path:
+            recorder = Recorder(path, format)
+            spent = 0
+            for _ in range(FRAMES):
+                frame = time.perf_counter()
+                screen.update()
+                screen.simulate()
+                screen.render()
+                window.blit(screen, (0, 0))
+                start = time.perf_counter()
+                recorder.capture(window)
+                spent += time.perf_counter() - start
+                time.sleep(max(1 / FPS - (time.perf_counter() - frame), 0))
+
+            start = time.perf_counter()
+            summary = recorder.close()
+            print(f'{format}:')
+            print(f'  per frame:    {spent / FRAMES * 1000:.3f} ms')
+            print(f'  finishing:    {time.perf_counter() - start:.2f} s')
+            print(f'  {summary.split(" to ")[0]}, {recorder.dropped} dropped')
+
+
+if __name__ == '__main__':
+    main()
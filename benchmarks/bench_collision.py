@@ -0,0 +1,50 @@
+"""Collision benchmark
+
+Compares the cost of testing the player against the colliders around them using bounding boxes only against precise collision using image masks. The
+player is placed both in open floor, where no rects overlap, and against the bed, where the masks must be tested.
+
+Usage:
+    python benchmarks/bench_collision.py
+
+Author: Josh Rogers
+"""
+
+from common import setup, timeit
+
+setup()
+
+from dindins.main import GameScreen
+from dindins.collision import collide
+
+ITERATIONS = 2000
+
+
+def place(screen, name):
+    """Moves the world so the player is standing on the center of the named object's bounding box"""
+    object = screen.gameobjects.get(name)
+    x = screen.player.sprite.rect.centerx - object.boundingbox.centerx
+    y = screen.player.sprite.rect.centery - object.boundingbox.centery
+    for sprite in screen.gameobjects.sprites():
+        sprite.move(x, y)
+
+
+def colliding(screen):
+    """Checks if the player collides with any object"""
+    player = screen.player.sprite
+    return any(collide(player, object) for object in screen.gameobjects.colliders(player.rect))
+
+
+def main():
+    print(f'{"mode":<10}{"position":<12}{"us/call":>10}{"collides":>10}')
+    for precise in (False, True):
+        mode = 'precise' if precise else 'rect'
+
+        screen = GameScreen(precise=precise)
+        print(f'{mode:<10}{"open":<12}{timeit(lambda: colliding(screen), ITERATIONS):>10.1f}{colliding(screen):>10}')
+
+        place(screen, 'bed')
+        print(f'{mode:<10}{"touching":<12}{timeit(lambda: colliding(screen), ITERATIONS):>10.1f}{colliding(screen):>10}')
+
+
+if __name__ == '__main__':
+    main()
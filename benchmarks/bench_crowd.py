@@ -0,0 +1,47 @@
+"""Crowd benchmark
+
+Runs the game with a large crowd of wandering NPCs and reports the average frame time of update and render, against
+the frame budget of the target FPS.
+
+Usage:
+    python benchmarks/bench_crowd.py [count] [frames]
+
+Author: Josh Rogers
+"""
+
+import sys
+import time
+
+from common import setup
+
+setup()
+
+from dindins.main import GameScreen
+from dindins.settings import FPS
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+FRAMES = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+
+def frametime(screen):
+    """Average milliseconds to update and render one frame"""
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        screen.update()
+        screen.simulate()
+        screen.render()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    baseline = frametime(GameScreen(crowd=0))
+    frame = frametime(GameScreen(crowd=COUNT))
+
+    print(f'npcs:           {COUNT}')
+    print(f'no crowd:       {baseline:.2f} ms')
+    print(f'crowd:          {frame:.2f} ms ({1000 / frame:.0f} FPS, budget {1000 / FPS:.2f} ms)')
+    print(f'holds {FPS} FPS:   {frame <= 1000 / FPS}')
+
+
+if __name__ == '__main__':
+    main()
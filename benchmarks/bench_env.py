@@ -0,0 +1,47 @@
+"""Environment benchmark
+
+Measures how many steps per second the agent environment can run, for a single environment and for a VecEnv with one
+worker per core.
+
+Usage:
+    python benchmarks/bench_env.py [steps]
+
+Author: Josh Rogers
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+
+from common import setup
+
+setup()
+
+from dindins.env import ACTIONS, DinDinsEnv, VecEnv
+
+STEPS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+
+def main():
+    env = DinDinsEnv()
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        env.step(random.randrange(len(ACTIONS)))
+    single = STEPS / (time.perf_counter() - start)
+    print(f'{"envs":<8}{"steps/s":>10}')
+    print(f'{1:<8}{single:>10.0f}')
+
+    count = multiprocessing.cpu_count()
+    envs = VecEnv(count)
+    envs.reset()
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        envs.step([random.randrange(len(ACTIONS)) for _ in range(count)])
+    print(f'{count:<8}{STEPS * count / (time.perf_counter() - start):>10.0f}')
+    envs.close()
+
+
+if __name__ == '__main__':
+    main()
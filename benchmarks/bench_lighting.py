@@ -0,0 +1,47 @@
+"""Lighting benchmark
+
+Times baking the lightmaps of the house in a single process against the process pool, at a fine lightmap resolution so
+baking takes long enough to measure, and the time to light a frame with the baked lightmaps.
+
+Usage:
+    python benchmarks/bench_lighting.py [cellsize]
+
+Author: Josh Rogers
+"""
+
+import os
+import sys
+import time
+
+from common import setup, timeit
+
+setup()
+
+import pygame
+
+from dindins import level, lighting
+from dindins.main import GameScreen
+from dindins.settings import WIDTH, HEIGHT
+
+CELLSIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+
+def main():
+    screen = GameScreen()
+    house = lighting.scene(
+        screen.gameobjects, level.ROOMS, level.OUTDOORS, level.AMBIENT, level.WINDOW_LIGHT, level.LIGHTS, cellsize=CELLSIZE
+    )
+
+    print(f'cellsize:       {CELLSIZE}px')
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        maps = lighting.bake(house, workers)
+        print(f'bake {workers:>2} worker{"s" if workers > 1 else " "}: {time.perf_counter() - start:.2f} s')
+
+    lights = lighting.Lighting(screen.gameobjects, house, maps)
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    print(f'light a frame:  {timeit(lambda: lights.draw(surface), 200) / 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Memory benchmark
+
+Compares the memory used by a large map of floor tiles kept as one sprite per tile in a pygame.sprite.Group, against
+the same tiles in the static store of an ObjectsGroup. Memory is measured with tracemalloc, so only Python allocations
+are counted; tile images are shared in both cases.
+
+Usage:
+    python benchmarks/bench_memory.py [size]
+
+Author: Josh Rogers
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import pygame
+
+from common import setup
+
+setup()
+
+from dindins.objects import ObjectsGroup, tileset
+
+SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+
+
+def measure(group):
+    """Measures the memory held by a group filled with a SIZE x SIZE tileset
+
+    Args:
+        group: Callable returning an empty group
+
+    Returns:
+        Tuple of (number of tiles, bytes allocated)
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = group()
+    objects.add(tileset((0, 0), SIZE, SIZE, 'floor'))
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(objects) + len(getattr(objects, 'static', ()))
+    return count, current
+
+
+def main():
+    print(f'{"representation":<18}{"tiles":>8}{"KiB":>10}{"bytes/tile":>12}')
+    for name, group in (('sprites', pygame.sprite.Group), ('static store', ObjectsGroup)):
+        count, size = measure(group)
+        print(f'{name:<18}{count:>8}{size / 1024:>10.0f}{size / count:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Two player benchmark
+
+Hosts a two player game and joins it over loopback in the same process, with both players walking around the house,
+and reports the bytes sent per snapshot and per second against sending the full state of every character each tick,
+along with how often the prediction of the second player had to be corrected.
+
+Usage:
+    python benchmarks/bench_net.py [ticks] [port]
+
+Author: Josh Rogers
+"""
+
+import sys
+
+from common import setup
+
+setup()
+
+import pygame
+
+from dindins import controls
+from dindins.main import GameScreen
+from dindins.net import ClientScreen, encode
+from dindins.settings import FPS
+
+TICKS = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+PORT = int(sys.argv[2]) if len(sys.argv) > 2 else 7790
+
+# Each player walks in a square, changing direction every second
+PATH = (pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT)
+
+
+def main():
+    host = GameScreen(host=PORT)
+    client = ClientScreen(('127.0.0.1', PORT))
+
+    for tick in range(TICKS):
+        controls.override(controls.KeyState([PATH[tick // FPS % 4]]))
+        host.update()
+        host.simulate()
+        host.render()
+        controls.override(controls.KeyState([PATH[(tick // FPS + 2) % 4]]))
+        client.update()
+        client.simulate()
+        client.render()
+    controls.override(None)
+
+    server = host.server.client
+    full = len(encode(0, 0, {}, server.sent[max(server.sent)], 0))
+    print(f'ticks:          {TICKS}')
+    print(f'per snapshot:   {server.bytes / server.snapshots:.1f} bytes (full state {full} bytes)')
+    print(f'per second:     {server.bytes / server.snapshots * FPS / host.server.rate / 1000:.2f} KB/s')
+    print(f'corrections:    {client.corrections}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Particles benchmark
+
+Keeps the particle system full by emitting bursts every frame, and reports the average time to update and draw every
+particle, against the frame budget of the target FPS. Also checks emitting into a full system drops particles rather
+than allocating more.
+
+Usage:
+    python benchmarks/bench_particles.py [capacity] [frames]
+
+Author: Josh Rogers
+"""
+
+import sys
+import time
+
+from common import setup
+
+setup()
+
+import pygame
+
+from dindins.main import GameScreen
+from dindins.particles import Particles
+from dindins.settings import WIDTH, HEIGHT, FPS
+
+CAPACITY = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+FRAMES = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+
+def main():
+    screen = GameScreen()
+    particles = Particles(screen.gameobjects, CAPACITY, seed=0)
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    arrays = {name: getattr(particles, name) for name in ('pos', 'vel', 'life', 'colour', '_free')}
+
+    alive = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        particles.effect('scare', (WIDTH / 2, HEIGHT / 2), count=CAPACITY // 10)
+        particles.update()
+        particles.draw(surface)
+        alive += particles.count
+    frame = (time.perf_counter() - start) / FRAMES * 1000
+
+    print(f'capacity:       {CAPACITY}')
+    print(f'average alive:  {alive / FRAMES:.0f}')
+    print(f'dropped:        {particles.dropped}')
+    print(f'update + draw:  {frame:.2f} ms (budget {1000 / FPS:.2f} ms)')
+    print(f'reallocated:    {any(getattr(particles, name) is not array for name, array in arrays.items())}')
+
+
+if __name__ == '__main__':
+    main()
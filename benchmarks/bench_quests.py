@@ -0,0 +1,61 @@
+"""Quests benchmark
+
+Builds quest chains of increasing length, every objective completed by interacting with its own object and reacting to
+walking into its own zone, and reports the average time for an event to be checked against them, both through the
+index and by scanning every condition of every objective, as objects checking the current objective themselves would
+add up to. Indexed lookups should cost the same however long the chain is.
+
+Usage:
+    python benchmarks/bench_quests.py [iterations]
+
+Author: Josh Rogers
+"""
+
+import sys
+
+from common import setup, timeit
+
+setup()
+
+from dindins.objects import ObjectsGroup
+from dindins.quests import Quest, Objective, Reaction, Interacted, Entered, Timer, INTERACTED
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+LENGTHS = (5, 50, 500, 5000)
+
+
+def chain(length):
+    """Builds a quest chain with no actions, so only checking conditions is timed"""
+    return [
+        Objective(f'objective_{i}', Interacted(f'object_{i}'), reactions=(Reaction(Entered(f'zone_{i}')),))
+        for i in range(length)
+    ]
+
+
+def scan(objectives, current, key):
+    """Checks an event against every condition of every objective"""
+    for objective in objectives:
+        for condition in [objective.condition] + [reaction.condition for reaction in objective.reactions]:
+            if objective.name == current and condition.key == key:
+                return True
+    return False
+
+
+def main():
+    print(f'{"objectives":>10} {"indexed us":>11} {"scanned us":>11} {"tick us":>8}')
+    for length in LENGTHS:
+        objectives = chain(length)
+        # The current objective waits on an hour long timer, so each tick checks a timer that has not run out
+        objectives.insert(0, Objective('timed', Timer(3600)))
+        quest = Quest(objectives, ObjectsGroup())
+
+        # The worst case for scanning is an event no objective is waiting on
+        indexed = timeit(lambda: quest.interact('sofa'), ITERATIONS)
+        scanned = timeit(lambda: scan(objectives, quest.objectives[0], (INTERACTED, 'sofa')), max(ITERATIONS // length, 10))
+        tick = timeit(quest.update, ITERATIONS)
+
+        print(f'{length:>10} {indexed:>11.2f} {scanned:>11.2f} {tick:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Scaled rendering benchmark
+
+Compares the time to render and present a frame of the game at each window scale. The game is always rendered at
+WIDTH x HEIGHT, so only the final scale and the GUI grow with the window. For comparison it also times drawing the game
+objects straight onto a window sized surface, as rendering at the window size would.
+
+SCALE is read when the game is imported, so each scale is run in a fresh process.
+
+Usage:
+    python benchmarks/bench_scale.py [frames]
+
+Author: Josh Rogers
+"""
+
+import os
+import subprocess
+import sys
+
+from common import ROOT
+
+FRAMES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+# Run in a fresh process at a scale, printing the milliseconds per presented frame and per frame drawn at window size
+FRAME = '''
+import sys
+import time
+import pygame
+from dindins import settings
+settings.SCALE = int(sys.argv[1])
+frames = int(sys.argv[2])
+from dindins.main import DinDins, GameScreen
+game = DinDins()
+screen = GameScreen()
+screen.render()
+
+start = time.perf_counter()
+for _ in range(frames):
+    game._render(screen)
+scaled = (time.perf_counter() - start) / frames * 1000
+
+# Drawing at window size, the area drawn grows with the scale squared
+window = pygame.Surface(game._rootdisplay.get_size())
+tiles = [(x, y) for x in range(settings.SCALE) for y in range(settings.SCALE)]
+start = time.perf_counter()
+for _ in range(frames):
+    window.fill((0, 0, 0))
+    for x, y in tiles:
+        screen.gameobjects.draw(window.subsurface((x * settings.WIDTH, y * settings.HEIGHT, settings.WIDTH, settings.HEIGHT)))
+full = (time.perf_counter() - start) / frames * 1000
+print(scaled, full)
+'''
+
+
+def main():
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYTHONPATH=ROOT)
+
+    print(f'{"scale":<7}{"window":>12}{"scaled ms":>11}{"full size ms":>14}')
+    for scale in (1, 2, 3):
+        output = subprocess.run([sys.executable, '-c', FRAME, str(scale), str(FRAMES)], env=env, capture_output=True, text=True, check=True)
+        scaled, full = (float(value) for value in output.stdout.strip().splitlines()[-1].split())
+        print(f'{scale:<7}{f"{1000 * scale}x{800 * scale}":>12}{scaled:>11.2f}{full:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
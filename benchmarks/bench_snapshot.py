@@ -0,0 +1,50 @@
+"""Snapshot benchmark
+
+Plays into the game far enough for Juice to be chasing Lucy, then reports the size of a snapshot and the time to
+record one into the rewind buffer and to restore one, against the frame budget of the target FPS.
+
+Usage:
+    python benchmarks/bench_snapshot.py [seconds]
+
+Author: Josh Rogers
+"""
+
+import sys
+
+from common import setup, timeit
+
+setup()
+
+import pygame
+
+from dindins.characters.juice import Juice
+from dindins.events import RENDER
+from dindins.main import GameScreen
+from dindins.settings import FPS
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+
+def main():
+    screen = GameScreen(rewind=SECONDS)
+    pygame.event.post(pygame.event.Event(RENDER, {'objects': [Juice((510, -200))]}))
+    for event in pygame.event.get():
+        screen.handle(event)
+    for _ in range(FPS):
+        screen.update()
+        screen.simulate()
+        screen.render()
+
+    rewind = screen.rewind
+    snapshot = rewind.snapshots.capture()
+    record = timeit(rewind.record, 10000)
+    restore = timeit(lambda: rewind.snapshots.restore(snapshot), 10000)
+
+    print(f'snapshot:       {len(snapshot)} bytes')
+    print(f'buffer:         {rewind.capacity} snapshots, {rewind.capacity * rewind.slotsize / 1024:.0f} KB')
+    print(f'record:         {record:.1f} us ({record / (1e6 / FPS):.2%} of the frame budget)')
+    print(f'restore:        {restore:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Startup benchmark
+
+Times fresh processes to their first frame, and how much of that is spent loading images. Each run is a fresh process,
+so nothing is cached between runs other than by the operating system.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+
+Author: Josh Rogers
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import ROOT
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+# Run in a fresh process, printing the seconds from start to the first frame being shown, from pygame being
+# initialised to the first frame, and spent loading images
+FIRST_FRAME = '''
+import time
+start = time.perf_counter()
+import pygame
+from dindins import assets
+pygame.init()
+display = pygame.display.set_mode((1000, 800))
+ready = time.perf_counter()
+
+images = 0
+load = assets.load
+def timed(path):
+    global images
+    before = time.perf_counter()
+    image = load(path)
+    images += time.perf_counter() - before
+    return image
+assets.load = timed
+
+from dindins.main import GameScreen
+screen = GameScreen()
+screen.render()
+display.blit(screen, (0, 0))
+pygame.display.flip()
+end = time.perf_counter()
+print(end - start, end - ready, images)
+'''
+
+
+def firstframe():
+    """Times a fresh process to its first frame
+
+    Returns:
+        Tuple of (seconds to first frame, seconds from pygame being initialised to first frame, seconds loading images,
+        seconds for the whole process)
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', FIRST_FRAME], env=env, capture_output=True, text=True, check=True)
+    total = time.perf_counter() - start
+    frame, loading, images = output.stdout.strip().splitlines()[-1].split()
+    return float(frame), float(loading), float(images), total
+
+
+def main():
+    results = [firstframe() for _ in range(RUNS)]
+    frame, loading, images, total = (statistics.median(result[i] for result in results) * 1000 for i in range(4))
+    print(f'{"first frame ms":>14}{"after init ms":>15}{"images ms":>11}{"process ms":>12}')
+    print(f'{frame:>14.1f}{loading:>15.1f}{images:>11.1f}{total:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
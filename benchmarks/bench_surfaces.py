@@ -0,0 +1,64 @@
+"""Surface allocation benchmark
+
+Opens a dialogue box several times and walks around between them, tracking the surfaces made by the game, then prints
+the call sites that made the most surfaces, along with how many dialogue box surfaces came from the pool.
+
+Usage:
+    python benchmarks/bench_surfaces.py [boxes]
+
+Author: Josh Rogers
+"""
+
+import sys
+
+from common import ROOT, setup
+
+# Surfaces are tracked by replacing pygame.Surface, so this must happen before the game is imported
+sys.path.insert(0, ROOT)
+from dindins.surfaces import AllocationTracker, pool
+
+tracker = AllocationTracker()
+tracker.install()
+
+setup()
+
+import pygame
+
+from dindins import controls
+from dindins.main import GameScreen
+
+BOXES = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+
+def play(screen, frames, keys=()):
+    """Plays frames holding down keys, marking each frame on the tracker"""
+    controls.override(controls.KeyState(keys))
+    for _ in range(frames):
+        for event in pygame.event.get():
+            screen.handle(event)
+        screen.update()
+        screen.simulate()
+        screen.render()
+        tracker.frame()
+    controls.override(None)
+
+
+def main():
+    screen = GameScreen()
+    tracker.frame()
+    tracker.total.clear()
+    tracker.peak.clear()
+    tracker.frames = 0
+
+    for _ in range(BOXES):
+        screen.gameobjects.get('bowls').interact()
+        play(screen, 120)
+        play(screen, 2, [pygame.K_SPACE])
+        play(screen, 30, [pygame.K_DOWN])
+
+    tracker.report(sys.stdout, 10)
+    print(f'dialogue boxes: {pool.leased} leased, {pool.allocated} allocated')
+
+
+if __name__ == '__main__':
+    main()
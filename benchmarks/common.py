@@ -0,0 +1,43 @@
+"""Benchmark helpers
+
+Shared set up for the benchmark scripts. Benchmarks run headless, with the repository on the import path so they can be
+run from any directory.
+
+Author: Josh Rogers
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup():
+    """Prepares a headless pygame display for benchmarking"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    import pygame
+    from dindins.settings import WIDTH, HEIGHT
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+
+
+def timeit(function, iterations):
+    """Times a function
+
+    Args:
+        function: Callable taking no arguments
+        iterations: Number of times to call the function
+
+    Returns:
+        Average time per call in microseconds
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
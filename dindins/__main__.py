@@ -0,0 +1,97 @@
+"""Entry point
+
+Runs the game with python -m dindins.
+
+Options:
+    --profile-startup: Print how long each phase of startup and each import took once the first frame is shown
+    --fps: Target frames per second
+    --vsync: Sync the display to the monitor refresh where supported
+    --busy-loop: Busy wait between frames for more accurate frame times
+    --frame-stats: Print how often frames went over budget when the game closes
+    --host: Host a two player game, where the second player controls Juice
+    --join: Join a two player game at address[:port] as Juice
+    --port: UDP port to host on or join at
+    --record: Record every presented frame to a directory
+    --record-format: Record frames as a PNG sequence or a raw dump
+    --track-surfaces: Print the lines of the game that made the most surfaces each frame when the game closes
+    --rewind: Keep the last few seconds of the game to rewind to by pressing backspace
+
+Author: Josh Rogers
+"""
+
+import argparse
+import sys
+
+from dindins.profiling import StartupProfiler
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m dindins', description='Din Dins')
+    parser.add_argument('--profile-startup', action='store_true', help='print a report of startup and import times')
+    parser.add_argument('--fps', type=int, default=None, help='target frames per second')
+    parser.add_argument('--vsync', action='store_true', help='sync to the monitor refresh where supported')
+    parser.add_argument('--busy-loop', action='store_true', help='busy wait between frames for accurate timing')
+    parser.add_argument('--frame-stats', action='store_true', help='print frame pacing stats on exit')
+    parser.add_argument('--host', action='store_true', help='host a two player game')
+    parser.add_argument('--join', metavar='ADDRESS', help='join a two player game as Juice')
+    parser.add_argument('--port', type=int, default=None, help='UDP port of a two player game')
+    parser.add_argument('--record', metavar='DIRECTORY', help='record every presented frame to a directory')
+    parser.add_argument('--record-format', choices=('png', 'raw'), default=None, help='format to record frames in')
+    parser.add_argument('--track-surfaces', action='store_true', help='print surface allocations per frame on exit')
+    parser.add_argument('--rewind', type=float, metavar='SECONDS', default=None, help='seconds of the game to keep to rewind')
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile_startup:
+        profiler = StartupProfiler()
+        profiler.install()
+
+    # Surfaces are tracked by replacing pygame.Surface, so this must happen before the game is imported
+    tracker = None
+    if args.track_surfaces:
+        from dindins.surfaces import AllocationTracker
+        tracker = AllocationTracker()
+        tracker.install()
+
+    from dindins.settings import FPS, VSYNC, BUSY_LOOP, NET_PORT, CAPTURE_FORMAT, REWIND
+    from dindins.main import DinDins, MainMenu
+
+    if profiler:
+        profiler.mark('import')
+
+    game = DinDins(
+        fps=args.fps or FPS,
+        vsync=args.vsync or VSYNC,
+        busyloop=args.busy_loop or BUSY_LOOP,
+        stats=args.frame_stats,
+        record=args.record,
+        recordformat=args.record_format or CAPTURE_FORMAT,
+        tracker=tracker
+    )
+
+    def firstframe():
+        profiler.mark('first frame')
+        profiler.uninstall()
+        profiler.report(sys.stderr)
+
+    rewind = args.rewind or REWIND
+    start = lambda: MainMenu(rewind)
+
+    # Two player mode
+    if args.host:
+        from dindins.main import GameScreen
+        start = lambda: GameScreen(host=args.port or NET_PORT, rewind=rewind)
+    elif args.join:
+        from dindins.net import ClientScreen
+        address, _, port = args.join.partition(':')
+        start = lambda: ClientScreen((address, int(port or args.port or NET_PORT)))
+
+    if profiler:
+        profiler.mark('window')
+        game.run(firstframe, start)
+    else:
+        game.run(start=start)
+
+
+if __name__ == '__main__':
+    main()
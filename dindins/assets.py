@@ -0,0 +1,39 @@
+"""Assets
+
+This file loads the images used by the game. Images are loaded from the PNG files under the assets directory and cached
+by their path relative to it, so every object using the same image shares one surface however the path was written,
+and the game can be run from any directory.
+
+Author: Josh Rogers
+"""
+
+import os
+
+import pygame
+
+from dindins.settings import ASSETS
+
+# Loaded surfaces by path relative to the assets directory
+_images = {}
+
+
+def _key(path):
+    """Gets the path of an image relative to the assets directory"""
+    return os.path.relpath(os.path.abspath(path), ASSETS).replace(os.sep, '/')
+
+
+def load(path):
+    """Loads an image
+
+    Args:
+        path: File path of the image
+
+    Returns:
+        pygame.Surface of the image, shared with anything else that has loaded the same path
+    """
+    key = _key(path)
+    image = _images.get(key)
+    if image is None:
+        image = _images[key] = pygame.image.load(path)
+
+    return image
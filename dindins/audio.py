@@ -0,0 +1,144 @@
+"""Audio
+
+This file contains the audio manager, which plays sound effects and music. Sound effects are decoded and cached when a
+level loads, so playing one from a game event never reads from disk. They are played on a fixed pool of mixer
+channels; when every channel is busy, a new sound takes the channel of the lowest priority sound playing, as long as
+that sound is not more important than the new one. Music is streamed from disk rather than loaded whole.
+
+Sounds are usually played by posting a SOUND event, which the game screen passes on to its audio manager.
+
+If there is no audio device the manager does nothing, so the game can still be played.
+
+Author: Josh Rogers
+"""
+
+import os
+
+import pygame
+
+
+class AudioManager:
+    """Audio manager
+
+    Attributes:
+        enabled: Boolean indicating the mixer is available
+        sounds: Dictionary of the preloaded pygame.mixer.Sound for each sound name
+        channels: List of the pygame.mixer.Channel in the pool
+    """
+    def __init__(self, channels=8):
+        """Sets up the mixer and channel pool
+
+        Args:
+            channels: Number of channels in the pool (defaults to 8)
+        """
+        self.sounds = {}
+        self.channels = []
+
+        # Playing (priority, order) of each channel, used to pick a channel to steal
+        self._playing = []
+        self._count = 0
+
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error:
+                pass
+        self.enabled = bool(pygame.mixer.get_init())
+
+        if self.enabled:
+            pygame.mixer.set_num_channels(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+            self._playing = [None] * channels
+
+    def preload(self, sounds):
+        """Decodes and caches sounds
+
+        Sounds that are already cached are not loaded again. Sounds whose file does not exist are skipped, so events can
+        refer to sounds that have not been added yet.
+
+        Args:
+            sounds: Dictionary of file paths for each sound name
+        """
+        if not self.enabled:
+            return
+
+        for name, path in sounds.items():
+            if name not in self.sounds and os.path.exists(path):
+                self.sounds[name] = pygame.mixer.Sound(path)
+
+    def play(self, name, priority=0, volume=1.0):
+        """Plays a preloaded sound
+
+        Sounds that have not been preloaded are not played, rather than loaded from disk mid-game.
+
+        Args:
+            name: Name of the sound
+            priority: Importance of the sound, sounds with higher priority can take channels from lower (defaults to 0)
+            volume: Volume from 0 to 1 (defaults to 1.0)
+
+        Returns:
+            pygame.mixer.Channel the sound is playing on, or None if it was not played
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+
+        index = self._channel(priority)
+        if index is None:
+            return None
+
+        channel = self.channels[index]
+        channel.stop()
+        channel.set_volume(volume)
+        channel.play(sound)
+        self._playing[index] = (priority, self._count)
+        self._count += 1
+        return channel
+
+    def _channel(self, priority):
+        """Picks a channel to play a sound on
+
+        A free channel is used if there is one. Otherwise the channel playing the lowest priority sound, and of those
+        the oldest, is stolen if its priority is no higher than the new sound.
+
+        Args:
+            priority: Priority of the new sound
+
+        Returns:
+            Index of the channel, or None if every channel is playing something more important
+        """
+        steal = None
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+            if self._playing[index] is None or steal is None or self._playing[index] < self._playing[steal]:
+                steal = index
+
+        if steal is not None and (self._playing[steal] is None or self._playing[steal][0] <= priority):
+            return steal
+
+        return None
+
+    def music(self, path, loops=-1, volume=1.0):
+        """Streams a music track
+
+        Args:
+            path: File path of the track
+            loops: Number of times to repeat, -1 to repeat forever (defaults to -1)
+            volume: Volume from 0 to 1 (defaults to 1.0)
+        """
+        if not self.enabled or not os.path.exists(path):
+            return
+
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+
+    def stop(self):
+        """Stops all sounds and music"""
+        if not self.enabled:
+            return
+
+        pygame.mixer.stop()
+        pygame.mixer.music.stop()
+        self._playing = [None] * len(self.channels)
@@ -0,0 +1,165 @@
+"""Capture
+
+This file contains the recorder used to capture sessions for QA and bug reports. Encoding a frame takes far longer than
+a frame lasts, so the main loop only copies each presented frame into one of a few reusable buffers, and a worker
+thread writes them out. When the worker falls behind and every buffer is waiting to be written, frames are dropped and
+counted rather than holding up the game, so recording costs the game at most a copy of the window per frame.
+
+Frames are written either as a PNG sequence, named by frame number so dropped frames show as gaps, or as a raw dump of
+the pixels of every frame one after the other in a single file, which is much faster to write. Raw dumps come with a
+text file describing the size and layout of each frame, and the number of every frame in the dump.
+
+PNGs are compressed with zlib rather than saved with pygame.image.save(), as zlib lets the game carry on running while
+it compresses, where pygame holds up every other thread until the image is saved.
+
+Author: Josh Rogers
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+from collections import deque
+
+import pygame
+
+from dindins.settings import *
+
+FORMATS = ('png', 'raw')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _chunk(type, data):
+    """Packs a PNG chunk"""
+    return struct.pack('>I', len(data)) + type + data + struct.pack('>I', zlib.crc32(type + data))
+
+
+def savepng(surface, path, level=6):
+    """Saves a surface as an RGB PNG
+
+    Args:
+        surface: pygame.Surface to save
+        path: Path of the file to write
+        level: zlib compression level (defaults to 6)
+    """
+    width, height = surface.get_size()
+    pixels = pygame.image.tobytes(surface, 'RGB')
+    stride = width * 3
+
+    # Each row starts with its filter type, 0 for none
+    rows = b''.join(b'\x00' + pixels[y:y + stride] for y in range(0, stride * height, stride))
+
+    with open(path, 'wb') as file:
+        file.write(PNG_SIGNATURE)
+        file.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        file.write(_chunk(b'IDAT', zlib.compress(rows, level)))
+        file.write(_chunk(b'IEND', b''))
+
+
+class Recorder:
+    """Recorder of presented frames
+
+    Attributes:
+        path: Directory frames are written to
+        format: Format frames are written in, 'png' or 'raw'
+        frames: Number of frames presented while recording
+        written: Number of frames written
+        dropped: Number of frames dropped because the worker had fallen behind
+    """
+    def __init__(self, path, format=CAPTURE_FORMAT, buffers=CAPTURE_BUFFERS):
+        """Starts the worker thread
+
+        Args:
+            path: Directory to write frames to, created if it does not exist
+            format: 'png' for a PNG sequence or 'raw' for a raw dump (defaults to CAPTURE_FORMAT)
+            buffers: Number of frames that can be waiting to be written (defaults to CAPTURE_BUFFERS)
+        """
+        if format not in FORMATS:
+            raise ValueError(f'Unknown capture format {format}, expected one of {", ".join(FORMATS)}')
+
+        self.path = path
+        self.format = format
+        self.frames = 0
+        self.written = 0
+        self.dropped = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._count = buffers
+        self._free = deque()
+        self._queue = queue.Queue()
+        self._dump = None
+        self._numbers = []
+        self._layout = None
+        self._worker = threading.Thread(target=self._work, name='capture', daemon=True)
+        self._worker.start()
+
+    def capture(self, surface):
+        """Copies a frame to be written, or drops it if the worker has fallen behind
+
+        Args:
+            surface: pygame.Surface of the presented frame, usually the window
+        """
+        number = self.frames
+        self.frames += 1
+
+        # Buffers are made on first use to match the format of the window, so copying into them is a plain copy
+        if self._count:
+            self._count -= 1
+            buffer = pygame.Surface(surface.get_size(), 0, surface)
+        else:
+            try:
+                buffer = self._free.popleft()
+            except IndexError:
+                self.dropped += 1
+                return
+
+        buffer.blit(surface, (0, 0))
+        self._queue.put((number, buffer))
+
+    def _work(self):
+        """Writes frames until told to stop"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            number, buffer = item
+            if self.format == 'png':
+                savepng(buffer, os.path.join(self.path, f'frame_{number:06d}.png'))
+            else:
+                self._write(number, buffer)
+            self.written += 1
+            self._free.append(buffer)
+
+    def _write(self, number, buffer):
+        """Appends the pixels of a frame to the raw dump"""
+        if self._dump is None:
+            self._dump = open(os.path.join(self.path, 'frames.raw'), 'wb')
+            self._layout = {
+                'width': buffer.get_width(),
+                'height': buffer.get_height(),
+                'pitch': buffer.get_pitch(),
+                'bytesize': buffer.get_bytesize(),
+                'masks': list(buffer.get_masks()),
+            }
+        self._dump.write(buffer.get_view('1'))
+        self._numbers.append(number)
+
+    def close(self):
+        """Writes the frames still waiting and stops the worker
+
+        Returns:
+            Summary of the recording
+        """
+        self._queue.put(None)
+        self._worker.join()
+
+        if self._dump:
+            self._dump.close()
+            with open(os.path.join(self.path, 'frames.json'), 'w') as file:
+                json.dump(dict(self._layout, frames=self._numbers), file)
+
+        return f'Captured {self.written} of {self.frames} frames to {self.path}, {self.dropped} dropped'
@@ -1,12 +1,16 @@
 import pygame
 
 from dindins.settings import *
+from dindins import assets
 from dindins.objects import Animated
+from dindins.collision import sweep
 
 
 class Juice(Animated):
+    state = ('distance', 'flip')
+
     def __init__(self, pos):
-        super().__init__(pos, pygame.image.load(f'{ASSETS}/juice/idle/juice_idle_down.png'), 'juice', triggerable=True)
+        super().__init__(pos, assets.load(f'{ASSETS}/juice/idle/juice_idle_down.png'), 'juice', triggerable=True)
         self.boundingbox = self.rect.copy()
         self.rect.height = 50
         self.rect.width = 32
@@ -14,35 +18,130 @@ class Juice(Animated):
         self.distance = 0
         self.flip = False
 
+        # Chasing
+        self.speed = 2
+        self.navgrid = None
+        self.target = None
+        self.objects = None
+        self.field = None
+
+        # Keys held by a second player controlling her, or None when she moves by herself
+        self.keystate = None
+
         self.idle = {
-            'up': pygame.image.load(f'{ASSETS}/juice/idle/juice_idle_up.png'),
-            'down': pygame.image.load(f'{ASSETS}/juice/idle/juice_idle_down.png'),
-            'left': pygame.image.load(f'{ASSETS}/juice/idle/juice_idle_left.png'),
-            'right': pygame.image.load(f'{ASSETS}/juice/idle/juice_idle_right.png')
+            'up': assets.load(f'{ASSETS}/juice/idle/juice_idle_up.png'),
+            'down': assets.load(f'{ASSETS}/juice/idle/juice_idle_down.png'),
+            'left': assets.load(f'{ASSETS}/juice/idle/juice_idle_left.png'),
+            'right': assets.load(f'{ASSETS}/juice/idle/juice_idle_right.png')
         }
 
         self.walk = {
             'up': [
-                pygame.image.load(f'{ASSETS}/juice/walk/up/juice_walk_up_1.png'),
-                pygame.image.load(f'{ASSETS}/juice/walk/up/juice_walk_up_2.png')
+                assets.load(f'{ASSETS}/juice/walk/up/juice_walk_up_1.png'),
+                assets.load(f'{ASSETS}/juice/walk/up/juice_walk_up_2.png')
             ],
             'down': [
-                pygame.image.load(f'{ASSETS}/juice/walk/down/juice_walk_down_1.png'),
-                pygame.image.load(f'{ASSETS}/juice/walk/down/juice_walk_down_2.png')
+                assets.load(f'{ASSETS}/juice/walk/down/juice_walk_down_1.png'),
+                assets.load(f'{ASSETS}/juice/walk/down/juice_walk_down_2.png')
             ],
             'left': [
-                pygame.image.load(f'{ASSETS}/juice/walk/left/juice_walk_left_1.png'),
-                pygame.image.load(f'{ASSETS}/juice/walk/left/juice_walk_left_2.png')
+                assets.load(f'{ASSETS}/juice/walk/left/juice_walk_left_1.png'),
+                assets.load(f'{ASSETS}/juice/walk/left/juice_walk_left_2.png')
             ],
             'right': [
-                pygame.image.load(f'{ASSETS}/juice/walk/right/juice_walk_right_1.png'),
-                pygame.image.load(f'{ASSETS}/juice/walk/right/juice_walk_right_2.png')
+                assets.load(f'{ASSETS}/juice/walk/right/juice_walk_right_1.png'),
+                assets.load(f'{ASSETS}/juice/walk/right/juice_walk_right_2.png')
             ]
         }
 
+    def chase(self, navgrid, target, objects):
+        """Chases a target through the house
+
+        Juice will follow the shared flow field towards the target instead of patrolling. While the target is paused
+        (such as when hiding) she heads for the last place she saw it.
+
+        Args:
+            navgrid: NavGrid of the level
+            target: Sprite to chase
+            objects: ObjectsGroup of the level, whose colliders her steps are resolved against
+        """
+        self.navgrid = navgrid
+        self.target = target
+        self.objects = objects
+
+    def steer(self, keystate):
+        """Hands control of Juice to a player
+
+        Juice stops chasing or patrolling and is animated by the keys held down, the same as Lucy. She is not moved, the
+        movement is returned so it can be resolved against colliders by whoever is simulating her.
+
+        Args:
+            keystate: controls.KeyState of the keys held down by the player
+
+        Returns:
+            Tuple (dx, dy) of the pixels she wants to move
+        """
+        self.keystate = keystate
+        if self.pause:
+            return 0, 0
+
+        dx = (keystate[pygame.K_RIGHT] - keystate[pygame.K_LEFT]) * self.speed
+        dy = (keystate[pygame.K_DOWN] - keystate[pygame.K_UP]) * self.speed
+        return dx, dy
+
+    def _steered(self):
+        """Animates Juice while a player is controlling her"""
+        keystate = self.keystate
+        if keystate[pygame.K_UP] or keystate[pygame.K_DOWN]:
+            direction = 'up' if keystate[pygame.K_UP] else 'down'
+        elif keystate[pygame.K_LEFT] or keystate[pygame.K_RIGHT]:
+            direction = 'left' if keystate[pygame.K_LEFT] else 'right'
+        else:
+            self.image = self.idle[self.direction]
+            self.ticker = 0
+            return
+
+        self.ticker = 0 if self.direction != direction else self.ticker
+        self.direction = direction
+        self._playanimation(self.walk[self.direction])
+
+    def _chase(self):
+        """Moves one step towards the target"""
+        if not self.target.pause:
+            self.field = self.navgrid.flowfield(self.target.rect.center) or self.field
+            target = self.target.rect.center
+        else:
+            target = None
+
+        if not self.field:
+            return
+
+        x, y = self.field.step(self.rect.center, self.speed, target)
+
+        # The flow field keeps her centre clear of walls, but not the rest of her
+        if x or y:
+            area = self.rect.union(self.rect.move(x, y))
+            x, y = sweep(self, x, y, [object for object in self.objects.colliders(area) if object is not self])
+
+        if x or y:
+            self.move(x, y)
+
+            # Face the axis with the most movement
+            if abs(y) >= abs(x):
+                direction = 'down' if y > 0 else 'up'
+            else:
+                direction = 'right' if x > 0 else 'left'
+
+            self.ticker = 0 if self.direction != direction else self.ticker
+            self.direction = direction
+            self._playanimation(self.walk[self.direction])
+        else:
+            self.image = self.idle[self.direction]
+            self.ticker = 0
+
     def trigger(self):
-        #pygame.event.post(pygame.event.Event(GAME_OVER, {}))
-        print('ded')
+        """Catching Lucy is handled by the objectives"""
+        pass
 
     def move(self, x, y):
         """Shifts the object by x and y
@@ -57,7 +156,11 @@ class Juice(Animated):
 
     def update(self):
         if not self.pause:
-            if not self.flip:
+            if self.keystate is not None:
+                self._steered()
+            elif self.navgrid:
+                self._chase()
+            elif not self.flip:
                 self.move(0, 1)
                 self._playanimation(self.walk['down'])
                 self.distance += 1
@@ -1,6 +1,8 @@
 import pygame
 
 from dindins.settings import *
+from dindins import assets
+from dindins import controls
 from dindins.objects import Animated
 
 
@@ -8,30 +10,30 @@ class Lucy(Animated):
     def __init__(self):
         """Initialises Lucy"""
         # Init sprite, set direction and location
-        super().__init__((WIDTH / 2, HEIGHT / 2), pygame.image.load(f'{ASSETS}/lucy/idle/lucy_idle_down.png'), 'lucy', boundingbox='image')
+        super().__init__((WIDTH / 2, HEIGHT / 2), assets.load(f'{ASSETS}/lucy/idle/lucy_idle_down.png'), 'lucy', boundingbox='image')
 
         # Idle
         self.idle = {
-            'up': pygame.image.load(f'{ASSETS}/lucy/idle/lucy_idle_up.png'),
-            'down': pygame.image.load(f'{ASSETS}/lucy/idle/lucy_idle_down.png'),
-            'left': pygame.image.load(f'{ASSETS}/lucy/idle/lucy_idle_left.png'),
-            'right': pygame.image.load(f'{ASSETS}/lucy/idle/lucy_idle_right.png')
+            'up': assets.load(f'{ASSETS}/lucy/idle/lucy_idle_up.png'),
+            'down': assets.load(f'{ASSETS}/lucy/idle/lucy_idle_down.png'),
+            'left': assets.load(f'{ASSETS}/lucy/idle/lucy_idle_left.png'),
+            'right': assets.load(f'{ASSETS}/lucy/idle/lucy_idle_right.png')
         }
 
         # Walking animation
         self.walk = {
             'up': [
-                pygame.image.load(f'{ASSETS}/lucy/walk/up/lucy_walk_up_1.png'),
-                pygame.image.load(f'{ASSETS}/lucy/walk/up/lucy_walk_up_2.png')],
+                assets.load(f'{ASSETS}/lucy/walk/up/lucy_walk_up_1.png'),
+                assets.load(f'{ASSETS}/lucy/walk/up/lucy_walk_up_2.png')],
             'down': [
-                pygame.image.load(f'{ASSETS}/lucy/walk/down/lucy_walk_down_1.png'),
-                pygame.image.load(f'{ASSETS}/lucy/walk/down/lucy_walk_down_2.png')],
+                assets.load(f'{ASSETS}/lucy/walk/down/lucy_walk_down_1.png'),
+                assets.load(f'{ASSETS}/lucy/walk/down/lucy_walk_down_2.png')],
             'left': [
-                pygame.image.load(f'{ASSETS}/lucy/walk/left/lucy_walk_left_1.png'),
-                pygame.image.load(f'{ASSETS}/lucy/walk/left/lucy_walk_left_2.png')],
+                assets.load(f'{ASSETS}/lucy/walk/left/lucy_walk_left_1.png'),
+                assets.load(f'{ASSETS}/lucy/walk/left/lucy_walk_left_2.png')],
             'right': [
-                pygame.image.load(f'{ASSETS}/lucy/walk/right/lucy_walk_right_1.png'),
-                pygame.image.load(f'{ASSETS}/lucy/walk/right/lucy_walk_right_2.png')]
+                assets.load(f'{ASSETS}/lucy/walk/right/lucy_walk_right_1.png'),
+                assets.load(f'{ASSETS}/lucy/walk/right/lucy_walk_right_2.png')]
         }
 
     def update(self):
@@ -41,7 +43,7 @@ class Lucy(Animated):
         presses.
         """
         # Get current keystate
-        keystate = pygame.key.get_pressed()
+        keystate = controls.pressed()
 
         # Set animation and direction of Lucy
         # If up/down and either left or right are pressed, the up/down animation should be used. So, the left/right
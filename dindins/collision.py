@@ -0,0 +1,215 @@
+"""Collision
+
+This file contains helpers for collision detection between the player and game objects. By default collision is tested
+against the hand-tuned boundingbox of each object. Optionally, precise collision can be enabled, which tests the opaque
+pixels of each image using pygame.mask masks.
+
+Masks are built once per asset and cached, so objects that share an image (or an image with identical pixels) share a
+single mask. A mask is only ever tested after the cheap rect check has passed, so precise collision costs next to
+nothing while objects are not touching.
+
+Author: Josh Rogers
+"""
+
+import weakref
+from hashlib import blake2b
+
+import pygame
+
+
+# Masks keyed by the pixel data of the image they were built from, shared between every object using that asset
+_masks = {}
+
+# Fast lookup of a surface that has already been hashed
+_surfaces = weakref.WeakKeyDictionary()
+
+
+def fingerprint(image):
+    """Gets a key identifying the pixels of an image
+
+    Args:
+        image: pygame.Surface to identify
+
+    Returns:
+        Hashable key that is equal for any two images with the same size and pixels
+    """
+    return image.get_size(), blake2b(pygame.image.tobytes(image, 'RGBA'), digest_size=16).digest()
+
+
+def getmask(image):
+    """Gets the cached mask of an image
+
+    Images are looked up by surface first, so repeated lookups of the same surface (such as the frames of an animation)
+    do not need to read the pixels again. If the surface has not been seen before, its pixels are hashed so that
+    separately loaded copies of the same asset still share one mask.
+
+    Args:
+        image: pygame.Surface to get the mask of
+
+    Returns:
+        pygame.mask.Mask of the opaque pixels of the image
+    """
+    mask = _surfaces.get(image)
+    if mask is None:
+        key = fingerprint(image)
+        mask = _masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(image)
+            _masks[key] = mask
+        _surfaces[image] = mask
+
+    return mask
+
+
+def collide(sprite, object):
+    """Checks if a sprite collides with an object
+
+    The sprite rect is first checked against the bounding box of the object. If the object has a mask and the rects
+    overlap, the mask of the sprite's current image is then checked against it.
+
+    Args:
+        sprite: pygame.sprite.Sprite to check, usually the player
+        object: BaseObject with a boundingbox
+
+    Returns:
+        True if the sprite collides with the object
+    """
+    if not sprite.rect.colliderect(object.boundingbox):
+        return False
+
+    if object.mask is None:
+        return True
+
+    offset = (sprite.rect.x - object.rect.x, sprite.rect.y - object.rect.y)
+    return object.mask.overlap(getmask(sprite.image), offset) is not None
+
+
+def sweep(sprite, dx, dy, objects):
+    """Resolves the movement of a sprite against a set of objects
+
+    The movement is resolved one axis at a time, first horizontally and then vertically, so a sprite moving diagonally
+    into a wall will slide along it. On each axis the movement is clamped to the nearest edge in the path of the sprite,
+    which stops the sprite in exact contact and prevents it from passing through thin objects at high speed. Objects
+    the sprite is already overlapping, such as a character that walked into it, block movement deeper into them but
+    not movement back out, so the sprite can never pass through one or get stuck inside it.
+
+    Only objects within the area covered by the whole movement are tested. Objects with a mask are stepped through one
+    pixel at a time, as their opaque pixels may not reach the edges of their bounding box.
+
+    Args:
+        sprite: pygame.sprite.Sprite to move, usually the player
+        dx: Pixels the sprite wants to move horizontally
+        dy: Pixels the sprite wants to move vertically
+        objects: Iterable of BaseObjects with a boundingbox
+
+    Returns:
+        Tuple (dx, dy) of the movement that can be made without colliding
+    """
+    rect = sprite.rect
+    area = rect.union(rect.move(dx, dy))
+    nearby = [object for object in objects if area.colliderect(object.boundingbox)]
+
+    dx = _sweepaxis(sprite, rect, dx, 0, nearby)
+    dy = _sweepaxis(sprite, rect.move(dx, 0), 0, dy, nearby)
+
+    return dx, dy
+
+
+def _sweepaxis(sprite, rect, dx, dy, objects):
+    """Resolves movement along a single axis
+
+    Args:
+        sprite: pygame.sprite.Sprite being moved
+        rect: pygame.Rect of the sprite before the movement
+        dx: Horizontal movement, must be 0 if dy is set
+        dy: Vertical movement, must be 0 if dx is set
+        objects: List of BaseObjects that may be in the way
+
+    Returns:
+        Allowed movement along the axis
+    """
+    distance = dx or dy
+    if not distance:
+        return 0
+
+    # Clamp to bounding boxes first, as it narrows how far masks need to be stepped
+    for object in objects:
+        if object.mask is None:
+            distance = _clamp(rect, distance, bool(dx), object.boundingbox)
+
+    for object in objects:
+        if object.mask is not None:
+            distance = _step(sprite, rect, distance, bool(dx), object)
+
+    return distance
+
+
+def _clamp(rect, distance, horizontal, box):
+    """Clamps movement so the rect stops at the edge of the box
+
+    Args:
+        rect: pygame.Rect being moved
+        distance: Movement along the axis
+        horizontal: Boolean indicating if the movement is along the x axis
+        box: pygame.Rect that may be in the way
+
+    Returns:
+        Allowed movement along the axis
+    """
+    # Already overlapping, only moving away from the middle of the box is allowed
+    if rect.colliderect(box):
+        if horizontal:
+            deeper = box.centerx - rect.centerx
+        else:
+            deeper = box.centery - rect.centery
+        return 0 if deeper * distance > 0 else distance
+
+    if horizontal:
+        # Box is not in the path of the rect
+        if rect.bottom <= box.top or rect.top >= box.bottom:
+            return distance
+        if distance > 0 and rect.right <= box.left:
+            return min(distance, box.left - rect.right)
+        if distance < 0 and rect.left >= box.right:
+            return max(distance, box.right - rect.left)
+    else:
+        if rect.right <= box.left or rect.left >= box.right:
+            return distance
+        if distance > 0 and rect.bottom <= box.top:
+            return min(distance, box.top - rect.bottom)
+        if distance < 0 and rect.top >= box.bottom:
+            return max(distance, box.bottom - rect.top)
+
+    return distance
+
+
+def _step(sprite, rect, distance, horizontal, object):
+    """Steps a sprite's mask towards an object's mask one pixel at a time
+
+    Args:
+        sprite: pygame.sprite.Sprite being moved
+        rect: pygame.Rect of the sprite before the movement
+        distance: Movement along the axis
+        horizontal: Boolean indicating if the movement is along the x axis
+        object: BaseObject with a mask that may be in the way
+
+    Returns:
+        Allowed movement along the axis
+    """
+    mask = getmask(sprite.image)
+    x = rect.x - object.rect.x
+    y = rect.y - object.rect.y
+
+    # Already overlapping, only moving so less of the masks overlap is allowed
+    overlap = object.mask.overlap_area(mask, (x, y))
+    if overlap:
+        offset = (x + distance, y) if horizontal else (x, y + distance)
+        return 0 if object.mask.overlap_area(mask, offset) > overlap else distance
+
+    sign = 1 if distance > 0 else -1
+    for step in range(sign, distance + sign, sign):
+        offset = (x + step, y) if horizontal else (x, y + step)
+        if object.mask.overlap(mask, offset):
+            return step - sign
+
+    return distance
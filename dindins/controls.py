@@ -0,0 +1,52 @@
+"""Controls
+
+This file provides the keyboard state to the rest of the game. Everything that polls the keyboard does so through
+pressed() rather than pygame.key.get_pressed(), so the keyboard can be replaced by another source of input, such as an
+automated agent, without a window or simulated key presses.
+
+Author: Josh Rogers
+"""
+
+import pygame
+
+# Key state used instead of the keyboard when set
+_override = None
+
+
+class KeyState:
+    """Key state
+
+    A stand in for the sequence returned by pygame.key.get_pressed(), indexed by pygame key constants.
+
+    Attributes:
+        keys: Set of keys that are currently held down
+    """
+    def __init__(self, keys=()):
+        """Init
+
+        Args:
+            keys: Iterable of pygame key constants that are held down (defaults to none)
+        """
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+def pressed():
+    """Gets the current key state
+
+    Returns:
+        The overriding KeyState if one is set, otherwise the state of the keyboard
+    """
+    return _override if _override is not None else pygame.key.get_pressed()
+
+
+def override(keystate):
+    """Replaces the keyboard
+
+    Args:
+        keystate: KeyState to use instead of the keyboard, or None to use the keyboard again
+    """
+    global _override
+    _override = keystate
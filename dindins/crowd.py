@@ -0,0 +1,176 @@
+"""Crowd
+
+This file contains the crowd mode, which simulates large numbers of wandering NPCs. Rather than each NPC being its own
+Animated sprite with its own update() call, the positions, velocities and sizes of every NPC are stored in NumPy arrays
+and stepped together. Collision against the static colliders of the level is tested for the whole crowd at once.
+
+Only NPCs that are on screen have their sprite rect updated and are drawn, so NPCs elsewhere in the house cost only
+their share of the array maths.
+
+This mode requires NumPy.
+
+Author: Josh Rogers
+"""
+
+import numpy as np
+import pygame
+
+from dindins.settings import *
+from dindins import assets
+from dindins.objects import Animated
+
+
+class Crowd:
+    """Crowd of wandering NPCs
+
+    Positions are stored relative to where the world was when the crowd was built. As the camera moves the world
+    rather than the player, the crowd tracks how far one static object has moved to know where to draw each NPC.
+
+    Attributes:
+        pos: (n, 2) array of the top left of each NPC
+        vel: (n, 2) array of the pixels each NPC moves per frame
+        size: (n, 2) array of the width and height of each NPC
+        colliders: (m, 4) array of the left, top, right and bottom of each static collider
+        sprites: List of pygame.sprite.Sprite, one per NPC, only updated while on screen
+        speed: Pixels each NPC moves per frame while walking
+        wander: Chance each frame of an NPC picking a new direction
+        pause: Boolean indicating if the crowd should be paused
+    """
+    def __init__(self, objects, positions, speed=1, wander=0.02, seed=None):
+        """Builds the crowd
+
+        Args:
+            objects: ObjectsGroup of the level, used for static colliders
+            positions: List of (x, y) screen coordinates of the center of each NPC
+            speed: Pixels each NPC moves per frame (defaults to 1)
+            wander: Chance each frame of an NPC picking a new direction (defaults to 0.02)
+            seed: Seed for the random number generator (defaults to None)
+        """
+        self._rng = np.random.default_rng(seed)
+        self.speed = speed
+        self.wander = wander
+        self.pause = False
+        self.ticker = 0
+        self.rate = 2
+
+        # Images, indexed by direction then animation frame
+        self.images = [
+            [assets.load(f'{ASSETS}/juice/walk/{direction}/juice_walk_{direction}_{frame}.png') for frame in (1, 2)]
+            for direction in ('up', 'down', 'left', 'right')
+        ]
+        width, height = self.images[0][0].get_size()
+
+        count = len(positions)
+        self.size = np.full((count, 2), (width, height), dtype=np.int32)
+        self.pos = np.array(positions, dtype=np.int32).reshape(count, 2) - self.size // 2
+        self.vel = np.zeros((count, 2), dtype=np.int32)
+
+        # Static colliders
+        static = [object for object in objects.colliders() if not isinstance(object, Animated)]
+        self.colliders = np.array([
+            (object.boundingbox.left, object.boundingbox.top, object.boundingbox.right, object.boundingbox.bottom)
+            for object in static
+        ], dtype=np.int32).reshape(len(static), 4)
+
+        # Track the world moving
+        self.anchor = static[0]
+        self._anchorstart = self.anchor.rect.topleft
+
+        self.sprites = []
+        for i in range(count):
+            sprite = pygame.sprite.Sprite()
+            sprite.image = self.images[1][0]
+            sprite.rect = pygame.Rect(0, 0, width, height)
+            self.sprites.append(sprite)
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def _collide(self, pos):
+        """Tests every NPC against every static collider
+
+        Args:
+            pos: (n, 2) array of NPC positions to test
+
+        Returns:
+            (n,) boolean array indicating which NPCs are colliding
+        """
+        left = pos[:, 0, None]
+        top = pos[:, 1, None]
+        right = left + self.size[:, 0, None]
+        bottom = top + self.size[:, 1, None]
+        boxes = self.colliders
+        return ((left < boxes[:, 2]) & (right > boxes[:, 0]) & (top < boxes[:, 3]) & (bottom > boxes[:, 1])).any(axis=1)
+
+    def update(self):
+        """Steps every NPC
+
+        Some NPCs pick a new direction each frame. Movement is then applied one axis at a time, and any NPC that would
+        walk into a collider on that axis stays put and turns around.
+        """
+        if self.pause:
+            return
+
+        # Pick new directions, which may be standing still
+        turning = self._rng.random(len(self)) < self.wander
+        if turning.any():
+            directions = np.array([(0, 0), (0, -1), (0, 1), (-1, 0), (1, 0)], dtype=np.int32)
+            self.vel[turning] = directions[self._rng.integers(0, len(directions), turning.sum())] * self.speed
+
+        # Move each axis separately so NPCs slide along walls
+        for axis in (0, 1):
+            moved = self.pos.copy()
+            moved[:, axis] += self.vel[:, axis]
+            blocked = self._collide(moved)
+            self.pos[~blocked, axis] = moved[~blocked, axis]
+            self.vel[blocked, axis] *= -1
+
+        self.ticker += 1
+
+    def draw(self, surface):
+        """Draws the NPCs that are on screen
+
+        Args:
+            surface: pygame.Surface to draw on
+        """
+        offset = (self.anchor.rect.left - self._anchorstart[0], self.anchor.rect.top - self._anchorstart[1])
+        screen = self.pos + offset
+        width, height = surface.get_size()
+        visible = np.flatnonzero(
+            (screen[:, 0] < width) & (screen[:, 0] + self.size[:, 0] > 0) &
+            (screen[:, 1] < height) & (screen[:, 1] + self.size[:, 1] > 0)
+        )
+        if not len(visible):
+            return
+
+        # Face the direction of movement, up/down takes priority as with the player
+        vel = self.vel[visible]
+        direction = np.where(vel[:, 1] < 0, 0, np.where(vel[:, 1] > 0, 1, np.where(vel[:, 0] < 0, 2, np.where(vel[:, 0] > 0, 3, 1))))
+        frame = int(self.ticker // (FPS / self.rate)) % 2
+        walking = vel.any(axis=1)
+
+        blits = []
+        for i, x, y, d, w in zip(visible.tolist(), screen[visible, 0].tolist(), screen[visible, 1].tolist(), direction.tolist(), walking.tolist()):
+            sprite = self.sprites[i]
+            sprite.rect.topleft = (x, y)
+            sprite.image = self.images[d][frame if w else 0]
+            blits.append((sprite.image, sprite.rect))
+
+        surface.blits(blits, doreturn=False)
+
+
+def spawn(navgrid, pos, count, seed=None):
+    """Picks random positions for a crowd that can be walked to from a position
+
+    Args:
+        navgrid: NavGrid of the level
+        pos: (x, y) screen coordinates that every NPC must be able to reach, usually the player
+        count: Number of positions to pick
+        seed: Seed for the random number generator (defaults to None)
+
+    Returns:
+        List of (x, y) screen coordinates
+    """
+    rng = np.random.default_rng(seed)
+    reachable = np.flatnonzero(np.isfinite(navgrid.flowfield(pos).distance))
+    return [navgrid.center(int(cell)) for cell in rng.choice(reachable, count)]
@@ -0,0 +1,241 @@
+"""Environment
+
+This file contains an environment for running automated agents against DinDins, in the style of a Gym environment.
+The environment wraps a GameScreen and steps it one frame per action, as fast as the agent can go, with no window and
+no simulated key presses. VecEnv runs many independent environments in worker processes so throughput scales with the
+number of cores.
+
+As pygame has a single event queue per process, only one environment should be created per process. VecEnv takes care
+of this by giving each environment its own worker.
+
+Frame observations require NumPy.
+
+Author: Josh Rogers
+"""
+
+import multiprocessing
+import os
+
+import pygame
+
+from dindins.settings import *
+from dindins import controls
+
+# Keys held down for each action
+ACTIONS = [
+    (),
+    (pygame.K_UP,),
+    (pygame.K_DOWN,),
+    (pygame.K_LEFT,),
+    (pygame.K_RIGHT,),
+    (pygame.K_UP, pygame.K_LSHIFT),
+    (pygame.K_DOWN, pygame.K_LSHIFT),
+    (pygame.K_LEFT, pygame.K_LSHIFT),
+    (pygame.K_RIGHT, pygame.K_LSHIFT),
+    (pygame.K_SPACE,),
+]
+
+# Action names, matching ACTIONS
+NOOP, UP, DOWN, LEFT, RIGHT, SPRINT_UP, SPRINT_DOWN, SPRINT_LEFT, SPRINT_RIGHT, INTERACT = range(len(ACTIONS))
+
+
+class DinDinsEnv:
+    """DinDins environment
+
+    Each step holds down the keys of the action for one frame. The interact action also presses space, as if the
+    player had just pressed it. Completing an objective gives a reward of 1, and the episode is done once every
+    objective is complete or the game is over.
+
+    Observations are dictionaries containing:
+        position: (x, y) position of the player in the level
+        objects: List of (name, x, y) of the objects within the radius of the player that can be collided with,
+            interacted with or triggered, relative to the player
+        objective: Name of the current objective
+        frame: (height, width, 3) NumPy array of the screen, scaled down to the frame size. Only included if a frame
+            size is given.
+
+    Attributes:
+        screen: GameScreen being played
+        frame: (width, height) to scale the screen down to for frame observations, or None for no frames
+        radius: Distance in pixels from the player to include objects in observations
+        steps: Number of steps taken in the current episode
+    """
+    def __init__(self, frame=None, radius=200, **kwargs):
+        """Initialises pygame without a window
+
+        Args:
+            frame: (width, height) of frame observations (defaults to None, for no frames)
+            radius: Distance from the player to include objects (defaults to 200)
+            kwargs: Arguments passed on to GameScreen
+        """
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.init()
+        if not pygame.display.get_surface():
+            pygame.display.set_mode((1, 1))
+
+        self.frame = frame
+        self.radius = radius
+        self.screen = None
+        self.steps = 0
+        self._kwargs = kwargs
+
+    def reset(self):
+        """Starts a new game
+
+        Returns:
+            The first observation
+        """
+        # Imported here so the game is only loaded once pygame is set up
+        from dindins.main import GameScreen
+
+        pygame.event.clear()
+        self.screen = GameScreen(**self._kwargs)
+        self.steps = 0
+        return self._observe()
+
+    def step(self, action):
+        """Plays one frame
+
+        Args:
+            action: Index of the action in ACTIONS
+
+        Returns:
+            Tuple of (observation, reward, done, info)
+        """
+        keys = ACTIONS[action]
+        controls.override(controls.KeyState(keys))
+        try:
+            if pygame.K_SPACE in keys:
+                self.screen.handle(pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_SPACE}))
+
+            remaining = len(self.screen.objectives)
+            for event in pygame.event.get():
+                self.screen.handle(event)
+
+            screen = self.screen.update()
+            gameover = screen is not self.screen
+            if not gameover:
+                self.screen.simulate()
+                self.screen.render()
+        finally:
+            controls.override(None)
+
+        self.steps += 1
+        reward = remaining - len(self.screen.objectives)
+        done = gameover or self.screen.objectives[0] == 'nothing'
+        info = {'gameover': gameover, 'steps': self.steps}
+
+        return self._observe(), reward, done, info
+
+    def _observe(self):
+        """Builds an observation of the current screen"""
+        player = self.screen.player.sprite.rect
+        area = player.inflate(self.radius * 2, self.radius * 2)
+
+        objects = []
+        for object in self.screen.gameobjects.query(area):
+            if object.boundingbox or object.interactable or object.triggerable:
+                objects.append((object.name, object.rect.centerx - player.centerx, object.rect.centery - player.centery))
+
+        observation = {
+            'position': self.screen.navgrid.world(player.center),
+            'objects': objects,
+            'objective': self.screen.objectives[0],
+        }
+
+        if self.frame:
+            observation['frame'] = pygame.surfarray.array3d(pygame.transform.scale(self.screen, self.frame)).swapaxes(0, 1)
+
+        return observation
+
+    def close(self):
+        """Shuts down pygame"""
+        from dindins.gui import Text
+
+        Text.clear()
+        pygame.quit()
+
+
+def _worker(pipe, kwargs):
+    """Runs an environment in a worker process
+
+    Args:
+        pipe: multiprocessing.Connection to receive commands on and send results back
+        kwargs: Arguments passed on to DinDinsEnv
+    """
+    env = DinDinsEnv(**kwargs)
+    while True:
+        command, data = pipe.recv()
+        if command == 'reset':
+            pipe.send(env.reset())
+        elif command == 'step':
+            observation, reward, done, info = env.step(data)
+            # Start the next episode straight away, keeping the last observation of this one
+            if done:
+                info['final'] = observation
+                observation = env.reset()
+            pipe.send((observation, reward, done, info))
+        elif command == 'close':
+            env.close()
+            pipe.close()
+            break
+
+
+class VecEnv:
+    """Vectorised environment
+
+    Runs a number of independent environments, one per worker process, and steps them all together. Environments that
+    finish are reset automatically, with the final observation of the episode given in info['final'].
+
+    Attributes:
+        count: Number of environments
+    """
+    def __init__(self, count, **kwargs):
+        """Starts the workers
+
+        Args:
+            count: Number of environments to run
+            kwargs: Arguments passed on to each DinDinsEnv
+        """
+        self.count = count
+        self._pipes = []
+        self._workers = []
+        for _ in range(count):
+            parent, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_worker, args=(child, kwargs), daemon=True)
+            worker.start()
+            child.close()
+            self._pipes.append(parent)
+            self._workers.append(worker)
+
+    def reset(self):
+        """Starts a new game in every environment
+
+        Returns:
+            List of the first observation of each environment
+        """
+        for pipe in self._pipes:
+            pipe.send(('reset', None))
+        return [pipe.recv() for pipe in self._pipes]
+
+    def step(self, actions):
+        """Plays one frame in every environment
+
+        Args:
+            actions: List of actions, one per environment
+
+        Returns:
+            Tuple of lists (observations, rewards, dones, infos)
+        """
+        for pipe, action in zip(self._pipes, actions):
+            pipe.send(('step', action))
+        results = [pipe.recv() for pipe in self._pipes]
+        return tuple(list(result) for result in zip(*results))
+
+    def close(self):
+        """Stops the workers"""
+        for pipe in self._pipes:
+            pipe.send(('close', None))
+        for worker in self._workers:
+            worker.join()
@@ -0,0 +1,18 @@
+"""Events
+
+This file contains the custom pygame event types posted by game objects and handled by the screens. They are kept out
+of the settings so the settings can be read without importing pygame.
+
+Author: Josh Rogers
+"""
+
+import pygame
+
+PAUSE = pygame.USEREVENT + 1
+RESUME = PAUSE + 1
+HIDE = RESUME + 1
+RENDER = HIDE + 1
+OBJECTIVE = RENDER + 1
+GAME_OVER = OBJECTIVE + 1
+SOUND = GAME_OVER + 1
+EFFECT = SOUND + 1
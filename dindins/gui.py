@@ -2,13 +2,21 @@
 
 This file contains objects used to give the user a GUI. This includes text, buttons, and dialogue boxes.
 
+Positions and sizes given to GUI objects are in game coordinates, the same as every other object. When the window is
+scaled up, GUI objects are rendered at the scaled resolution, so their surfaces and rects are SCALE times larger and in
+window coordinates. This keeps text sharp rather than scaling it up with the game.
+
 Author: Josh Rogers
 """
 
 import pygame
+from functools import lru_cache
 from math import ceil
 
 from dindins.settings import *
+from dindins.events import PAUSE, RESUME
+from dindins import controls
+from dindins.surfaces import pool
 
 
 class Text:
@@ -17,7 +25,35 @@ class Text:
     This class provides a simple helper method to produce the pygame text and rect objects required for displaying text
     on a screen. The text object contains the pygame.Surface object the text is rendered on to, and the rect object is
     used for positioning the text.
+
+    Fonts are loaded once, and recently rendered text is kept, so text drawn every frame is only rendered once. Text
+    surfaces are shared, so they must not be drawn on.
     """
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def font(font='freesansbold.ttf', size=18):
+        """Gets a font, loading it the first time it is used
+
+        Args:
+            font: Font file (defaults to freesansbold.ttf)
+            size: Size of text, before scaling to the window (defaults to 18)
+
+        Returns:
+            pygame.font.Font
+        """
+        return pygame.font.Font(font, size * SCALE)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _rendered(text, fg, bg, font, size):
+        return Text.font(font, size).render(text, True, fg, bg)
+
+    @staticmethod
+    def clear():
+        """Forgets loaded fonts and rendered text, which must be done if pygame is shut down and started again"""
+        Text.font.cache_clear()
+        Text._rendered.cache_clear()
+
     @staticmethod
     def render(text, fg, pos, bg=None, font='freesansbold.ttf', size=18):
         """Creates the text objects
@@ -31,12 +67,11 @@ class Text:
             size: Size of text (defaults to 18)
 
         Returns:
-            A tuple of the text and rect objects
+            A tuple of the text and rect objects, scaled to the window
         """
-        font = pygame.font.Font(font, size)
-        text = font.render(text, True, fg, bg)
+        text = Text._rendered(text, tuple(fg), tuple(bg) if bg else None, font, size)
         rect = text.get_rect()
-        rect.center = pos
+        rect.center = (pos[0] * SCALE, pos[1] * SCALE)
         return text, rect
 
 
@@ -45,17 +80,25 @@ class Button(pygame.Surface):
 
     A button is essentially a filled rectangle with text that executes an action when clicked.
 
+    The inactive, hover and pressed looks of the button are rendered once when it is created. The button only changes
+    between them when its state changes, which is driven by mouse events passed to handle(), and is flagged as dirty
+    when it does. The action is called once per click, when the mouse is released over the button.
+
     Attributes:
         rect: Rect/position of the button
         text_surface: Text surface of the button
         text_rect: Position of the text on the button
         ic: Inactive colour (defaults to GREEN)
         ac: Active colour (defaults to BLUE)
+        pc: Pressed colour (defaults to the active colour)
         width: Width of the button (defaults to 100)
         height: Height of the button (defaults to 100)
         action: Callback for when button is pressed
+        state: Current state of the button, one of 'inactive', 'hover' or 'pressed'
+        states: Dictionary of the pre-rendered surface for each state
+        dirty: Boolean indicating the button has changed since it was last drawn
     """
-    def __init__(self, text, pos, fg=RED, ic=GREEN, ac=BLUE, width=100, height=100, font='freesansbold.ttf', size=18, action=None):
+    def __init__(self, text, pos, fg=RED, ic=GREEN, ac=BLUE, pc=None, width=100, height=100, font='freesansbold.ttf', size=18, action=None):
         """Creates the button
 
         Args:
@@ -64,66 +107,99 @@ class Button(pygame.Surface):
             fg: Text colour
             ic: Inactive colour
             ac: Active colour
+            pc: Pressed colour
             width: Width of the button
             height: Height of the button
             font: Font of the text
             size: Font size
             action: Callback for when the button is pressed
         """
-        super().__init__((width, height))
+        super().__init__((width * SCALE, height * SCALE))
         self.rect = self.get_rect()
-        self.rect.center = pos
+        self.rect.center = (pos[0] * SCALE, pos[1] * SCALE)
         self.text_surface, self.text_rect = Text.render(text, fg, (width / 2, height / 2), font=font, size=size)
 
         self.ic = ic
         self.ac = ac
+        self.pc = pc if pc else ac
         self.width = width
         self.height = height
         self.action = action
 
-    def render(self):
-        """Renders the button
+        # Pre-render each state
+        self.states = {}
+        for state, colour in (('inactive', self.ic), ('hover', self.ac), ('pressed', self.pc)):
+            surface = pygame.Surface(self.get_size())
+            surface.fill(colour)
+            surface.blit(self.text_surface, self.text_rect)
+            self.states[state] = surface
+
+        self.state = None
+        self._setstate('hover' if self.rect.collidepoint(pygame.mouse.get_pos()) else 'inactive')
 
-        Renders the button and checks if the mouse is hovering over the button and/or has been clicked. If the mouse is
-        hovering over the button then the background should be changed to the active colour. If the button is clicked
-        then it's stored action will be called.
+    def _setstate(self, state):
+        """Switches to the surface of a new state
+
+        Args:
+            state: State to switch to
         """
-        mouse = pygame.mouse.get_pos()
-        click = pygame.mouse.get_pressed()
+        if state != self.state:
+            self.state = state
+            self.blit(self.states[state], (0, 0))
+            self.dirty = True
 
-        # Get x, y to position rect
-        x, y = self.rect.center
-        x -= self.width / 2
-        y -= self.height / 2
+    def handle(self, event):
+        """Handles mouse events
 
-        # Check if mouse is over button
-        if x + self.width > mouse[0] > x and y + self.height > mouse[1] > y:
-            # Change to active colour
-            self.fill(self.ac)
+        Args:
+            event: pygame.event.Event to handle
+        """
+        if event.type == pygame.MOUSEMOTION:
+            if self.rect.collidepoint(event.pos):
+                # Keep the pressed look while the mouse is held over the button
+                if self.state == 'inactive':
+                    self._setstate('pressed' if event.buttons[0] else 'hover')
+            else:
+                self._setstate('inactive')
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.rect.collidepoint(event.pos):
+                self._setstate('pressed')
+
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            if self.rect.collidepoint(event.pos):
+                clicked = self.state == 'pressed'
+                self._setstate('hover')
+                if clicked and self.action:
+                    self.action()
+            else:
+                self._setstate('inactive')
 
-            # Check if button was clicked
-            if click[0] and self.action:
-                self.action()
-        else:
-            # Set to inactive colour
-            self.fill(self.ic)
+    def render(self):
+        """Renders the button
 
-        # Render text onto button
-        self.blit(self.text_surface, self.text_rect)
+        The button is already drawn whenever its state changes, so there is nothing to do each frame.
+        """
+        pass
 
 
-class DialogueBox(pygame.Surface):
+class DialogueBox:
     """Dialogue box
 
     The dialogue box presents text to the user in a typewriter fashion. That is, each character is printed one at a
     time. If the character would go over the edge of the box,then it is instead printed to a newline.
 
+    The box is drawn on a surface leased from the surface pool, which is given back with release() once the box has
+    been closed, so dialogue boxes reuse the same surface rather than each making their own.
+
     Attributes:
+        surface: pygame.Surface the box is drawn on, or None once released
         rect: Position of the box
         fg: Colour of text
         bg: Background colour of box
         width: Width of the box
         height: Height of the box
+        text: String being printed
         buffer: Characters remaining to be printed to screen
         typed: List of lines that have been printed to the screen
         finished: Boolean that indicates that the user has pressed space to close the box
@@ -139,9 +215,9 @@ class DialogueBox(pygame.Surface):
             width: Width of box (defaults to 500)
             height: Height of box (defaults to 100)
         """
-        super().__init__((width, height))
-        self.rect = self.get_rect()
-        self.rect.center = pos
+        self.surface = pool.lease((width * SCALE, height * SCALE))
+        self.rect = self.surface.get_rect()
+        self.rect.center = (pos[0] * SCALE, pos[1] * SCALE)
 
         # Properties
         self.fg = fg
@@ -150,6 +226,7 @@ class DialogueBox(pygame.Surface):
         self.height = height
 
         # Set text buffer
+        self.text = text
         self.buffer = [character for character in text]
         self.typed = ['']
 
@@ -159,66 +236,211 @@ class DialogueBox(pygame.Surface):
         # Pause while box is up
         pygame.event.post(pygame.event.Event(PAUSE, {}))
 
-    def render(self):
-        """Renders the dialogue box
+    def _type(self):
+        """Prints the next character in the buffer"""
+        # Get character and add it to typed
+        char = self.buffer.pop(0)
+        self.typed[-1] += char
 
-        One at a time the characters in the buffer are printed on the box. If a character would go over the edge of the
-        box it is instead printed on a newline. This continues until the buffer is empty. When this happens, the user is
-        prompted to 'Press space to continue'. Pressing space will then close the box.
-        """
-        # Fill background
-        self.fill(self.bg)
+        # Get size of text with added character
+        w, h = Text.font().size(self.typed[-1])
+
+        # Split and create new line if the character goes past box width
+        if w > (self.width - 10) * SCALE:
+            split = self.typed[-1].rsplit(' ', 1)
+            self.typed[-1] = split[-2:][0]
+            self.typed.append(split[-1])
 
-        keystate = pygame.key.get_pressed()
+    def seek(self, count):
+        """Goes back to having printed a number of characters, such as when restoring a snapshot of the game
 
+        Args:
+            count: Number of characters of the text printed
+        """
+        count = min(count, len(self.text))
+        typed = len(self.text) - len(self.buffer)
+        if count < typed:
+            self.buffer = [character for character in self.text]
+            self.typed = ['']
+            typed = 0
+
+        for _ in range(count - typed):
+            self._type()
+
+    def update(self):
+        """Types the dialogue box
+
+        One at a time each tick the characters in the buffer are printed on the box. If a character would go over the
+        edge of the box it is instead printed on a newline. This continues until the buffer is empty, then pressing
+        space closes the box.
+        """
         # Characters left to print
         if self.buffer:
-            # Get character and add it to typed
-            char = self.buffer.pop(0)
-            self.typed[-1] += char
+            self._type()
+
+        # Nothing left to print, close the box once space is pressed
+        elif controls.pressed()[pygame.K_SPACE]:
+            self.finished = True
+            pygame.event.post(pygame.event.Event(RESUME, {}))
 
-            # Get size of text with added character
-            text_surface, text_rect = Text.render(self.typed[-1], self.fg, (0, 0))
-            w, h = text_surface.get_size()
+    def render(self):
+        """Renders the dialogue box
 
-            # Split and create new line if the character goes past box width
-            if w > self.width - 10:
-                split = self.typed[-1].rsplit(' ', 1)
-                self.typed[-1] = split[-2:][0]
-                self.typed.append(split[-1])
+        Draws the lines printed so far, and once every character has been printed prompts the user to 'Press space to
+        continue'.
+        """
+        # Lease a surface again if the box was closed and has been brought back, such as by a snapshot
+        if self.surface is None:
+            self.surface = pool.lease((self.width * SCALE, self.height * SCALE))
+
+        # Fill background
+        self.surface.fill(self.bg)
 
         # Nothing left to print, tell user to press space to continue
-        else:
+        if not self.buffer:
             text, rect = Text.render('Press space to continue...', self.fg, (self.width * 0.8, self.height - 10), size=12)
-            self.blit(text, rect)
-
-            if keystate[pygame.K_SPACE]:
-                self.finished = True
-                pygame.event.post(pygame.event.Event(RESUME, {}))
+            self.surface.blit(text, rect)
 
         # Print out each line
         y = 0
         for line in self.typed:
             text, rect = Text.render(line, self.fg, (0, 0))
-            self.blit(text, (10, y))
+            self.surface.blit(text, (10 * SCALE, y * SCALE))
             y += 20
 
+    def release(self):
+        """Gives the surface of the box back to the surface pool"""
+        if self.surface is not None:
+            pool.release(self.surface)
+            self.surface = None
 
-class StaminaBar(pygame.Surface):
-    def __init__(self, pos, stamina, width=150, height=25):
-        super().__init__((width, height))
+
+class Widget(pygame.Surface):
+    """HUD widget
+
+    A widget is a small surface on the HUD, such as the stamina bar, that shows a value. Widgets draw into their own
+    persistent surface, and only when their value has changed. Setting dirty to True marks the widget as needing to be
+    redrawn.
+
+    Attributes:
+        rect: Position of the widget
+        width: Width of the widget
+        height: Height of the widget
+        dirty: Boolean indicating the widget has changed since it was last drawn
+    """
+    def __init__(self, pos, width, height):
+        """Creates the widget
+
+        Args:
+            pos: (x, y) coordinates of the center of the widget
+            width: Width of the widget
+            height: Height of the widget
+        """
+        super().__init__((width * SCALE, height * SCALE))
         self.rect = self.get_rect()
-        self.rect.center = pos
+        self.rect.center = (pos[0] * SCALE, pos[1] * SCALE)
 
         self.width = width
         self.height = height
+        self.dirty = True
 
-        self.stamina = stamina
-        self.blocked = False
+    def draw(self):
+        """Draws the widget onto itself
+
+        To be implemented by the child object.
+        """
+        raise NotImplementedError
 
     def render(self):
+        """Redraws the widget if it has changed
+
+        Returns:
+            True if the widget was redrawn
+        """
+        if not self.dirty:
+            return False
+
+        self.draw()
+        self.dirty = False
+        return True
+
+
+class StaminaBar(Widget):
+    """Stamina bar
+
+    Shows the remaining stamina of the player as a red bar.
+
+    Attributes:
+        stamina: Remaining stamina, from 0 to 100
+        blocked: Boolean indicating the player has run out of stamina and can not sprint until it is full
+    """
+    def __init__(self, pos, stamina, width=150, height=25):
+        super().__init__(pos, width, height)
+        self._stamina = stamina
+        self.blocked = False
+
+    @property
+    def stamina(self):
+        return self._stamina
+
+    @stamina.setter
+    def stamina(self, stamina):
+        if stamina != self._stamina:
+            self._stamina = stamina
+            self.dirty = True
+
+    def draw(self):
         self.fill(WHITE)
-        remaining = pygame.Surface((ceil((self.stamina / 100) * self.width), self.height))
-        remaining.fill(RED)
+        self.fill(RED, (0, 0, ceil((self._stamina / 100) * self.width) * SCALE, self.height * SCALE))
+
+
+class HUD(pygame.Surface):
+    """Heads up display
+
+    The HUD composites every widget onto a single cached surface covering the area of the widgets, so drawing the HUD
+    is one call. A widget is only redrawn onto the HUD when it has changed.
+
+    Attributes:
+        rect: Position of the HUD, covering every widget
+        widgets: List of widgets on the HUD
+    """
+    def __init__(self):
+        super().__init__((0, 0), pygame.SRCALPHA)
+        self.rect = self.get_rect()
+        self.widgets = []
+
+    def __bool__(self):
+        return bool(self.widgets)
+
+    def add(self, *widgets):
+        """Adds widgets to the HUD
 
-        self.blit(remaining, remaining.get_rect())
+        The HUD surface is rebuilt to cover the new widgets.
+
+        Args:
+            widgets: Widgets to add
+        """
+        self.widgets.extend(widgets)
+        self.rect = self.widgets[0].rect.unionall([widget.rect for widget in self.widgets])
+        super().__init__(self.rect.size, pygame.SRCALPHA)
+        for widget in self.widgets:
+            widget.dirty = True
+
+    def render(self):
+        """Redraws any widgets that have changed onto the HUD"""
+        for widget in self.widgets:
+            if widget.render():
+                self.blit(widget, widget.rect.move(-self.rect.left, -self.rect.top))
+
+    def draw(self, surface):
+        """Draws the HUD
+
+        Only the areas covered by widgets are drawn, so widgets far apart do not cost a blit of the space between them.
+
+        Args:
+            surface: pygame.Surface to draw on
+        """
+        surface.blits(
+            [(self, widget.rect, widget.rect.move(-self.rect.left, -self.rect.top)) for widget in self.widgets],
+            doreturn=False
+        )
@@ -0,0 +1,157 @@
+"""Level
+
+This file contains the layout of the house and the objectives played out in it. It is only imported once a game is
+started, so the menus can be shown without loading it.
+
+Author: Josh Rogers
+"""
+
+import pygame
+
+from dindins.settings import *
+from dindins import assets
+from dindins.objects import BaseObject, HideObject, DialogueBoxObject, Zone, tile, tileset
+from dindins.quests import (
+    Objective, Reaction, Interacted, Entered, Timer, Dialogue, Spawn, Hide, Sound, Effect, GameOver
+)
+
+# Rooms of the house in level coordinates, used for lighting. Together they cover the house without overlapping.
+ROOMS = {
+    'living': (250, -490, 370, 270),
+    'courtyard': (250, -220, 260, 250),
+    'hallway': (510, -220, 110, 765),
+    'alcove': (250, 30, 260, 165),
+    'bedroom': (250, 195, 260, 350),
+    'lobby': (250, 545, 370, 110),
+}
+
+# Rooms open to the sky, lit by the ambient light outdoors
+OUTDOORS = ('courtyard',)
+
+# Ambient light indoors and outdoors at each time of day
+AMBIENT = {
+    'day': {'indoors': (185, 180, 170), 'outdoors': (255, 255, 255)},
+    'night': {'indoors': (40, 40, 60), 'outdoors': (60, 70, 110)},
+}
+
+# Light shining in through each glass wall at each time of day
+WINDOW_LIGHT = {
+    'day': (255, 240, 200),
+    'night': (20, 25, 50),
+}
+
+# Light sources (x, y, radius, colour) at each time of day
+LIGHTS = {
+    'day': [],
+    'night': [
+        (585, -460, 400, (255, 190, 120)),  # Lamp
+    ],
+}
+
+# Objectives in the order they are played, positions are in level coordinates
+OBJECTIVES = (
+    Objective(
+        'eat_food', Interacted('bowls'),
+        Dialogue('What was that?                       ...                  I should go hide under the bed!'),
+        Effect('crumbs', 'bowls'),
+    ),
+    Objective(
+        'hide_under_bed', Interacted('bed'),
+        Hide('bed'),
+        Dialogue('I think the coast is clear... I can go back to eating my breakfast.'),
+        reactions=(
+            Reaction(Interacted('bowls'), Sound('bang', priority=1), Dialogue('I need to hide under the bed!')),
+        ),
+    ),
+    Objective(
+        'go_to_food', Entered('juice_trigger'),
+        Spawn('dindins.characters.juice.Juice', (405, -390)),
+        Dialogue('Oh no, it\'s Juice! She always bullies me when the humans leave. I better avoid her.'),
+        start=(Spawn(Zone, (555, 310), 'juice_trigger'),),
+    ),
+    Objective(
+        'avoid_juice', Timer(60),
+        Dialogue('Juice has finally gotten bored of chasing me. Now I can eat in peace.'),
+        reactions=(Reaction(Entered('juice'), GameOver()),),
+    ),
+    Objective('nothing'),
+)
+
+
+def load(objects):
+    """Adds the objects of the house to a group
+
+    Args:
+        objects: ObjectsGroup to add the objects to
+    """
+    # Floor
+    objects.add(
+        tileset((590, -226), 10, 7, 'living_floor'),
+        tileset((495, 18), 7, 7, 'courtyard_floor', type='tile'),
+        tileset((580, 630), 3, 2, 'lobby_floor'),
+        tileset((589, 534), 2, 25, 'hallway_floor'),
+        tileset((493, 94), 1, 2, 'alcove_floor'),
+        tileset((495, 376), 7, 5, 'bedroom_floor', type='carpet')
+    )
+
+    # Walls
+    objects.add(
+        tile((600, 210), 11, 875, 'hallway_east', boundingbox=(-1, 438, 5, 438)),  # Hallway east wall
+        tile((535, 645), 140, 10, 'lobby_south', boundingbox=(70, 1, 70, 1)),  # Lobby south wall
+        tile((470, 595), 10, 100, 'lobby_west', boundingbox=(5, 50, -2, 50)),  # Lobby west wall
+        tile((490, 545), 50, 10, 'lobby_north', boundingbox=(25, 19, 5, -18)),   # Lobby north wall
+        tile((510, 470), 10, 160, 'hallway_west_lobbytobedroom', boundingbox=(5, 79, -2, 59)),  # Hallway west wall (lobby -> bedroom)
+        tile((380, 395), 250, 10, 'bedroom_south', boundingbox=(125, 1, 125, 1)),  # Bedroom south wall
+        tile((510, 215), 10, 220, 'hallway_west_bedroomtostudy', boundingbox=(3, 110, -2, 90)),  # Hallway west wall (bedroom -> study)
+        tile((380, 195), 250, 10, 'bedroom_north', boundingbox=(125, 19, 125, -18)),  # Bedroom north wall
+        tile((260, 295), 10, 200, 'bedroom_west', boundingbox=(5, 100, -2, 100)),  # Bedroom west wall
+        tile((480, 110), 50, 10, 'alcove_south', boundingbox=(25, 1, 25, 1)),    # Alcove south wall
+        tile((450, 65), 10, 100, 'alcove_west', boundingbox=(5, 50, -2, 50)),  # Alcove west wall
+        tile((480, 20), 50, 10, 'alcove_north', boundingbox=(25, 19, 25, -18)),    # Alcove north wall
+        tile((510, -100), 10, 250, 'hallway_west_glass', boundingbox=(5, 120, -2, 100)),  # Hallway west wall, looking into courtyard
+        tile((385, -220), 250, 10, 'living_south_glass', boundingbox=(125, 1, 125, 1)),   # Living room south wall, looking into courtyard
+        tile((259, -219), 11, 502, 'courtyard_kitchen_west', boundingbox=(5, 250, -2, 250)),   # Courtyard and kitchen west wall
+        tile((355, 30), 200, 10, 'study_north_glass'),  # Study north wall, looking into courtyard
+        tile((435, -465), 355, 10, 'living_north', boundingbox=(178, 19, 178, -18)),     # Living room/kitchen north wall
+        tile((610, -345), 10, 250, 'living_east', boundingbox=(-1, 125, 5, 125))      # Living room east wall
+    )
+
+    # Doors
+    greysurface = pygame.Surface((50, 20))
+    greysurface.fill(GREY)
+    objects.add(
+        DialogueBoxObject((560, 645), greysurface, 'Scary people come through this door. I would never dare go out there.', 'front_door'),     # Front door
+        DialogueBoxObject((510, 450), pygame.transform.rotate(greysurface, 90), 'My humans litterbox is in there.', 'bathroom_door_hallway'),    # Bathroom door (from hallway)
+        DialogueBoxObject((470, 595), pygame.transform.rotate(greysurface, 90), 'I used to sleep in this room, but now it\'s never open.', 'storage_door'),   # Room 1
+        DialogueBoxObject((440, 395), greysurface, 'My humans litterbox is in there.', 'bathroom_door_bedroom'),  # Bathroom door (from bedroom)
+        DialogueBoxObject((320, 395), greysurface, 'This goes to a courtyard. There was once a trapped bird in there.', 'courtyard_door_bedroom'),   # Bedroom courtyard
+        DialogueBoxObject((510, 150), pygame.transform.rotate(greysurface, 90), 'This is where my humans spend most of their time. It\'s only open when they\'re home.', 'study_door'),          # Study
+        DialogueBoxObject((325, -485), assets.load(f'{ASSETS}/objects/door.png'), 'Scary sounds come from this door. But my humans also come through here.', 'garage_door')    # Garage
+    )
+
+    # Other objects
+    objects.add(
+        BaseObject((425, -270), assets.load(f'{ASSETS}/objects/rug2.png'), 'table_rug', layer=FLOOR),
+        HideObject((425, -285), assets.load(f'{ASSETS}/objects/table.png'), 'table', boundingbox=(28, 22, 28, 10)),
+        BaseObject((340, 200), assets.load(f'{ASSETS}/objects/dresser.png'), 'dresser1', boundingbox=(7, 18, 8, 1)),
+        BaseObject((440, 200), assets.load(f'{ASSETS}/objects/dresser.png'), 'dresser2', boundingbox=(6, 18, 7, 1)),
+        BaseObject((585, -385), assets.load(f'{ASSETS}/objects/tv.png'), 'tv', boundingbox=(18, 64)),
+        BaseObject((375, -410), assets.load(f'{ASSETS}/objects/bench1.png'), 'bench1', boundingbox=(7, 56, 5, 35)),
+        BaseObject((278, -410), assets.load(f'{ASSETS}/objects/bench2.png'), 'bench2', boundingbox=(7, 56, 5, 35)),
+        BaseObject((325, -390), assets.load(f'{ASSETS}/objects/rug1.png'), 'kitchen_rug', layer=FLOOR),
+        BaseObject((518, -375), assets.load(f'{ASSETS}/objects/rug3.png'), 'living_rug', layer=FLOOR),
+        BaseObject((519, -380), assets.load(f'{ASSETS}/objects/coffee_table.png'), 'coffee_table',  boundingbox=(10, 26, 5, 6)),
+        BaseObject((585, -460), assets.load(f'{ASSETS}/objects/lamp.png'), 'lamp', boundingbox='image'),
+        BaseObject((585, -315), assets.load(f'{ASSETS}/objects/plant.png'), 'plant', boundingbox=(20, 10)),
+        BaseObject((455, -385), assets.load(f'{ASSETS}/objects/couch.png'), 'couch', boundingbox=(7, 40, 10, 20)),
+        BaseObject((283, 280), assets.load(f'{ASSETS}/objects/wardrobe.png'), 'wardrobe', boundingbox=(18, 48, 5, 30)),
+    )
+
+    # Objective objects
+    objects.add(
+        DialogueBoxObject((595, -260), assets.load(f'{ASSETS}/objects/bowls.png'), 'Yummy food, but no time for that now!', 'bowls', boundingbox=(1, 24, 8, 24)),
+        HideObject((395, 210), assets.load(f'{ASSETS}/objects/bed.png'), 'bed', boundingbox=(30, 38, 18, 15)),
+    )
+
+    # Shift objects for initial positioning
+    objects.move(-50, 800)
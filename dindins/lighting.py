@@ -0,0 +1,266 @@
+"""Lighting
+
+This file contains the lighting of the house. Lighting is far too slow to work out per pixel while the game is running,
+so it is baked ahead of time into a lightmap per room for each time of day. Each lightmap holds the ambient light of
+the room plus the light reaching it from every light source, such as the lamp or the daylight through the glass walls,
+with walls casting shadows. While playing, each room on screen is lit with a single multiplicative blit of its
+lightmap.
+
+Rooms are baked in parallel in a process pool, and the results are cached on disk, named by a hash of everything that
+goes into baking, so the cache is only rebuilt when the level or its lights change.
+
+Bake the lightmaps ahead of time with:
+    python -m dindins.lighting
+
+This module requires NumPy.
+
+Author: Josh Rogers
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pygame
+
+from dindins.settings import *
+from dindins.static import BOX
+
+# Change when baking changes, so lightmaps baked the old way are not used
+VERSION = 1
+
+
+def scene(objects, rooms, outdoors, ambient, windowlight, lights, cellsize=4, spacing=32, reach=160):
+    """Gathers everything that goes into baking the lightmaps of a level
+
+    Walls with a bounding box cast shadows, except glass walls, which instead let light in along their length.
+
+    Args:
+        objects: ObjectsGroup of the level
+        rooms: Dictionary of the (x, y, width, height) of each room, in level coordinates
+        outdoors: Names of the rooms lit by the ambient light outdoors
+        ambient: Dictionary of the indoor and outdoor ambient light of each time of day
+        windowlight: Dictionary of the colour of the light through glass walls at each time of day
+        lights: Dictionary of the (x, y, radius, colour) light sources of each time of day
+        cellsize: Pixels per lightmap cell (defaults to 4)
+        spacing: Pixels between the lights placed along glass walls (defaults to 32)
+        reach: Radius of the lights placed along glass walls (defaults to 160)
+
+    Returns:
+        Dictionary of plain data describing the scene
+    """
+    static = objects.static
+    static.sort()
+
+    occluders = []
+    windows = []
+    for i in range(len(static)):
+        if static.layer[i] != WALL:
+            continue
+        if static.names[static.name[i]].endswith('_glass'):
+            width, height = static.images[static.asset[i]].get_size()
+            windows.append((static.x[i], static.y[i], width, height))
+        elif static.flags[i] & BOX:
+            occluders.append((static.bx[i], static.by[i], static.bw[i], static.bh[i]))
+
+    # Line each glass wall with lights, down the middle of its longest side
+    phases = {}
+    for phase in lights:
+        sources = [list(light) for light in lights[phase]]
+        for x, y, width, height in windows:
+            length = max(width, height)
+            for step in range(spacing // 2, length, spacing):
+                if width >= height:
+                    sources.append([x + step, y + height / 2, reach, list(windowlight[phase])])
+                else:
+                    sources.append([x + width / 2, y + step, reach, list(windowlight[phase])])
+        phases[phase] = {'ambient': ambient[phase], 'lights': sources}
+
+    return {
+        'version': VERSION,
+        'cellsize': cellsize,
+        'rooms': {name: list(rect) for name, rect in rooms.items()},
+        'outdoors': list(outdoors),
+        'occluders': occluders,
+        'phases': phases,
+    }
+
+
+def key(scene):
+    """Gets the hash of a scene, used to name its cached lightmaps"""
+    return hashlib.blake2b(json.dumps(scene, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+
+def _bake(job):
+    """Bakes the lightmap of a room
+
+    Run in the worker processes, so it only takes and returns plain data.
+
+    Args:
+        job: Tuple of ((x, y, width, height) of the room, cellsize, ambient colour, lights, occluders)
+
+    Returns:
+        (rows, columns, 3) uint8 NumPy array of the light in each cell, where 255 leaves the colour as it is
+    """
+    (left, top, width, height), cellsize, ambient, lights, occluders = job
+    columns = -(-width // cellsize)
+    rows = -(-height // cellsize)
+    px, py = np.meshgrid(left + (np.arange(columns) + 0.5) * cellsize, top + (np.arange(rows) + 0.5) * cellsize)
+
+    light = np.empty((rows, columns, 3))
+    light[:] = ambient
+
+    occluders = np.array(occluders, dtype=float).reshape(-1, 4)
+    for x, y, radius, colour in lights:
+        dx = px - x
+        dy = py - y
+        distance = np.hypot(dx, dy)
+        lit = distance < radius
+        if not lit.any():
+            continue
+
+        dx = dx[lit]
+        dy = dy[lit]
+
+        # Walls within reach of the light
+        near = occluders[
+            (occluders[:, 0] < x + radius) & (occluders[:, 0] + occluders[:, 2] > x - radius) &
+            (occluders[:, 1] < y + radius) & (occluders[:, 1] + occluders[:, 3] > y - radius)
+        ]
+
+        # A cell is in shadow if the line from the light passes all the way through a wall before reaching it. Cells
+        # inside a wall are still lit, so the side of a wall facing the light is lit.
+        shadow = np.zeros(len(dx), dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for wx, wy, ww, wh in near:
+                tx1 = (wx - x) / dx
+                tx2 = (wx + ww - x) / dx
+                ty1 = (wy - y) / dy
+                ty2 = (wy + wh - y) / dy
+                enter = np.maximum(np.minimum(tx1, tx2), np.minimum(ty1, ty2))
+                leave = np.minimum(np.maximum(tx1, tx2), np.maximum(ty1, ty2))
+                shadow |= (enter < leave) & (enter > 0) & (leave < 1)
+
+        falloff = (1 - distance[lit] / radius) ** 2 * ~shadow
+        light[lit] += falloff[:, None] * colour
+
+    return np.clip(light, 0, 255).astype(np.uint8)
+
+
+def bake(scene, workers=None):
+    """Bakes the lightmap of every room at every time of day
+
+    Args:
+        scene: Scene from scene()
+        workers: Number of worker processes (defaults to None, for one per core)
+
+    Returns:
+        Dictionary of the lightmap array of each (time of day, room)
+    """
+    jobs = {}
+    for phase, lighting in scene['phases'].items():
+        for name, rect in scene['rooms'].items():
+            ambient = lighting['ambient']['outdoors' if name in scene['outdoors'] else 'indoors']
+            jobs[(phase, name)] = (tuple(rect), scene['cellsize'], ambient, lighting['lights'], scene['occluders'])
+
+    with ProcessPoolExecutor(workers) as pool:
+        return dict(zip(jobs, pool.map(_bake, jobs.values())))
+
+
+def cached(scene, cache=LIGHTMAP_CACHE, workers=None):
+    """Gets the lightmaps of a scene from the cache, baking and caching them if they are not there
+
+    Args:
+        scene: Scene from scene()
+        cache: Directory of cached lightmaps (defaults to LIGHTMAP_CACHE)
+        workers: Number of worker processes to bake with (defaults to None, for one per core)
+
+    Returns:
+        Dictionary of the lightmap array of each (time of day, room)
+    """
+    path = os.path.join(cache, f'{key(scene)}.npz')
+    if os.path.exists(path):
+        with np.load(path) as file:
+            return {tuple(name.split('/')): file[name] for name in file.files}
+
+    maps = bake(scene, workers)
+    os.makedirs(cache, exist_ok=True)
+    np.savez(path, **{f'{phase}/{name}': array for (phase, name), array in maps.items()})
+    return maps
+
+
+class Lighting:
+    """Baked lighting of a level
+
+    Rooms are kept in the coordinates of the static object store, so the camera moving the world only changes where
+    they are drawn.
+
+    Attributes:
+        static: StaticObjects store of the level, used for how far the world has moved
+        phase: Time of day being shown, which can be changed at any time to one that has been baked
+        rooms: Dictionary of a list of (pygame.Rect, lightmap pygame.Surface) of each room for each time of day
+    """
+    def __init__(self, objects, scene, maps, phase=TIME_OF_DAY):
+        """Scales the lightmaps up to the size of their rooms
+
+        Args:
+            objects: ObjectsGroup of the level
+            scene: Scene the lightmaps were baked from
+            maps: Dictionary of the lightmap array of each (time of day, room)
+            phase: Time of day to show (defaults to TIME_OF_DAY)
+        """
+        self.static = objects.static
+        self.phase = phase
+        self.rooms = {}
+        for (time, name), array in maps.items():
+            rect = pygame.Rect(scene['rooms'][name])
+            lightmap = pygame.transform.smoothscale(pygame.surfarray.make_surface(array.transpose(1, 0, 2)), rect.size)
+            self.rooms.setdefault(time, []).append((rect, lightmap))
+
+    def draw(self, surface):
+        """Lights each room on the surface
+
+        Args:
+            surface: pygame.Surface to light
+        """
+        x, y = self.static.offset
+        area = surface.get_rect()
+        for rect, lightmap in self.rooms[self.phase]:
+            rect = rect.move(x, y)
+            if area.colliderect(rect):
+                surface.blit(lightmap, rect, special_flags=pygame.BLEND_MULT)
+
+
+def load(objects, phase=TIME_OF_DAY, cache=LIGHTMAP_CACHE, workers=None):
+    """Loads the lighting of the house, baking it if it is not cached
+
+    Args:
+        objects: ObjectsGroup the house has been loaded into
+        phase: Time of day to show (defaults to TIME_OF_DAY)
+        cache: Directory of cached lightmaps (defaults to LIGHTMAP_CACHE)
+        workers: Number of worker processes to bake with (defaults to None, for one per core)
+
+    Returns:
+        Lighting of the house
+    """
+    from dindins import level
+
+    house = scene(objects, level.ROOMS, level.OUTDOORS, level.AMBIENT, level.WINDOW_LIGHT, level.LIGHTS)
+    return Lighting(objects, house, cached(house, cache, workers), phase)
+
+
+if __name__ == '__main__':
+    import time
+
+    from dindins import level
+    from dindins.objects import ObjectsGroup
+
+    objects = ObjectsGroup()
+    level.load(objects)
+    house = scene(objects, level.ROOMS, level.OUTDOORS, level.AMBIENT, level.WINDOW_LIGHT, level.LIGHTS)
+
+    start = time.perf_counter()
+    maps = cached(house)
+    print(f'Lightmaps of {len(maps)} rooms ready in {time.perf_counter() - start:.2f}s, cached as {key(house)}')
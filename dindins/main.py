@@ -1,6 +1,15 @@
-from dindins.characters.lucy import Lucy
-from dindins.characters.juice import Juice
-from dindins.objects import *
+import math
+
+import pygame
+
+from dindins.settings import *
+from dindins.events import PAUSE, RESUME, HIDE, RENDER, OBJECTIVE, GAME_OVER, SOUND, EFFECT
+from dindins import assets
+from dindins import controls
+from dindins.gui import Text, Button, DialogueBox, StaminaBar, HUD
+from dindins.objects import ObjectsGroup
+from dindins.collision import sweep
+from dindins.pacing import FramePacer
 
 
 class Screen(pygame.Surface):
@@ -14,8 +23,11 @@ class Screen(pygame.Surface):
     Attributes:
         text: List of text to be rendered
         buttons: List of buttons to be rendered
+        hud: HUD of widgets to be rendered on top of the game
         sprites: pygame.sprite.Group of sprites to be rendered
         dialogue: List of dialogue boxes to be rendered
+        systems: List of batched systems, such as crowds, that update and draw all of their objects in one pass
+        lighting: Lighting drawn over the game once everything else in the game has been drawn, or None for no lighting
     """
     def __init__(self):
         """Initiates pygame.Surface and attributes"""
@@ -26,19 +38,27 @@ class Screen(pygame.Surface):
         self.text = []
         self.buttons = []
         self.dialogue = []
+        self.hud = HUD()
         self.player = pygame.sprite.GroupSingle()
         self.gameobjects = ObjectsGroup()
+        self.systems = []
+        self.lighting = None
+        self._rendered = False
 
     def handle(self, event):
         """Handles events
 
         This method is to be implemented by the child object. The handler is used to process any events the current
         screen may be interested in. If no events are needed, then the implementation of this method can be omitted.
+        By default, mouse events are passed on to the buttons.
 
         Args:
             event: pygame.Event to be handled
         """
-        pass
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            for button in self.buttons:
+                if isinstance(button, Button):
+                    button.handle(event)
 
     def update(self):
         """Updates the screen
@@ -54,43 +74,102 @@ class Screen(pygame.Surface):
         """
         pass
 
+    def close(self):
+        """Closes the screen
+
+        This method is to be implemented by the child object. It is called once the screen is left, either for another
+        screen or because the game is closing, to let go of anything the screen holds open, such as sockets.
+        """
+        pass
+
+    def simulate(self):
+        """Steps everything that changes each tick
+
+        This includes animating objects and the player, stepping batched systems, and typing and closing dialogue boxes.
+        It is called every tick, whether or not the frame is then rendered, so skipping renders when the game falls
+        behind never slows the game down.
+        """
+        self.gameobjects.update()
+        self.player.update()
+        for system in self.systems:
+            system.update()
+
+        # Dialogue boxes, giving the surfaces of closed boxes back to the pool
+        for box in list(self.dialogue):
+            box.update()
+            if box.finished:
+                self.dialogue.remove(box)
+                box.release()
+
     def render(self):
         """Renders all gui elements
 
-        Renders each GUI element currently in the attribute lists.
+        Draws each GUI element currently in the attribute lists, as they were left by simulate(). Screens made up of
+        only text and buttons are not redrawn until a button changes.
+
+        When the window is scaled, only the game is rendered onto the screen. The GUI is drawn onto the window by
+        overlay() once the screen has been scaled up.
         """
+        # Nothing has changed since the last frame
+        if self._rendered and not (self.player or self.gameobjects or len(self.gameobjects.static) or self.systems or self.hud or self.dialogue):
+            if not any(getattr(button, 'dirty', True) for button in self.buttons):
+                return
+        self._rendered = True
+
         # Clear screen
         self.fill(BLACK)
 
+        # Game objects, with the player drawn in order among them
+        self.gameobjects.draw(self, self.player.sprites())
+
+        # Batched systems
+        for system in self.systems:
+            system.draw(self)
+
+        # Lighting
+        if self.lighting:
+            self.lighting.draw(self)
+
+        # GUI
+        if SCALE == 1:
+            self.overlay(self)
+
+    def overlay(self, surface):
+        """Draws the GUI elements
+
+        Args:
+            surface: pygame.Surface to draw on, either the screen itself or the scaled up window
+        """
         # Text
         for surf, rect in self.text:
-            self.blit(surf, rect)
+            surface.blit(surf, rect)
 
         # Buttons
         for button in self.buttons:
             button.render()
-            self.blit(button, button.rect)
-
-        # Game objects
-        self.gameobjects.update()
-        self.gameobjects.draw(self)
+            surface.blit(button, button.rect)
+            button.dirty = False
 
-        # Player
-        self.player.update()
-        self.player.draw(self)
+        # HUD
+        if self.hud:
+            self.hud.render()
+            self.hud.draw(surface)
 
         # Dialogue boxes
         for box in self.dialogue:
-            if box.finished:
-                self.dialogue.remove(box)
-            else:
-                box.render()
-                self.blit(box, box.rect)
+            box.render()
+            surface.blit(box.surface, box.rect)
 
 
 class MainMenu(Screen):
-    def __init__(self):
+    def __init__(self, rewind=REWIND):
+        """Init
+
+        Args:
+            rewind: Seconds of the game kept to rewind once playing, 0 to turn off (defaults to REWIND)
+        """
         super().__init__()
+        self.rewind = rewind
 
         # List of text and buttons
         self.text = []
@@ -118,7 +197,7 @@ class MainMenu(Screen):
 
     def update(self):
         if self.rungame:
-            return GameScreen()
+            return GameScreen(rewind=self.rewind)
         elif self.options:
             return OptionsMenu()
         else:
@@ -138,10 +217,39 @@ class GameScreen(Screen):
         hiding: Boolean indicating if the player is currently hiding
         temp: Variable used to temporarily store any information
         gameobjects: pygame.sprite.Group of every other object in the game
+        navgrid: NavGrid of the level used by NPCs to find their way around
+        audio: AudioManager playing the sounds of the level
+        quest: Quest engine running the objectives of the level
+        objectives: List of the names of the objectives left, the first being the current objective
+        minimap: Minimap of the level shown on the HUD
+        particles: Particles of small effects such as crumbs and dust, or None if particles are turned off
+        server: Server of a two player game being hosted, or None when playing alone
+        rewind: Rewind buffer of the last few seconds of the game, or None if rewinding is turned off
+        precise: Boolean indicating if collision is tested against image masks rather than bounding boxes
     """
-    def __init__(self):
-        """Loads initial objects"""
+    def __init__(self, precise=PRECISE_COLLISION, crowd=CROWD, lighting=LIGHTING, particles=PARTICLES,
+                 host=None, rewind=REWIND):
+        """Loads initial objects
+
+        Args:
+            precise: Use pixel masks for collision (defaults to PRECISE_COLLISION)
+            crowd: Number of wandering NPCs to simulate (defaults to CROWD)
+            lighting: Light the house with baked lightmaps (defaults to LIGHTING)
+            particles: Show particle effects (defaults to PARTICLES)
+            host: UDP port to host a two player game on, where the second player controls Juice (defaults to None)
+            rewind: Seconds of the game kept to rewind by pressing backspace, 0 to turn off (defaults to REWIND)
+        """
         super().__init__()
+        self.precise = precise
+
+        # Imported here so the menus can be shown before the level and characters are loaded
+        from dindins.characters.lucy import Lucy
+        from dindins.navigation import NavGrid
+        from dindins.audio import AudioManager
+        from dindins.minimap import Minimap
+        from dindins.proximity import Highlight
+        from dindins.quests import Quest
+        from dindins import level
 
         # Add player character
         self.player.add(Lucy())
@@ -154,98 +262,76 @@ class GameScreen(Screen):
         self.temp = None
         self.gameover = False
 
-        self.buttons.append(self.stamina)
-
-        self.objectives = [
-            'eat_food',
-            'hide_under_bed',
-            'go_to_food',
-            'avoid_juice',
-            'nothing'
-        ]
-
-        # Floor
-        self.gameobjects.add(
-            tileset((590, -226), 10, 7, 'living_floor'),
-            tileset((495, 18), 7, 7, 'courtyard_floor', type='tile'),
-            tileset((580, 630), 3, 2, 'lobby_floor'),
-            tileset((589, 534), 2, 25, 'hallway_floor'),
-            tileset((493, 94), 1, 2, 'alcove_floor'),
-            tileset((495, 376), 7, 5, 'bedroom_floor', type='carpet')
-        )
-
-        # Walls
-        self.gameobjects.add(
-            tile((600, 210), 11, 875, 'hallway_east', boundingbox=(-1, 438, 5, 438)),  # Hallway east wall
-            tile((535, 645), 140, 10, 'lobby_south', boundingbox=(70, 1, 70, 1)),  # Lobby south wall
-            tile((470, 595), 10, 100, 'lobby_west', boundingbox=(5, 50, -2, 50)),  # Lobby west wall
-            tile((490, 545), 50, 10, 'lobby_north', boundingbox=(25, 19, 5, -18)),   # Lobby north wall
-            tile((510, 470), 10, 160, 'hallway_west_lobbytobedroom', boundingbox=(5, 79, -2, 59)),  # Hallway west wall (lobby -> bedroom)
-            tile((380, 395), 250, 10, 'bedroom_south', boundingbox=(125, 1, 125, 1)),  # Bedroom south wall
-            tile((510, 215), 10, 220, 'hallway_west_bedroomtostudy', boundingbox=(3, 110, -2, 90)),  # Hallway west wall (bedroom -> study)
-            tile((380, 195), 250, 10, 'bedroom_north', boundingbox=(125, 19, 125, -18)),  # Bedroom north wall
-            tile((260, 295), 10, 200, 'bedroom_west', boundingbox=(5, 100, -2, 100)),  # Bedroom west wall
-            tile((480, 110), 50, 10, 'alcove_south', boundingbox=(25, 1, 25, 1)),    # Alcove south wall
-            tile((450, 65), 10, 100, 'alcove_west', boundingbox=(5, 50, -2, 50)),  # Alcove west wall
-            tile((480, 20), 50, 10, 'alcove_north', boundingbox=(25, 19, 25, -18)),    # Alcove north wall
-            tile((510, -100), 10, 250, 'hallway_west_glass', boundingbox=(5, 120, -2, 100)),  # Hallway west wall, looking into courtyard
-            tile((385, -220), 250, 10, 'living_south_glass', boundingbox=(125, 1, 125, 1)),   # Living room south wall, looking into courtyard
-            tile((259, -219), 11, 502, 'courtyard_kitchen_west', boundingbox=(5, 250, -2, 250)),   # Courtyard and kitchen west wall
-            tile((355, 30), 200, 10, 'study_north_glass'),  # Study north wall, looking into courtyard
-            tile((435, -465), 355, 10, 'living_north', boundingbox=(178, 19, 178, -18)),     # Living room/kitchen north wall
-            tile((610, -345), 10, 250, 'living_east', boundingbox=(-1, 125, 5, 125))      # Living room east wall
-        )
-
-        # Doors
-        greysurface = pygame.Surface((50, 20))
-        greysurface.fill(GREY)
-        self.gameobjects.add(
-            DialogueBoxObject((560, 645), greysurface, 'Scary people come through this door. I would never dare go out there.', 'front_door'),     # Front door
-            DialogueBoxObject((510, 450), pygame.transform.rotate(greysurface, 90), 'My humans litterbox is in there.', 'bathroom_door_hallway'),    # Bathroom door (from hallway)
-            DialogueBoxObject((470, 595), pygame.transform.rotate(greysurface, 90), 'I used to sleep in this room, but now it\'s never open.', 'storage_door'),   # Room 1
-            DialogueBoxObject((440, 395), greysurface, 'My humans litterbox is in there.', 'bathroom_door_bedroom'),  # Bathroom door (from bedroom)
-            DialogueBoxObject((320, 395), greysurface, 'This goes to a courtyard. There was once a trapped bird in there.', 'courtyard_door_bedroom'),   # Bedroom courtyard
-            DialogueBoxObject((510, 150), pygame.transform.rotate(greysurface, 90), 'This is where my humans spend most of their time. It\'s only open when they\'re home.', 'study_door'),          # Study
-            DialogueBoxObject((325, -485), pygame.image.load(f'{ASSETS}/objects/door.png'), 'Scary sounds come from this door. But my humans also come through here.', 'garage_door')    # Garage
-        )
-
-        # Other objects
-        self.gameobjects.add(
-            BaseObject((425, -270), pygame.image.load(f'{ASSETS}/objects/rug2.png'), 'table_rug'),
-            HideObject((425, -285), pygame.image.load(f'{ASSETS}/objects/table.png'), 'table', boundingbox=(28, 22, 28, 10)),
-            BaseObject((340, 200), pygame.image.load(f'{ASSETS}/objects/dresser.png'), 'dresser1', boundingbox=(7, 18, 8, 1)),
-            BaseObject((440, 200), pygame.image.load(f'{ASSETS}/objects/dresser.png'), 'dresser2', boundingbox=(6, 18, 7, 1)),
-            BaseObject((585, -385), pygame.image.load(f'{ASSETS}/objects/tv.png'), 'tv', boundingbox=(18, 64)),
-            BaseObject((375, -410), pygame.image.load(f'{ASSETS}/objects/bench1.png'), 'bench1', boundingbox=(7, 56, 5, 35)),
-            BaseObject((278, -410), pygame.image.load(f'{ASSETS}/objects/bench2.png'), 'bench2', boundingbox=(7, 56, 5, 35)),
-            BaseObject((325, -390), pygame.image.load(f'{ASSETS}/objects/rug1.png'), 'kitchen_rug'),
-            BaseObject((518, -375), pygame.image.load(f'{ASSETS}/objects/rug3.png'), 'living_rug'),
-            BaseObject((519, -380), pygame.image.load(f'{ASSETS}/objects/coffee_table.png'), 'coffee_table',  boundingbox=(10, 26, 5, 6)),
-            BaseObject((585, -460), pygame.image.load(f'{ASSETS}/objects/lamp.png'), 'lamp', boundingbox='image'),
-            BaseObject((585, -315), pygame.image.load(f'{ASSETS}/objects/plant.png'), 'plant', boundingbox=(20, 10)),
-            BaseObject((455, -385), pygame.image.load(f'{ASSETS}/objects/couch.png'), 'couch', boundingbox=(7, 40, 10, 20)),
-            BaseObject((283, 280), pygame.image.load(f'{ASSETS}/objects/wardrobe.png'), 'wardrobe', boundingbox=(18, 48, 5, 30)),
-        )
-
-        # Objective objects
-        self.gameobjects.add(
-            Bowls(self.objectives),
-            Bed(self.objectives),
-        )
-
-        # Shift objects for initial positioning
-        for object in self.gameobjects.sprites():
-            object.move(-50, 800)
-
-    def _collide(self):
-        for object in self.gameobjects.colliders():
-            if self.player.sprite.rect.colliderect(object.boundingbox):
-                return True
+        self.hud.add(self.stamina)
+
+        # House
+        level.load(self.gameobjects)
+
+        # Objectives, the list of objectives left is shared with the minimap
+        self.quest = Quest(level.OBJECTIVES, self.gameobjects)
+        self.objectives = self.quest.objectives
+
+        # Minimap of the house, drawn once now the floors and walls are in place
+        self.minimap = Minimap((WIDTH - 50, 115), self.gameobjects, self.player, self.objectives)
+        self.hud.add(self.minimap)
+
+        # Highlight the object space would interact with
+        self.systems.append(Highlight(self.gameobjects.proximity))
+
+        # Swap bounding boxes for masks
+        if self.precise:
+            self.gameobjects.buildmasks()
+
+        # Build navigation grid for NPCs
+        # Clearance of half of Juice's width keeps her body out of gaps she is too wide to fit through
+        self.navgrid = NavGrid(self.gameobjects, clearance=16)
+
+        # Decode sounds now so playing them never waits on the disk
+        self.audio = AudioManager()
+        self.audio.preload(SOUNDS)
+
+        # Lighting, imported here as it requires NumPy. Lightmaps are baked the first time the house is loaded.
+        if lighting:
+            from dindins.lighting import load
+            self.lighting = load(self.gameobjects)
+
+        # Particles, imported here as they require NumPy
+        self.particles = None
+        if particles:
+            from dindins.particles import Particles
+            self.particles = Particles(self.gameobjects)
+            self.systems.append(self.particles)
+
+        # Two player mode
+        self.server = None
+        if host:
+            from dindins.net import Server
+            self.server = Server(host)
+
+        # Snapshots of the last few seconds to rewind to
+        self.rewind = None
+        if rewind:
+            from dindins.snapshot import Snapshots, Rewind
+            self.rewind = Rewind(Snapshots(self), rewind)
+
+        # Crowd mode, imported here as it requires NumPy
+        if crowd:
+            from dindins.crowd import Crowd, spawn
+            self.systems.append(Crowd(self.gameobjects, spawn(self.navgrid, self.player.sprite.rect.center, crowd)))
+
+    def close(self):
+        """Tells the second player the game is over, if one is being hosted"""
+        if self.server:
+            self.server.close()
+            self.server = None
 
     def _trigger(self):
-        for object in self.gameobjects.triggerables():
-            if self.player.sprite.rect.colliderect(object.rect):
-                object.trigger()
+        for zone in self.gameobjects.zones.update([self.player.sprite]):
+            self.quest.enter(zone.name)
+
+    def _nearest(self):
+        """Gets the interactable nearest to the player, the one pressing space would interact with"""
+        return self.gameobjects.proximity.update(self.player.sprite, self.player.sprite.direction)
 
     def handle(self, event):
         """Handles in game events
@@ -259,12 +345,11 @@ class GameScreen(Screen):
         # Space to interact with objects
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
-                # Regular interaction
+                # Regular interaction, with only the nearest object in reach
                 if not self.paused and not self.hiding:
-                    for object in self.gameobjects.interactables():
-                        # Allows for interaction with collidable objects
-                        if pygame.sprite.collide_rect_ratio(1.25)(self.player.sprite, object):
-                            object.interact()
+                    object = self._nearest()
+                    if object and not self.quest.interact(object.name):
+                        object.interact()
 
                 # Stop hiding
                 elif self.hiding and not self.paused:
@@ -274,8 +359,11 @@ class GameScreen(Screen):
                     self.speed = 3
 
                     # Revert objects using saved offset
-                    for object in self.gameobjects.sprites():
-                        object.move(-1 * self.temp[0],  -1 * self.temp[1])
+                    self.gameobjects.move(-1 * self.temp[0], -1 * self.temp[1])
+
+            # Backspace to rewind the last second
+            elif event.key == pygame.K_BACKSPACE and self.rewind:
+                self.rewind.rewind(1)
 
         # Pause the game
         elif event.type == PAUSE:
@@ -288,6 +376,9 @@ class GameScreen(Screen):
             if juice:
                 juice.pause = True
 
+            for system in self.systems:
+                system.pause = True
+
         # Resume the game
         elif event.type == RESUME:
             self.paused = False
@@ -301,6 +392,9 @@ class GameScreen(Screen):
             if juice:
                 juice.pause = False
 
+            for system in self.systems:
+                system.pause = False
+
         # Hide
         # Hiding pauses only the player (not NPCs), and makes the player sprite transparent.
         elif event.type == HIDE:
@@ -310,7 +404,7 @@ class GameScreen(Screen):
             self.hiding = True
 
             # Make player transparent
-            self.player.sprite.image = pygame.image.load(f'{ASSETS}/terrain/transparent.png')
+            self.player.sprite.image = assets.load(f'{ASSETS}/terrain/transparent.png')
 
             # If move is set to false then move camera to center of hiding object
             if not event.move:
@@ -324,34 +418,45 @@ class GameScreen(Screen):
                 self.temp = (x, y)
 
                 # Move objects
-                for object in self.gameobjects.sprites():
-                    object.move(x, y)
+                self.gameobjects.move(x, y)
 
         # Render given objects
         elif event.type == RENDER:
+            # Objects placed in the world as it was when posted are moved along with it
+            placed = event.dict.get('offset')
             for object in event.objects:
                 if type(object) == DialogueBox:
                     self.dialogue.append(object)
                     pygame.event.post(pygame.event.Event(PAUSE, {}))
                 else:
+                    if placed:
+                        offset = self.gameobjects.static.offset
+                        object.move(offset[0] - placed[0], offset[1] - placed[1])
+                    if self.precise and object.boundingbox:
+                        object.buildmask()
+                    if hasattr(object, 'chase'):
+                        # Characters are only in game once, such as Juice already controlled by a second player
+                        if self.gameobjects.get(object.name):
+                            continue
+                        object.chase(self.navgrid, self.player.sprite, self.gameobjects)
+                        if self.particles:
+                            self.particles.effect('scare', object.rect.center)
                     self.gameobjects.add(object)
 
         # Objective completed
         elif event.type == OBJECTIVE:
-            self.objectives.remove(event.objective)
-
-            if self.objectives[0] == 'go_to_food':
-                self.gameobjects.add(SpawnTrigger(
-                    (660, 500),
-                    pygame.image.load(f'{ASSETS}/terrain/transparent.png'),
-                    'juice_trigger',
-                    Juice((510, -200)),
-                    DialogueBox('Oh no, it\'s Juice! She always bullies me when the humans leave. I better avoid her.', (WIDTH / 2, HEIGHT * .8))
-                ))
+            self.quest.complete(event.objective)
 
         elif event.type == GAME_OVER:
             self.gameover = True
 
+        elif event.type == SOUND:
+            self.audio.play(event.sound, event.dict.get('priority', 0), event.dict.get('volume', 1.0))
+
+        elif event.type == EFFECT:
+            if self.particles:
+                self.particles.effect(event.effect, event.pos)
+
     def update(self):
         """Updates the screen
 
@@ -365,7 +470,7 @@ class GameScreen(Screen):
         speed_y = 0
 
         # Movement
-        keystate = pygame.key.get_pressed()
+        keystate = controls.pressed()
         if keystate[pygame.K_LEFT]:
             speed_x = self.speed
         if keystate[pygame.K_RIGHT]:
@@ -382,6 +487,10 @@ class GameScreen(Screen):
             speed_x *= 2
             speed_y *= 2
             self.stamina.stamina -= 1
+            # Kick up dust behind Lucy
+            if self.particles and (speed_x or speed_y):
+                behind = math.atan2(speed_y, speed_x)
+                self.particles.effect('dust', self.player.sprite.rect.midbottom, direction=behind, spread=1)
             # Block sprinting if no stamina remaining
             if self.stamina.stamina == 0:
                 self.stamina.blocked = True
@@ -394,27 +503,30 @@ class GameScreen(Screen):
                 self.stamina.blocked = False
             self.player.sprite.rate = 2
 
-        # Shift all objects on x axis
-        for object in self.gameobjects.sprites():
-            object.move(speed_x, 0)
-
-        # Reset objects if collision occurred
-        if self._collide():
-            for object in self.gameobjects.sprites():
-                object.move(-1 * speed_x, 0)
+        # Resolve player movement against colliders in a single pass, then shift all objects the opposite way
+        rect = self.player.sprite.rect
+        area = rect.union(rect.move(-1 * speed_x, -1 * speed_y))
+        dx, dy = sweep(self.player.sprite, -1 * speed_x, -1 * speed_y, self.gameobjects.colliders(area))
+        if dx or dy:
+            self.gameobjects.move(-1 * dx, -1 * dy)
 
-        # Shift all objects on y axis
-        for object in self.gameobjects.sprites():
-            object.move(0, speed_y)
-
-        # Reset objects if collision occurred
-        if self._collide():
-            for object in self.gameobjects.sprites():
-                object.move(0, -1 * speed_y)
+        # Move the second player and send them the state of the game
+        if self.server:
+            self.server.update(self)
 
         # Check triggers
         self._trigger()
 
+        # Keep the nearest interactable up to date for the highlight
+        self._nearest()
+
+        # Time the current objective
+        if not self.paused:
+            self.quest.update()
+
+        if self.rewind:
+            self.rewind.record()
+
         return self if not self.gameover else OptionsMenu()
 
 
@@ -434,22 +546,67 @@ class DinDins:
     Attributes:
         running: Boolean indicating if the game is running
         rootdisplay: pygame.display, the main window
-        clock: pygame.time.Clock for setting FPS
+        pacer: FramePacer keeping the loop at the target frame rate
+        vsync: Boolean indicating if the display is synced to the monitor refresh
+        stats: Boolean indicating if frame pacing stats are printed when the game closes
+        recorder: Recorder capturing each presented frame, or None when not recording
+        tracker: AllocationTracker counting the surfaces made each frame, or None when not tracking
     """
-    def __init__(self):
-        """Initialises game"""
-        # Init pygame and set running to true
+    def __init__(self, fps=FPS, vsync=VSYNC, busyloop=BUSY_LOOP, maxskip=MAX_FRAMESKIP, stats=False, record=None,
+                 recordformat=CAPTURE_FORMAT, tracker=None):
+        """Initialises game
+
+        Args:
+            fps: Target frames per second (defaults to FPS)
+            vsync: Sync the display to the monitor refresh where supported (defaults to VSYNC)
+            busyloop: Busy wait between frames for more accurate timing (defaults to BUSY_LOOP)
+            maxskip: Most renders to skip in a row when behind (defaults to MAX_FRAMESKIP)
+            stats: Print frame pacing stats when the game closes (defaults to False)
+            record: Directory to record each presented frame to (defaults to None, for no recording)
+            recordformat: Format to record frames in, 'png' or 'raw' (defaults to CAPTURE_FORMAT)
+            tracker: Installed AllocationTracker to mark each frame on and report when the game closes (defaults to
+                None)
+        """
+        # Init pygame and set running to true, with a small audio buffer so sounds play without delay
+        pygame.mixer.pre_init(buffer=512)
         pygame.init()
         self.running = True
+        self.stats = stats
+        self.tracker = tracker
+
+        # Build root display, vsync needs a scaled or OpenGL display and is not supported by every driver
+        self.vsync = False
+        if vsync:
+            try:
+                self._rootdisplay = pygame.display.set_mode((WIDTH * SCALE, HEIGHT * SCALE), pygame.SCALED, vsync=1)
+                self.vsync = True
+            except pygame.error:
+                pass
+        if not self.vsync:
+            self._rootdisplay = pygame.display.set_mode((WIDTH * SCALE, HEIGHT * SCALE))
+
+        # Set up frame pacing
+        self.pacer = FramePacer(fps, busyloop, maxskip)
+
+        # Recording
+        self.recorder = None
+        if record:
+            from dindins.capture import Recorder
+            self.recorder = Recorder(record, recordformat)
+
+    def _cleanup(self, screen):
+        """Cleans up and quits pygame
 
-        # Build root display
-        self._rootdisplay = pygame.display.set_mode((WIDTH, HEIGHT))
-
-        # Set up clock
-        self._clock = pygame.time.Clock()
-
-    def _cleanup(self):
-        """Cleans up and quits pygame"""
+        Args:
+            screen: Screen being shown when the game closed
+        """
+        screen.close()
+        if self.stats:
+            print(self.pacer.report())
+        if self.recorder:
+            print(self.recorder.close())
+        if self.tracker:
+            self.tracker.report()
         pygame.quit()
         exit(0)
 
@@ -475,23 +632,49 @@ class DinDins:
             screen: Screen to be rendered
         """
         screen.render()
-        self._rootdisplay.blit(screen, (0, 0))
+        if SCALE == 1:
+            self._rootdisplay.blit(screen, (0, 0))
+        else:
+            # Scale the game up in one pass, then draw the GUI over it at full resolution
+            pygame.transform.scale(screen, self._rootdisplay.get_size(), self._rootdisplay)
+            screen.overlay(self._rootdisplay)
 
         pygame.display.flip()
+        if self.recorder:
+            self.recorder.capture(self._rootdisplay)
+
+    def run(self, firstframe=None, start=None):
+        """Main game loop
 
-    def run(self):
-        """Main game loop"""
-        screen = MainMenu()
+        Args:
+            firstframe: Function to call once the first frame has been shown (defaults to None)
+            start: Function returning the first screen, called once pygame is set up (defaults to None, for the main
+                menu)
+        """
+        screen = start() if start else MainMenu()
         while self.running:
             # Handlers
-            self._clock.tick(FPS)
+            self.pacer.tick()
             for event in pygame.event.get():
                 self._handle(event, screen)
 
-            screen = screen.update()
-            self._render(screen)
+            # Always simulate, but only render if the loop is keeping up
+            updated = screen.update()
+            if updated is not screen:
+                screen.close()
+                screen = updated
+            screen.simulate()
+            if self.pacer.render():
+                self._render(screen)
+
+            if self.tracker:
+                self.tracker.frame()
+
+            if firstframe:
+                firstframe()
+                firstframe = None
 
-        self._cleanup()
+        self._cleanup(screen)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,152 @@
+"""Minimap
+
+This file contains the minimap, a HUD widget showing the layout of the house with markers for Lucy, Juice and where
+the current objective is. The floors and walls are drawn and scaled down once, when the minimap is built or the level
+changes, so each frame the minimap only copies that image and draws the markers, and only when a marker has moved.
+
+Author: Josh Rogers
+"""
+
+import pygame
+
+from dindins.settings import *
+from dindins.gui import Widget
+
+# Name of the object each objective takes place at
+TARGETS = {
+    'eat_food': 'bowls',
+    'hide_under_bed': 'bed',
+    'go_to_food': 'bowls',
+}
+
+# Marker colours
+LUCY = BLUE
+JUICE = RED
+TARGET = GREEN
+
+
+class Minimap(Widget):
+    """Minimap
+
+    The minimap is drawn in the coordinates of the static object store, which only change when the world moves, so
+    markers are placed by taking the offset of the store away from their position on screen.
+
+    Attributes:
+        objects: ObjectsGroup of the level
+        player: pygame.sprite.GroupSingle of the player
+        objectives: List of objectives, the first being the current objective
+        area: pygame.Rect of the level covered by the minimap, in store coordinates
+        scale: Minimap pixels per level pixel
+        background: pygame.Surface of the floors and walls, scaled down
+    """
+    def __init__(self, pos, objects, player, objectives, height=200, border=5):
+        """Builds the minimap
+
+        The width of the minimap is set from the shape of the level.
+
+        Args:
+            pos: (x, y) coordinates of the center of the minimap
+            objects: ObjectsGroup of the level
+            player: pygame.sprite.GroupSingle of the player
+            objectives: List of objectives
+            height: Height of the minimap (defaults to 200)
+            border: Space around the level in level pixels (defaults to 5)
+        """
+        self.objects = objects
+        self.player = player
+        self.objectives = objectives
+        self.border = border
+
+        bounds = self._bounds()
+        super().__init__(pos, max(round(height * bounds.width / bounds.height), 1), height)
+
+        self._markers = None
+        self._count = 0
+        self.build()
+
+    def _bounds(self):
+        """Gets the area covered by the floors and walls, in store coordinates"""
+        static = self.objects.static
+        offset = static.offset
+        return static.bounds().move(-offset[0], -offset[1]).inflate(self.border * 2, self.border * 2)
+
+    def build(self):
+        """Draws the floors and walls of the level and scales them down to the minimap"""
+        static = self.objects.static
+        static.sort()
+        self.area = self._bounds()
+        self._count = len(static)
+
+        level = pygame.Surface(self.area.size)
+        level.fill(BLACK)
+        images = static.images
+        level.blits(
+            [
+                (images[static.asset[i]], (static.x[i] - self.area.left, static.y[i] - self.area.top))
+                for i in range(len(static)) if static.layer[i] in (FLOOR, WALL)
+            ],
+            doreturn=False
+        )
+
+        self.background = pygame.transform.smoothscale(level, self.get_size())
+        self.scale = self.get_width() / self.area.width
+        self.dirty = True
+
+    def _locate(self, rect):
+        """Gets the position of a rect on the screen on the minimap
+
+        Args:
+            rect: pygame.Rect in screen coordinates
+
+        Returns:
+            (x, y) of the center of the rect on the minimap
+        """
+        offset = self.objects.static.offset
+        x, y = rect.center
+        return (
+            round((x - offset[0] - self.area.left) * self.scale),
+            round((y - offset[1] - self.area.top) * self.scale)
+        )
+
+    def markers(self):
+        """Gets the markers to draw
+
+        Returns:
+            Tuple of (colour, (x, y)) for each marker, on the minimap
+        """
+        markers = []
+
+        name = TARGETS.get(self.objectives[0]) if self.objectives else None
+        target = self.objects.get(name) if name else None
+        if target:
+            markers.append((TARGET, self._locate(target.rect)))
+
+        juice = self.objects.get('juice')
+        if juice:
+            markers.append((JUICE, self._locate(juice.rect)))
+
+        if self.player:
+            markers.append((LUCY, self._locate(self.player.sprite.rect)))
+
+        return tuple(markers)
+
+    def render(self):
+        """Redraws the minimap if a marker has moved or the level has changed
+
+        Returns:
+            True if the minimap was redrawn
+        """
+        if len(self.objects.static) != self._count:
+            self.build()
+
+        markers = self.markers()
+        if markers != self._markers:
+            self._markers = markers
+            self.dirty = True
+
+        return super().render()
+
+    def draw(self):
+        self.blit(self.background, (0, 0))
+        for colour, pos in self._markers:
+            pygame.draw.circle(self, colour, pos, 3 * SCALE)
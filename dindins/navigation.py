@@ -0,0 +1,281 @@
+"""Navigation
+
+This file contains the navigation grid used by NPCs to find their way around the house. The grid is built once from the
+colliders of a level, and flow fields are then computed over it towards a target. A flow field gives every cell the
+direction to the next cell on the shortest path to the target, so any number of NPCs heading for the same target (such
+as the player) can share a single field.
+
+Flow fields are cached by target cell, so a field is only recomputed when the target moves into a different cell. NPCs
+can ask for the field every frame at the cost of a dictionary lookup.
+
+As the camera moves the world rather than the player, positions on screen change every frame. The grid remembers the
+position of one static object when it was built, and uses how far that object has since moved to convert between
+screen and grid coordinates.
+
+Author: Josh Rogers
+"""
+
+import heapq
+from collections import OrderedDict
+from math import sqrt
+
+from dindins.objects import Animated
+
+# Neighbouring cells and the cost of moving to them
+NEIGHBOURS = [
+    (1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+    (1, 1, sqrt(2)), (1, -1, sqrt(2)), (-1, 1, sqrt(2)), (-1, -1, sqrt(2))
+]
+
+
+class NavGrid:
+    """Navigation grid
+
+    An occupancy grid of the level. A cell is blocked if a static collider, grown by the clearance, overlaps it. The
+    clearance keeps NPCs wider than a cell from clipping walls as they round corners.
+
+    Attributes:
+        cellsize: Width and height of a cell in pixels
+        columns: Number of columns in the grid
+        rows: Number of rows in the grid
+        blocked: List of Booleans, one per cell, indicating if the cell cannot be walked through
+        anchor: Static object used to track how far the world has moved since the grid was built
+        origin: Screen coordinates of the top left of the grid when it was built
+        cachesize: Maximum number of flow fields to keep cached
+    """
+    def __init__(self, objects, cellsize=16, clearance=8, cachesize=8):
+        """Builds the grid
+
+        Args:
+            objects: ObjectsGroup of the level
+            cellsize: Width and height of a cell in pixels (defaults to 16)
+            clearance: Pixels to grow colliders by (defaults to 8)
+            cachesize: Maximum number of flow fields to keep cached (defaults to 8)
+        """
+        # Only static objects are part of the grid, moving objects would invalidate it
+        sprites = [object for object in objects.sprites() if not isinstance(object, Animated)]
+        colliders = [object for object in objects.colliders() if not isinstance(object, Animated)]
+
+        bounds = objects.static.bounds().unionall([object.rect for object in sprites])
+
+        self.cellsize = cellsize
+        self.columns = bounds.width // cellsize + 1
+        self.rows = bounds.height // cellsize + 1
+        self.origin = bounds.topleft
+        self.anchor = colliders[0]
+        self._anchorstart = self.anchor.rect.topleft
+
+        # Mark cells covered by colliders
+        self.blocked = [False] * (self.columns * self.rows)
+        for object in colliders:
+            box = object.boundingbox.inflate(clearance * 2, clearance * 2)
+            left = max((box.left - bounds.left) // cellsize, 0)
+            right = min((box.right - 1 - bounds.left) // cellsize, self.columns - 1)
+            top = max((box.top - bounds.top) // cellsize, 0)
+            bottom = min((box.bottom - 1 - bounds.top) // cellsize, self.rows - 1)
+            for row in range(top, bottom + 1):
+                for column in range(left, right + 1):
+                    self.blocked[row * self.columns + column] = True
+
+        self.cachesize = cachesize
+        self._fields = OrderedDict()
+
+    def _offset(self):
+        """Gets the screen coordinates of the top left of the grid"""
+        return (
+            self.origin[0] + self.anchor.rect.left - self._anchorstart[0],
+            self.origin[1] + self.anchor.rect.top - self._anchorstart[1]
+        )
+
+    def world(self, pos):
+        """Converts a position on screen to a position in the level
+
+        Level coordinates are the screen coordinates at the time the grid was built, so they do not change as the camera
+        moves.
+
+        Args:
+            pos: (x, y) screen coordinates
+
+        Returns:
+            (x, y) level coordinates
+        """
+        x, y = self._offset()
+        return pos[0] - x + self.origin[0], pos[1] - y + self.origin[1]
+
+    def cell(self, pos):
+        """Gets the cell at a position on screen
+
+        Args:
+            pos: (x, y) screen coordinates
+
+        Returns:
+            Index of the cell, or None if the position is outside the grid
+        """
+        x, y = self._offset()
+        column = int(pos[0] - x) // self.cellsize
+        row = int(pos[1] - y) // self.cellsize
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return row * self.columns + column
+
+        return None
+
+    def center(self, cell):
+        """Gets the screen coordinates of the center of a cell
+
+        Args:
+            cell: Index of the cell
+
+        Returns:
+            (x, y) screen coordinates
+        """
+        x, y = self._offset()
+        row, column = divmod(cell, self.columns)
+        return x + column * self.cellsize + self.cellsize // 2, y + row * self.cellsize + self.cellsize // 2
+
+    def flowfield(self, target):
+        """Gets the flow field towards a target
+
+        Fields are cached by the cell of the target. The least recently used field is dropped once the cache is full.
+
+        Args:
+            target: (x, y) screen coordinates of the target
+
+        Returns:
+            FlowField towards the target, or None if the target is outside the grid
+        """
+        cell = self.cell(target)
+        if cell is None:
+            return None
+
+        field = self._fields.get(cell)
+        if field is None:
+            field = FlowField(self, cell)
+            self._fields[cell] = field
+            if len(self._fields) > self.cachesize:
+                self._fields.popitem(last=False)
+        else:
+            self._fields.move_to_end(cell)
+
+        return field
+
+
+class FlowField:
+    """Flow field
+
+    The shortest distance from every cell to the target cell, and the next cell to move to from each. Diagonal moves are
+    only allowed when both cells beside the diagonal are walkable, so NPCs do not cut corners. Blocked cells point to
+    their nearest reachable neighbour, which lets an NPC that has been pushed into a wall find its way back out.
+
+    Attributes:
+        grid: NavGrid the field was computed on
+        target: Index of the target cell
+        distance: List of distances from each cell to the target
+        next: List of the next cell to move to from each cell, or None if the target cannot be reached
+    """
+    def __init__(self, grid, target):
+        """Computes the field
+
+        Args:
+            grid: NavGrid to compute the field on
+            target: Index of the target cell
+        """
+        self.grid = grid
+        self.target = target
+
+        columns = grid.columns
+        rows = grid.rows
+        blocked = grid.blocked
+
+        # Dijkstra outwards from the target
+        self.distance = [float('inf')] * (columns * rows)
+        self.distance[target] = 0
+        queue = [(0, target)]
+        while queue:
+            distance, cell = heapq.heappop(queue)
+            if distance > self.distance[cell]:
+                continue
+
+            row, column = divmod(cell, columns)
+            for x, y, cost in NEIGHBOURS:
+                c = column + x
+                r = row + y
+                if not (0 <= c < columns and 0 <= r < rows):
+                    continue
+
+                neighbour = r * columns + c
+                if blocked[neighbour]:
+                    continue
+
+                # No cutting corners
+                if x and y and (blocked[row * columns + c] or blocked[r * columns + column]):
+                    continue
+
+                if distance + cost < self.distance[neighbour]:
+                    self.distance[neighbour] = distance + cost
+                    heapq.heappush(queue, (distance + cost, neighbour))
+
+        # Point each cell at its closest neighbour
+        self.next = [None] * (columns * rows)
+        for cell in range(columns * rows):
+            row, column = divmod(cell, columns)
+            best = self.distance[cell]
+            for x, y, cost in NEIGHBOURS:
+                c = column + x
+                r = row + y
+                if not (0 <= c < columns and 0 <= r < rows):
+                    continue
+
+                if not blocked[cell] and x and y and (blocked[row * columns + c] or blocked[r * columns + column]):
+                    continue
+
+                if self.distance[r * columns + c] < best:
+                    best = self.distance[r * columns + c]
+                    self.next[cell] = r * columns + c
+
+    def step(self, pos, speed, target=None):
+        """Gets the movement towards the target from a position
+
+        Moves towards the center of the next cell on the path, or towards the target itself once in the target cell.
+
+        Args:
+            pos: (x, y) screen coordinates to move from
+            speed: Maximum pixels to move along each axis
+            target: (x, y) screen coordinates of the target (defaults to the center of the target cell)
+
+        Returns:
+            (x, y) pixels to move, or (0, 0) if there is no path
+        """
+        cell = self.grid.cell(pos)
+        if cell is None:
+            return 0, 0
+
+        if cell == self.target:
+            x, y = target if target else self.grid.center(cell)
+        elif self.next[cell] is not None:
+            x, y = self.grid.center(self.next[cell])
+        else:
+            return 0, 0
+
+        return _clamp(x - pos[0], speed), _clamp(y - pos[1], speed)
+
+    def path(self, pos):
+        """Gets the path from a position to the target
+
+        Args:
+            pos: (x, y) screen coordinates to start from
+
+        Returns:
+            List of (x, y) screen coordinates of the center of each cell on the path, empty if there is no path
+        """
+        cell = self.grid.cell(pos)
+        path = []
+        while cell is not None and cell != self.target:
+            cell = self.next[cell]
+            if cell is not None:
+                path.append(self.grid.center(cell))
+
+        return path
+
+
+def _clamp(value, limit):
+    return max(-limit, min(limit, value))
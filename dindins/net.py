@@ -0,0 +1,632 @@
+"""Two Player
+
+This file contains the two player mode, where a second player controls Juice over the network. The host runs the game
+as normal, and is the only one simulating it. A Server attached to the host's GameScreen moves Juice with the inputs
+sent by the second player, and streams the state of the characters back to them over UDP. The second player runs a
+ClientScreen, which loads the same house, shows the characters where the host says they are and moves Juice straight
+away rather than waiting to hear back from the host.
+
+To keep the bandwidth of each snapshot small and constant:
+    - Positions are quantised to whole pixels in 16 bits, or 8 bit differences when they have moved only a little
+    - Each snapshot only holds what has changed since the last snapshot the client acknowledged, so characters standing
+      still cost nothing, and a lost snapshot is made up for by the next one rather than being sent again
+    - Only characters in view of Juice are sent, nearest first, up to a fixed number
+
+The client keeps every input the host has not yet applied. When a snapshot arrives, Juice is put back where the host
+has her and the inputs the host has not applied yet are played again, so she only jumps when the two disagree.
+
+Positions are in the coordinates of the static object store, which are the same on both sides no matter where the
+camera of each player is.
+
+Host with:
+    python -m dindins --host
+Join with:
+    python -m dindins --join address[:port]
+
+Author: Josh Rogers
+"""
+
+import itertools
+import socket
+import struct
+import time
+from collections import deque
+
+import pygame
+
+from dindins.settings import *
+from dindins import assets, controls
+from dindins.collision import sweep
+from dindins.main import Screen, OptionsMenu
+from dindins.objects import Animated
+
+# Packet types
+HELLO = 1
+WELCOME = 2
+INPUT = 3
+SNAPSHOT = 4
+BYE = 5
+
+# Packet layouts
+_TYPE = struct.Struct('<B')
+_WELCOME = struct.Struct('<BH')
+_INPUT = struct.Struct('<BIIB')
+_SNAPSHOT = struct.Struct('<BIIIBBB')
+_ENTITY = struct.Struct('<HB')
+_ID = struct.Struct('<H')
+_KIND = struct.Struct('<B')
+_POSITION = struct.Struct('<hh')
+_NUDGE = struct.Struct('<bb')
+_FRAME = struct.Struct('<B')
+
+# Fields of an entity in a snapshot that have changed
+KIND = 1
+POSITION = 2
+FRAME = 4
+NUDGE = 8
+
+# Characters that can be sent, by the name of their sprite
+KINDS = ('lucy', 'juice')
+
+# Directions, in the order they are packed into frames
+DIRECTIONS = ('up', 'down', 'left', 'right')
+
+# Keys sent as input, in the order they are packed into bits
+KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+
+# Snapshot flags
+OVER = 1
+
+# Where Juice joins the game if she is not already in it, in level coordinates
+SPAWN = (550, -150)
+
+
+def packkeys(keystate):
+    """Packs the movement keys held down into a byte"""
+    bits = 0
+    for bit, key in enumerate(KEYS):
+        if keystate[key]:
+            bits |= 1 << bit
+    return bits
+
+
+def unpackkeys(bits):
+    """Unpacks a byte of movement keys into a controls.KeyState"""
+    return controls.KeyState(key for bit, key in enumerate(KEYS) if bits & 1 << bit)
+
+
+def packframe(sprite):
+    """Packs the animation frame a character is showing into a byte
+
+    The bottom two bits are the direction they face, the next two bits are 0 when idle or the walk frame plus one, and
+    the fifth bit is set when they are hidden, such as Lucy hiding under the bed.
+    """
+    direction = DIRECTIONS.index(sprite.direction)
+    walk = sprite.walk.get(sprite.direction, [])
+    if sprite.image is sprite.idle.get(sprite.direction):
+        return direction
+    if sprite.image in walk:
+        return direction | (walk.index(sprite.image) + 1) << 2
+    return direction | 16
+
+
+def encode(tick, baseline, previous, current, inputseq, flags=0):
+    """Encodes a snapshot as the changes from a previous snapshot
+
+    Args:
+        tick: Tick of the snapshot
+        baseline: Tick of the previous snapshot, or 0 if there is none
+        previous: Dictionary of the (kind, x, y, frame) of each entity id in the previous snapshot
+        current: Dictionary of the (kind, x, y, frame) of each entity id in the snapshot
+        inputseq: Sequence number of the last input of the client applied
+        flags: Snapshot flags (defaults to 0)
+
+    Returns:
+        Bytes of the packet
+    """
+    removed = [id for id in previous if id not in current]
+    changes = []
+    for id, state in current.items():
+        old = previous.get(id)
+        if old == state:
+            continue
+
+        kind, x, y, frame = state
+        if old is None:
+            changes.append(_ENTITY.pack(id, KIND | POSITION | FRAME) + _KIND.pack(kind) + _POSITION.pack(x, y) +
+                           _FRAME.pack(frame))
+            continue
+
+        mask = 0
+        fields = b''
+        if old[0] != kind:
+            mask |= KIND
+            fields += _KIND.pack(kind)
+        dx = x - old[1]
+        dy = y - old[2]
+        if dx or dy:
+            if -128 <= dx < 128 and -128 <= dy < 128:
+                mask |= NUDGE
+                fields += _NUDGE.pack(dx, dy)
+            else:
+                mask |= POSITION
+                fields += _POSITION.pack(x, y)
+        if old[3] != frame:
+            mask |= FRAME
+            fields += _FRAME.pack(frame)
+        changes.append(_ENTITY.pack(id, mask) + fields)
+
+    header = _SNAPSHOT.pack(SNAPSHOT, tick, baseline, inputseq, flags, len(removed), len(changes))
+    return header + b''.join(_ID.pack(id) for id in removed) + b''.join(changes)
+
+
+def decode(packet, snapshots):
+    """Decodes a snapshot
+
+    Args:
+        packet: Bytes of the packet
+        snapshots: Dictionary of the snapshots already decoded, by tick, the baseline of the packet must be one of them
+
+    Returns:
+        Tuple of (tick, inputseq, flags, snapshot), or None if the baseline is not known or the packet is malformed
+    """
+    try:
+        return _decode(packet, snapshots)
+    except struct.error:
+        return None
+
+
+def _decode(packet, snapshots):
+    """Decodes a snapshot, raising struct.error if the packet is cut short"""
+    _, tick, baseline, inputseq, flags, removed, changed = _SNAPSHOT.unpack_from(packet)
+    if baseline and baseline not in snapshots:
+        return None
+
+    snapshot = dict(snapshots[baseline]) if baseline else {}
+    offset = _SNAPSHOT.size
+    for _ in range(removed):
+        snapshot.pop(_ID.unpack_from(packet, offset)[0], None)
+        offset += _ID.size
+
+    for _ in range(changed):
+        id, mask = _ENTITY.unpack_from(packet, offset)
+        offset += _ENTITY.size
+        kind, x, y, frame = snapshot.get(id, (0, 0, 0, 0))
+        if mask & KIND:
+            kind, = _KIND.unpack_from(packet, offset)
+            offset += _KIND.size
+            if kind >= len(KINDS):
+                return None
+        if mask & POSITION:
+            x, y = _POSITION.unpack_from(packet, offset)
+            offset += _POSITION.size
+        if mask & NUDGE:
+            dx, dy = _NUDGE.unpack_from(packet, offset)
+            x += dx
+            y += dy
+            offset += _NUDGE.size
+        if mask & FRAME:
+            frame, = _FRAME.unpack_from(packet, offset)
+            offset += _FRAME.size
+        snapshot[id] = (kind, x, y, frame)
+
+    return tick, inputseq, flags, snapshot
+
+
+class _Client:
+    """State of a connected client"""
+    def __init__(self, address, avatar):
+        self.address = address
+        self.avatar = avatar
+        self.inputs = deque()
+        self.inputseq = 0
+        self.acked = 0
+        self.sent = {}
+        self.heard = time.monotonic()
+        self.bytes = 0
+        self.snapshots = 0
+
+
+class Server:
+    """Host of a two player game
+
+    Attributes:
+        port: UDP port the host listens on
+        rate: Ticks between each snapshot sent
+        view: Width and height of the area around Juice that characters are sent from
+        limit: Most characters sent in each snapshot
+        tick: Number of ticks simulated
+        client: _Client of the second player, or None if nobody has joined
+    """
+    def __init__(self, port=NET_PORT, rate=NET_RATE, view=(WIDTH + 200, HEIGHT + 200), limit=16, timeout=5,
+                 history=32):
+        """Starts listening for a second player
+
+        Args:
+            port: UDP port to listen on (defaults to NET_PORT)
+            rate: Ticks between each snapshot (defaults to NET_RATE)
+            view: Size of the area around Juice that characters are sent from (defaults to a little over the screen)
+            limit: Most characters in each snapshot (defaults to 16)
+            timeout: Seconds without hearing from the second player before they are dropped (defaults to 5)
+            history: Snapshots kept per client to compress against (defaults to 32)
+        """
+        self.port = port
+        self.rate = rate
+        self.view = view
+        self.limit = limit
+        self.timeout = timeout
+        self.history = history
+        self.tick = 0
+        self.client = None
+
+        self._ids = {}
+        self._nextid = itertools.count(1)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._socket.bind(('', port))
+
+    def close(self):
+        """Tells the second player the game is over and stops listening"""
+        if self.client:
+            self._send(_TYPE.pack(BYE))
+        self._socket.close()
+
+    def _send(self, packet):
+        try:
+            self._socket.sendto(packet, self.client.address)
+        except OSError:
+            pass
+        self.client.bytes += len(packet)
+
+    def _receive(self, screen):
+        """Reads every packet waiting on the socket"""
+        while True:
+            try:
+                packet, address = self._socket.recvfrom(1500)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if not packet:
+                continue
+
+            type = packet[0]
+            if type == HELLO and (self.client is None or self.client.address == address):
+                if self.client is None:
+                    self.client = _Client(address, self._join(screen))
+                self._send(_WELCOME.pack(WELCOME, self._id(self.client.avatar)))
+
+            elif self.client is None or address != self.client.address:
+                continue
+
+            elif type == INPUT and len(packet) >= _INPUT.size:
+                _, acked, seq, count = _INPUT.unpack_from(packet)
+                client = self.client
+                client.heard = time.monotonic()
+                client.acked = max(client.acked, acked)
+
+                # Inputs are sent oldest first, along with the ones before in case those were lost
+                for i, bits in enumerate(packet[_INPUT.size:_INPUT.size + count]):
+                    inputseq = seq - count + 1 + i
+                    if inputseq > client.inputseq and (not client.inputs or inputseq > client.inputs[-1][0]):
+                        client.inputs.append((inputseq, unpackkeys(bits)))
+
+            elif type == BYE:
+                self._leave()
+
+    def _join(self, screen):
+        """Gets Juice for the second player to control, bringing her into the game if she is not in it yet"""
+        from dindins.characters.juice import Juice
+
+        juice = screen.gameobjects.get('juice')
+        if not juice:
+            offset = screen.gameobjects.static.offset
+            juice = Juice((0, 0))
+            juice.move(SPAWN[0] + offset[0] - juice.rect.x, SPAWN[1] + offset[1] - juice.rect.y)
+            if screen.precise:
+                juice.buildmask()
+            screen.gameobjects.add(juice)
+
+        juice.steer(controls.KeyState())
+        return juice
+
+    def _leave(self):
+        """Drops the second player, leaving Juice to move by herself again"""
+        self.client.avatar.keystate = None
+        self.client = None
+
+    def _id(self, sprite):
+        id = self._ids.get(sprite)
+        if id is None:
+            id = self._ids[sprite] = next(self._nextid)
+        return id
+
+    def _entities(self, screen):
+        """Gets the characters in view of the second player, nearest first"""
+        offset = screen.gameobjects.static.offset
+        avatar = self.client.avatar
+        view = pygame.Rect((0, 0), self.view)
+        view.center = avatar.rect.center
+
+        characters = [screen.player.sprite] + [object for object in screen.gameobjects if isinstance(object, Animated)]
+        characters = [
+            sprite for sprite in characters
+            if sprite is avatar or (sprite and sprite.name in KINDS and view.colliderect(sprite.rect))
+        ]
+        x, y = avatar.rect.center
+        characters.sort(key=lambda sprite: (
+            sprite is not avatar, (sprite.rect.centerx - x) ** 2 + (sprite.rect.centery - y) ** 2
+        ))
+
+        return {
+            self._id(sprite): (
+                KINDS.index(sprite.name), sprite.rect.x - offset[0], sprite.rect.y - offset[1], packframe(sprite)
+            )
+            for sprite in characters[:self.limit]
+        }
+
+    def update(self, screen):
+        """Simulates one tick of the second player and sends them a snapshot
+
+        Args:
+            screen: GameScreen being hosted
+        """
+        self.tick += 1
+        self._receive(screen)
+
+        client = self.client
+        if client is None:
+            return
+        if time.monotonic() - client.heard > self.timeout or client.avatar not in screen.gameobjects:
+            self._leave()
+            return
+
+        # Apply the inputs of the second player, catching up by at most one extra input a tick
+        avatar = client.avatar
+        for _ in range(min(len(client.inputs), 2)):
+            client.inputseq, keystate = client.inputs.popleft()
+            dx, dy = avatar.steer(keystate)
+            if dx or dy:
+                rect = avatar.rect
+                colliders = screen.gameobjects.colliders(rect.union(rect.move(dx, dy)))
+                dx, dy = sweep(avatar, dx, dy, [object for object in colliders if object is not avatar])
+                avatar.move(dx, dy)
+
+        if self.tick % self.rate:
+            return
+
+        # Compress against the last snapshot the client acknowledged, if it is still kept
+        current = self._entities(screen)
+        baseline = client.acked if client.acked in client.sent else 0
+        flags = OVER if screen.gameover else 0
+        self._send(encode(self.tick, baseline, client.sent.get(baseline, {}), current, client.inputseq, flags))
+        client.snapshots += 1
+
+        client.sent[self.tick] = current
+        for tick in [tick for tick in client.sent if tick <= self.tick - self.history * self.rate]:
+            del client.sent[tick]
+
+    def report(self):
+        """Gets a summary of the bandwidth used by the second player"""
+        if not self.client or not self.client.snapshots:
+            return 'No snapshots sent'
+        client = self.client
+        return f'{client.snapshots} snapshots, {client.bytes / client.snapshots:.1f} bytes each on average'
+
+
+class Puppet(Animated):
+    """Character shown where the host says it is"""
+    def __init__(self, name):
+        super().__init__((0, 0), assets.load(f'{ASSETS}/{name}/idle/{name}_idle_down.png'), name)
+        self.idle = {
+            direction: assets.load(f'{ASSETS}/{name}/idle/{name}_idle_{direction}.png') for direction in DIRECTIONS
+        }
+        self.walk = {
+            direction: [
+                assets.load(f'{ASSETS}/{name}/walk/{direction}/{name}_walk_{direction}_{frame}.png') for frame in (1, 2)
+            ]
+            for direction in DIRECTIONS
+        }
+        self.hidden = assets.load(f'{ASSETS}/terrain/transparent.png')
+
+    def show(self, frame):
+        """Shows an animation frame packed by packframe()"""
+        self.direction = DIRECTIONS[frame & 3]
+        if frame & 16:
+            self.image = self.hidden
+        elif frame >> 2 & 3:
+            self.image = self.walk[self.direction][(frame >> 2 & 3) - 1]
+        else:
+            self.image = self.idle[self.direction]
+
+    def update(self):
+        """Puppets are only changed by snapshots"""
+        pass
+
+
+class ClientScreen(Screen):
+    """Screen of the second player
+
+    Juice is kept in the center of the screen and the world is moved around her, the same as Lucy on the host.
+
+    Attributes:
+        address: (host, port) of the host
+        avatar: Juice, controlled by this player
+        position: Predicted position of Juice in store coordinates
+        puppets: Dictionary of the Puppet of each entity id sent by the host
+        corrections: Number of times Juice was not where she was predicted to be
+        bytes: Number of bytes received from the host
+        heard: time.monotonic() the host was last heard from
+    """
+    def __init__(self, address, history=32, redundancy=8, timeout=5):
+        """Loads the house and says hello to the host
+
+        Args:
+            address: (host, port) of the host
+            history: Snapshots kept to decode the changes from (defaults to 32)
+            redundancy: Inputs sent in every packet, in case earlier packets were lost (defaults to 8)
+            timeout: Seconds without hearing from the host before giving up on it (defaults to 5)
+        """
+        super().__init__()
+        from dindins.characters.juice import Juice
+        from dindins import level
+
+        self.address = address
+        self.history = history
+        self.redundancy = redundancy
+        self.timeout = timeout
+        self.puppets = {}
+        self.corrections = 0
+        self.bytes = 0
+        self.gameover = False
+        self.heard = time.monotonic()
+
+        level.load(self.gameobjects)
+
+        self.avatar = Juice((0, 0))
+        self.avatar.move(WIDTH // 2 - self.avatar.rect.centerx, HEIGHT // 2 - self.avatar.rect.centery)
+        self.avatar.steer(controls.KeyState())
+        self.position = None
+
+        self._id = None
+        self._tick = 0
+        self._seq = 0
+        self._inputs = deque()
+        self._snapshots = {}
+        self._hello = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def close(self):
+        """Tells the host this player has left"""
+        if self._socket.fileno() == -1:
+            return
+        try:
+            self._socket.sendto(_TYPE.pack(BYE), self.address)
+        except OSError:
+            pass
+        self._socket.close()
+
+    def _place(self, position):
+        """Moves the world so Juice is at a position"""
+        offset = self.gameobjects.static.offset
+        x = self.avatar.rect.x - position[0] - offset[0]
+        y = self.avatar.rect.y - position[1] - offset[1]
+        if x or y:
+            self.gameobjects.move(x, y)
+        self.position = position
+
+    def _step(self, keystate):
+        """Moves Juice one tick, the same as the host does"""
+        dx, dy = self.avatar.steer(keystate)
+        if dx or dy:
+            rect = self.avatar.rect
+            dx, dy = sweep(self.avatar, dx, dy, self.gameobjects.colliders(rect.union(rect.move(dx, dy))))
+            self._place((self.position[0] + dx, self.position[1] + dy))
+
+    def _receive(self):
+        """Reads every packet waiting on the socket"""
+        latest = None
+        while True:
+            try:
+                packet = self._socket.recv(1500)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if not packet:
+                continue
+            self.bytes += len(packet)
+            self.heard = time.monotonic()
+
+            if packet[0] == WELCOME and len(packet) >= _WELCOME.size:
+                self._id = _WELCOME.unpack_from(packet)[1]
+            elif packet[0] == BYE:
+                self.gameover = True
+            elif packet[0] == SNAPSHOT and self._id is not None:
+                decoded = decode(packet, self._snapshots)
+                if decoded is None or decoded[0] <= self._tick:
+                    continue
+                self._tick = decoded[0]
+                self._snapshots[self._tick] = decoded[3]
+                latest = decoded
+
+        while len(self._snapshots) > self.history:
+            del self._snapshots[min(self._snapshots)]
+
+        return latest
+
+    def _apply(self, snapshot):
+        """Shows the characters in a snapshot and corrects Juice"""
+        _, inputseq, flags, entities = snapshot
+        self.gameover |= bool(flags & OVER)
+
+        for id in [id for id in self.puppets if id not in entities]:
+            self.puppets.pop(id).kill()
+
+        offset = self.gameobjects.static.offset
+        for id, (kind, x, y, frame) in entities.items():
+            if id == self._id:
+                continue
+            puppet = self.puppets.get(id)
+            if puppet is None:
+                puppet = self.puppets[id] = Puppet(KINDS[kind])
+                self.gameobjects.add(puppet)
+            puppet.move(x + offset[0] - puppet.rect.x, y + offset[1] - puppet.rect.y)
+            puppet.show(frame)
+
+        # Put Juice where the host has her, then play the inputs the host has not applied yet
+        if self._id in entities:
+            _, x, y, _ = entities[self._id]
+            while self._inputs and self._inputs[0][0] <= inputseq:
+                self._inputs.popleft()
+
+            predicted = self.position
+            if predicted is None:
+                self.player.add(self.avatar)
+            self._place((x, y))
+            keystate = self.avatar.keystate
+            for _, bits in self._inputs:
+                self._step(unpackkeys(bits))
+            self.avatar.keystate = keystate
+            if predicted is not None and predicted != self.position:
+                self.corrections += 1
+
+    def update(self):
+        """Sends the keys held down to the host and moves Juice straight away
+
+        Returns:
+            The screen to be rendered
+        """
+        if self._id is None:
+            # Say hello once a second until the host answers
+            self._hello -= 1
+            if self._hello <= 0:
+                self._hello = FPS
+                try:
+                    self._socket.sendto(_TYPE.pack(HELLO), self.address)
+                except OSError:
+                    pass
+
+        snapshot = self._receive()
+        if snapshot:
+            self._apply(snapshot)
+
+        # Give up on a host that has gone quiet
+        if time.monotonic() - self.heard > self.timeout:
+            self.gameover = True
+
+        if self.position is not None:
+            self._seq += 1
+            bits = packkeys(controls.pressed())
+            self._inputs.append((self._seq, bits))
+            while len(self._inputs) > 255:
+                self._inputs.popleft()
+            self._step(unpackkeys(bits))
+
+            # Send this input along with the ones before it, in case those were lost
+            start = max(len(self._inputs) - self.redundancy, 0)
+            recent = [bits for _, bits in itertools.islice(self._inputs, start, None)]
+            packet = _INPUT.pack(INPUT, self._tick, self._seq, len(recent)) + bytes(recent)
+            try:
+                self._socket.sendto(packet, self.address)
+            except OSError:
+                pass
+
+        return self if not self.gameover else OptionsMenu()
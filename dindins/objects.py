@@ -7,27 +7,120 @@ functionality can simply be created from the BaseObject class.
 Author: Josh Rogers
 """
 
+from bisect import bisect_left, insort
+from heapq import merge
+from operator import itemgetter
+
 import pygame
 
 from dindins.settings import *
-from dindins.gui import *
+from dindins.events import HIDE, RENDER
+from dindins import assets
+from dindins.gui import DialogueBox
+from dindins.collision import getmask
+from dindins.static import StaticObjects
+from dindins.triggers import TriggerZones
+from dindins.proximity import Proximity
 
 
 class ObjectsGroup(pygame.sprite.Group):
     """Group for game objects
 
     This class is an extension of pygame.sprite.Group to provide a Group for game objects. This implementation inlcudes
-    two key extentions; the colliders() and interactables() methods. These methods return a subset Group of objects that
+    two key extentions; the colliders() and interactables() methods. These methods return a subset of objects that
     have the collide and interactable properties. These can be used in the main game loop to easily detect collisions
     and objects for interactions.
+
+    Plain BaseObjects that can not be interacted with or triggered, such as floors, walls and furniture, are not kept as
+    sprites. Instead they are copied into a compact static store, which the group draws and queries alongside its
+    sprites. Only interactive and animated objects are sprites in the group.
+
+    Objects are drawn in order of their layer, and on the OBJECT layer in order of how far down the screen they reach,
+    so objects lower on the screen overlap those above them. The draw order is kept as objects are added and removed.
+    Static objects are sorted once, and sprites are only moved in the order when they are animated and have moved up
+    or down since the last frame.
+
+    Triggerable objects are also indexed as trigger zones, which track the actors standing in them, and interactable
+    objects are indexed by how close they are to the player.
+
+    Attributes:
+        static: StaticObjects store of the static objects in the group
+        zones: TriggerZones index of the triggerable objects in the group
+        proximity: Proximity index of the interactable objects in the group
     """
-    def colliders(self):
-        colliders = []
+    def __init__(self, *objects):
+        self.static = StaticObjects()
+        self.zones = TriggerZones(self.static)
+        self.proximity = Proximity(self.static)
+
+        # Draw order of sprites
+        self._count = 0
+        self._keys = {}
+        self._order = []
+        self._moving = []
+
+        super().__init__(*objects)
+
+    def _key(self, sprite, seq):
+        """Gets the draw order key of a sprite, matching StaticObjects.key()"""
+        bottom = sprite.rect.bottom - self.static.offset[1] if sprite.layer == OBJECT else 0
+        return sprite.layer, bottom, seq
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        key = self._key(sprite, self._count)
+        self._count += 1
+        self._keys[sprite] = key
+        insort(self._order, (key, sprite), key=itemgetter(0))
+        if isinstance(sprite, Animated):
+            self._moving.append(sprite)
+        if sprite.triggerable:
+            self.zones.add(sprite, moving=isinstance(sprite, Animated))
+        if sprite.interactable:
+            self.proximity.add(sprite, moving=isinstance(sprite, Animated))
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        key = self._keys.pop(sprite)
+        del self._order[bisect_left(self._order, key, key=itemgetter(0))]
+        if sprite in self._moving:
+            self._moving.remove(sprite)
+        if sprite in self.zones:
+            self.zones.remove(sprite)
+        if sprite in self.proximity:
+            self.proximity.remove(sprite)
+
+    def add(self, *objects):
+        """Adds objects to the group
+
+        Args:
+            objects: BaseObjects, or lists of BaseObjects, to add
+        """
+        for object in objects:
+            if isinstance(object, pygame.sprite.Sprite):
+                if type(object) == BaseObject and not object.interactable and not object.triggerable:
+                    self.static.add(object, self._count)
+                    self._count += 1
+                else:
+                    super().add(object)
+            else:
+                self.add(*object)
+
+    def colliders(self, area=None):
+        """Gets the objects with a bounding box
+
+        Args:
+            area: pygame.Rect to limit the search to (defaults to None, for every object)
+
+        Returns:
+            List of objects, static objects first
+        """
+        colliders = self.static.colliders(area)
         for object in self.sprites():
-            if object.boundingbox:
+            if object.boundingbox and (area is None or area.colliderect(object.boundingbox)):
                 colliders.append(object)
 
-        return pygame.sprite.Group(colliders)
+        return colliders
 
     def interactables(self):
         interactables = []
@@ -45,12 +138,78 @@ class ObjectsGroup(pygame.sprite.Group):
 
         return pygame.sprite.Group(triggerables)
 
+    def query(self, area):
+        """Gets the objects within an area
+
+        Args:
+            area: pygame.Rect to search
+
+        Returns:
+            List of objects whose image or bounding box is within the area, static objects first
+        """
+        objects = self.static.query(area)
+        for object in self.sprites():
+            if area.colliderect(object.rect) or (object.boundingbox and area.colliderect(object.boundingbox)):
+                objects.append(object)
+
+        return objects
+
     def get(self, objectname):
         for object in self.sprites():
             if object.name == objectname:
                 return object
 
-        return None
+        return self.static.get(objectname)
+
+    def move(self, x, y):
+        """Shifts every object in the group
+
+        Args:
+            x: Pixel value to move the objects horizontally
+            y: Pixel value to move the objects vertically
+        """
+        self.static.move(x, y)
+        for object in self.sprites():
+            object.move(x, y)
+
+    def buildmasks(self):
+        """Builds masks for precise collision on every collider in the group"""
+        self.static.buildmasks()
+        for object in self.sprites():
+            if object.boundingbox:
+                object.buildmask()
+
+    def draw(self, surface, actors=()):
+        """Draws the objects on the surface in draw order
+
+        Args:
+            surface: pygame.Surface to draw on
+            actors: Sprites that are not in the group but are drawn in order with it, such as the player (defaults to
+                none)
+        """
+        # Re-sort sprites that have moved up or down
+        for sprite in self._moving:
+            old = self._keys[sprite]
+            key = self._key(sprite, old[2])
+            if key != old:
+                del self._order[bisect_left(self._order, old, key=itemgetter(0))]
+                insort(self._order, (key, sprite), key=itemgetter(0))
+                self._keys[sprite] = key
+
+        area = surface.get_rect()
+        static = self.static
+        x, y = static.offset
+        images = static.images
+        statics = [(static.key(i), images[static.asset[i]], (static.x[i] + x, static.y[i] + y)) for i in static.indices(area)]
+        sprites = [(key, sprite.image, sprite.rect) for key, sprite in self._order if area.colliderect(sprite.rect)]
+
+        # Actors are drawn after anything else at the same depth
+        actors = sorted(
+            ((self._key(sprite, self._count), sprite.image, sprite.rect) for sprite in actors), key=itemgetter(0)
+        )
+
+        ordered = merge(statics, sprites, actors, key=itemgetter(0))
+        surface.blits([(image, pos) for _, image, pos in ordered], doreturn=False)
 
 
 class BaseObject(pygame.sprite.Sprite):
@@ -66,7 +225,8 @@ class BaseObject(pygame.sprite.Sprite):
         boundingbox: If set, collision will be detected on the object. The player will not be able to move through the
             object.
         triggerable: A trigger object is an object that performs the trigger() method when the player walks into it (as
-            opposed to pressing the space bar as with the interactable property). MUST IMPLEMENT trigger() METHOD.
+            opposed to pressing the space bar as with the interactable property). MUST IMPLEMENT trigger() METHOD. It
+            is only triggered once each time the player walks into it, and can also implement on_stay() and on_exit().
 
     Attributes:
         image: Image surface of the sprite
@@ -74,9 +234,15 @@ class BaseObject(pygame.sprite.Sprite):
         name: Unique name of the object to identify it and retrieve it in a group
         interactable: Bool indicating if this object can be interacted with (defaults to False)
         boundingbox: pygame.Rect used to detect collision
+        mask: pygame.mask.Mask used for precise collision, only set once buildmask() has been called
+        layer: Draw layer of the object, one of FLOOR, WALL or OBJECT (defaults to OBJECT)
+        state: Names of integer attributes, besides position and animation, kept in snapshots of the game
     """
-    def __init__(self, pos, image, name, interactable=False, boundingbox=None, triggerable=False):
+    state = ()
+
+    def __init__(self, pos, image, name, interactable=False, boundingbox=None, triggerable=False, layer=OBJECT):
         super().__init__()
+        self.layer = layer
         self.image = image
         self.rect = self.image.get_rect()
         self.rect.center = pos
@@ -104,6 +270,17 @@ class BaseObject(pygame.sprite.Sprite):
         else:
             self.boundingbox = boundingbox
 
+        self.mask = None
+
+    def buildmask(self):
+        """Enables precise collision on the object
+
+        The hand-tuned bounding box is replaced by the rect of the image, which is then only used as a cheap check before
+        testing the opaque pixels of the image. The mask is shared with any other object using the same image.
+        """
+        self.boundingbox = self.rect.copy()
+        self.mask = getmask(self.image)
+
     def interact(self):
         """Triggered when player interacts with the object
 
@@ -118,6 +295,30 @@ class BaseObject(pygame.sprite.Sprite):
         """
         raise NotImplementedError
 
+    def on_enter(self, actor):
+        """Called when an actor walks into a triggerable object
+
+        Args:
+            actor: Sprite that walked in, usually the player
+        """
+        self.trigger()
+
+    def on_stay(self, actor):
+        """Called every frame an actor stays in a triggerable object
+
+        Args:
+            actor: Sprite that is in the object
+        """
+        pass
+
+    def on_exit(self, actor):
+        """Called when an actor leaves a triggerable object
+
+        Args:
+            actor: Sprite that left
+        """
+        pass
+
     def move(self, x, y):
         """Shifts the object
 
@@ -181,6 +382,10 @@ class Animated(BaseObject):
 
         self.ticker += 1
 
+    def buildmask(self):
+        """Animated objects change image every few frames, so they keep their bounding box"""
+        pass
+
     def update(self):
         """Update sprite
 
@@ -204,7 +409,7 @@ class DialogueBoxObject(BaseObject):
             height: Height of the door
             message: Message to give to the user when door is used
         """
-        super().__init__(pos, image, name, interactable=True, boundingbox=boundingbox)
+        super().__init__(pos, image, name, interactable=True, boundingbox=boundingbox, layer=WALL)
         self.message = message
 
     def interact(self):
@@ -245,7 +450,7 @@ class HideObject(BaseObject):
 class SpawnTrigger(BaseObject):
     """Triggerable object that spawns other objects
 
-    This object spawns objects (given by the attribute spawn) when the player collides with it.
+    This object spawns objects (given by the attribute spawn) the first time the player walks into it.
 
     Attributes:
         spawn -> List[BaseObject]: Objects to be spawned/rendered when triggered
@@ -264,40 +469,28 @@ class SpawnTrigger(BaseObject):
 
     def trigger(self):
         """Trigger object spawns via RENDER event"""
-        self.remove(self.groups())
-        pygame.event.post(pygame.event.Event(RENDER, {'objects': [object for object in self.spawn]}))
-
+        spawn, self.spawn = self.spawn, ()
+        if spawn:
+            pygame.event.post(pygame.event.Event(RENDER, {'objects': list(spawn)}))
 
-class Bowls(DialogueBoxObject):
-    def __init__(self, objectives):
-        super().__init__((595, -260), pygame.image.load(f'{ASSETS}/objects/bowls.png'), 'Yummy food!', 'bowls', boundingbox=(1, 24, 8, 24))
-        self.objectives = objectives
 
-    def interact(self):
-        if self.objectives[0] == 'eat_food':
-            self.message = 'What was that?                       ...                  I should go hide under the bed!'
-            super().interact()
-            pygame.event.post(pygame.event.Event(OBJECTIVE, {'objective': self.objectives[0]}))
-        elif self.objectives[0] == 'hide_under_bed':
-            # PLAY BANG SOUND
-            self.message = 'I need to hide under the bed!'
-            super().interact()
-        else:
-            self.message = 'Yummy food, but no time for that now!'
-            super().interact()
+class Zone(BaseObject):
+    """Invisible triggerable area
 
+    Zones do nothing by themselves. They are spawned by objectives to tell when the player walks somewhere.
+    """
+    def __init__(self, pos, name):
+        """Init
 
-class Bed(HideObject):
-    def __init__(self, objectives):
-        super().__init__((395, 210), pygame.image.load(f'{ASSETS}/objects/bed.png'), 'bed', boundingbox=(30, 38, 18, 15))
-        self.objectives = objectives
+        Args:
+            pos: Coordinates of the center of the zone
+            name: Name of the zone
+        """
+        super().__init__(pos, assets.load(f'{ASSETS}/terrain/transparent.png'), name, triggerable=True)
 
-    def interact(self):
-        super().interact()
-        if self.objectives[0] == 'hide_under_bed':
-            box = DialogueBox('I think the coast is clear... I can go back to eating my breakfast.', (WIDTH / 2, HEIGHT * .8))
-            pygame.event.post(pygame.event.Event(RENDER, {'objects': [box]}))
-            pygame.event.post(pygame.event.Event(OBJECTIVE, {'objective': self.objectives[0]}))
+    def trigger(self):
+        """Walking into a zone is handled by the objectives"""
+        pass
 
 
 def tile(pos, width, height, name, boundingbox=None):
@@ -314,7 +507,7 @@ def tile(pos, width, height, name, boundingbox=None):
     """
     surface = pygame.Surface((width, height))
     surface.fill(GREY)
-    return BaseObject(pos, surface, name, boundingbox=boundingbox)
+    return BaseObject(pos, surface, name, boundingbox=boundingbox, layer=WALL)
 
 
 def tileset(pos, width, height, name, type='floorboard'):
@@ -333,9 +526,9 @@ def tileset(pos, width, height, name, type='floorboard'):
     """
     # Get image to use
     images = {
-        'tile': pygame.image.load(f'{ASSETS}/terrain/tile.png'),
-        'floorboard': pygame.image.load(f'{ASSETS}/terrain/floorboard.png'),
-        'carpet': pygame.image.load(f'{ASSETS}/terrain/carpet.png'),
+        'tile': assets.load(f'{ASSETS}/terrain/tile.png'),
+        'floorboard': assets.load(f'{ASSETS}/terrain/floorboard.png'),
+        'carpet': assets.load(f'{ASSETS}/terrain/carpet.png'),
     }
     image = images[type]
 
@@ -350,7 +543,7 @@ def tileset(pos, width, height, name, type='floorboard'):
     while y <= height * 32:
 
         # Place sprite (relative to given pos) and increment x by 32
-        sprites.append(BaseObject((pos[0] - x, pos[1] - y), image, name))
+        sprites.append(BaseObject((pos[0] - x, pos[1] - y), image, name, layer=FLOOR))
         x += 32
 
         # Go to next row if x exceeds width
@@ -0,0 +1,105 @@
+"""Frame Pacing
+
+This file contains the frame pacer, which keeps the main loop running at the target frame rate. The game simulates
+one step per frame, so on a machine too slow to hit the frame rate the game would slow down. Instead, when the loop
+falls behind, the pacer stops sleeping between frames and skips rendering, which is usually the slowest part of a
+frame, until it has caught up. Simulation is never skipped, so the game runs at the same speed, just less smoothly.
+
+The pacer also counts how often frames go over budget, so slow machines can be spotted.
+
+Author: Josh Rogers
+"""
+
+import pygame
+
+
+class FramePacer:
+    """Frame pacer
+
+    Attributes:
+        fps: Target frames per second
+        budget: Milliseconds each frame has to run in
+        busyloop: Boolean indicating if the pacer busy waits rather than sleeps, for more accurate timing at the cost
+            of a CPU core
+        maxskip: Most renders to skip in a row, so the screen still updates when the machine can never catch up
+        behind: Milliseconds the loop is behind schedule
+        frames: Number of frames run
+        missed: Number of frames that went over budget
+        skipped: Number of frames that were not rendered
+    """
+    def __init__(self, fps, busyloop=False, maxskip=5):
+        """Init
+
+        Args:
+            fps: Target frames per second
+            busyloop: Busy wait for more accurate timing (defaults to False)
+            maxskip: Most renders to skip in a row (defaults to 5)
+        """
+        self.fps = fps
+        self.budget = 1000 / fps
+        self.busyloop = busyloop
+        self.maxskip = maxskip
+        self.behind = 0
+        self.frames = 0
+        self.missed = 0
+        self.skipped = 0
+
+        self._clock = pygame.time.Clock()
+        self._skipping = 0
+
+    def tick(self):
+        """Waits for the next frame
+
+        Call once at the start of every frame. If the loop is behind, it does not wait at all.
+
+        Returns:
+            Milliseconds since the previous frame
+        """
+        framerate = 0 if self.behind >= self.budget else self.fps
+        if self.busyloop:
+            elapsed = self._clock.tick_busy_loop(framerate)
+        else:
+            elapsed = self._clock.tick(framerate)
+
+        # Time spent working on the previous frame, not counting the wait
+        if self.frames:
+            work = self._clock.get_rawtime()
+            if work > self.budget:
+                self.missed += 1
+
+            # Never try to catch up on more than can be skipped
+            self.behind = min(max(self.behind + work - self.budget, 0), self.budget * self.maxskip)
+
+        self.frames += 1
+        return elapsed
+
+    def render(self):
+        """Decides if this frame should be rendered
+
+        Returns:
+            False if the loop is behind and the frame should only be simulated, otherwise True
+        """
+        if self.behind >= self.budget and self._skipping < self.maxskip:
+            self._skipping += 1
+            self.skipped += 1
+            return False
+
+        self._skipping = 0
+        return True
+
+    def get_fps(self):
+        """Gets the average frame rate over the last few frames"""
+        return self._clock.get_fps()
+
+    def report(self):
+        """Describes how well frames kept to the budget
+
+        Returns:
+            String with the number of frames, and how many were over budget or not rendered
+        """
+        frames = max(self.frames, 1)
+        return (
+            f'{self.frames} frames at {self.fps} fps, '
+            f'{self.missed} over budget ({self.missed / frames:.1%}), '
+            f'{self.skipped} not rendered ({self.skipped / frames:.1%})'
+        )
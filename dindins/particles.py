@@ -0,0 +1,177 @@
+"""Particles
+
+This file contains the particle system, used for small effects such as crumbs, dust and bursts. Particles are not
+sprites. Their position, velocity, lifetime and colour are stored in NumPy arrays allocated once with a fixed capacity,
+stepped together each frame, and drawn straight into the pixels of the screen in one pass. Slots of particles that have
+died are kept on a free list and reused by new particles, so emitting particles never allocates. If every slot is in
+use, new particles are dropped.
+
+Positions are stored in the coordinates of the static object store, so particles stay where they were emitted as the
+camera moves the world.
+
+This module requires NumPy.
+
+Author: Josh Rogers
+"""
+
+import numpy as np
+import pygame
+
+# Effects that can be emitted by name, see Particles.emit() for what each setting does
+EFFECTS = {
+    'crumbs': {'count': 14, 'speed': 1.5, 'life': 24, 'colour': (196, 140, 80), 'gravity': 0.15, 'drag': 0.95},
+    'dust': {'count': 2, 'speed': 0.6, 'life': 14, 'colour': (170, 160, 145), 'gravity': -0.02, 'drag': 0.9},
+    'scare': {'count': 60, 'speed': 4, 'life': 30, 'colour': (230, 60, 60), 'gravity': 0, 'drag': 0.9},
+}
+
+
+class Particles:
+    """Particle system
+
+    Attributes:
+        capacity: Most particles that can be alive at once
+        static: StaticObjects store of the level, used for how far the world has moved
+        pos: (capacity, 2) array of the position of each particle
+        vel: (capacity, 2) array of the pixels each particle moves per frame
+        life: (capacity,) array of the frames each particle has left, 0 for free slots
+        lifetime: (capacity,) array of the frames each particle started with
+        colour: (capacity, 3) array of the colour of each particle
+        gravity: (capacity,) array of the pixels per frame added to the vertical velocity of each particle
+        drag: (capacity,) array of the amount the velocity of each particle is kept each frame
+        size: Width and height in pixels of each particle
+        dropped: Number of particles not emitted because every slot was in use
+        pause: Boolean indicating if the particles should be paused
+    """
+    def __init__(self, objects, capacity=2048, size=2, seed=None):
+        """Allocates the particles
+
+        Args:
+            objects: ObjectsGroup of the level
+            capacity: Most particles alive at once (defaults to 2048)
+            size: Width and height of each particle (defaults to 2)
+            seed: Seed for the random number generator (defaults to None)
+        """
+        self.static = objects.static
+        self.capacity = capacity
+        self.size = size
+        self.dropped = 0
+        self.pause = False
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.lifetime = np.ones(capacity, dtype=np.int32)
+        self.colour = np.zeros((capacity, 3), dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.drag = np.ones(capacity, dtype=np.float32)
+
+        # Stack of free slots, the top being the next slot to use
+        self._free = np.arange(capacity, dtype=np.int32)[::-1].copy()
+        self._freecount = capacity
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def count(self):
+        """Number of live particles"""
+        return self.capacity - self._freecount
+
+    def emit(self, pos, count, speed, life, colour, gravity=0, drag=1, direction=None, spread=np.pi * 2):
+        """Emits particles from a point
+
+        Args:
+            pos: (x, y) screen coordinates to emit from
+            count: Number of particles
+            speed: Most pixels per frame a particle starts moving at
+            life: Most frames a particle lives for
+            colour: Colour of the particles
+            gravity: Pixels per frame added to the vertical velocity each frame (defaults to 0)
+            drag: Amount of the velocity kept each frame (defaults to 1)
+            direction: Angle in radians to emit towards (defaults to None, for random directions)
+            spread: Angle in radians around the direction to emit within (defaults to a full circle)
+
+        Returns:
+            Number of particles emitted
+        """
+        emitted = min(count, self._freecount)
+        self.dropped += count - emitted
+        if not emitted:
+            return 0
+
+        self._freecount -= emitted
+        slots = self._free[self._freecount:self._freecount + emitted]
+
+        if direction is None:
+            angles = self._rng.uniform(0, np.pi * 2, emitted)
+        else:
+            angles = direction + self._rng.uniform(-spread / 2, spread / 2, emitted)
+        speeds = self._rng.uniform(speed / 4, speed, emitted)
+
+        self.pos[slots] = (pos[0] - self.static.offset[0], pos[1] - self.static.offset[1])
+        self.vel[slots, 0] = np.cos(angles) * speeds
+        self.vel[slots, 1] = np.sin(angles) * speeds
+        self.life[slots] = self._rng.integers(max(life // 2, 1), life + 1, emitted)
+        self.lifetime[slots] = self.life[slots]
+        self.colour[slots] = colour
+        self.gravity[slots] = gravity
+        self.drag[slots] = drag
+        return emitted
+
+    def effect(self, name, pos, **settings):
+        """Emits one of the named effects
+
+        Args:
+            name: Name of the effect in EFFECTS
+            pos: (x, y) screen coordinates to emit from
+            settings: Settings to change from those of the effect, passed on to emit()
+
+        Returns:
+            Number of particles emitted
+        """
+        return self.emit(pos, **dict(EFFECTS[name], **settings))
+
+    def update(self):
+        """Steps every live particle, freeing the slots of those that die"""
+        if self.pause or self._freecount == self.capacity:
+            return
+
+        alive = np.flatnonzero(self.life > 0)
+        self.vel[alive, 1] += self.gravity[alive]
+        self.vel[alive] *= self.drag[alive, None]
+        self.pos[alive] += self.vel[alive]
+        self.life[alive] -= 1
+
+        dead = alive[self.life[alive] == 0]
+        self._free[self._freecount:self._freecount + len(dead)] = dead
+        self._freecount += len(dead)
+
+    def draw(self, surface):
+        """Draws the live particles on screen, fading out as they die
+
+        Args:
+            surface: pygame.Surface to draw on
+        """
+        if self._freecount == self.capacity:
+            return
+
+        alive = np.flatnonzero(self.life > 0)
+        x = self.pos[alive, 0].astype(np.int32) + self.static.offset[0]
+        y = self.pos[alive, 1].astype(np.int32) + self.static.offset[1]
+        width, height = surface.get_size()
+        visible = (x >= 0) & (x <= width - self.size) & (y >= 0) & (y <= height - self.size)
+        if not visible.any():
+            return
+
+        alive = alive[visible]
+        x = x[visible]
+        y = y[visible]
+        fade = (self.life[alive] / self.lifetime[alive])[:, None]
+        colour = self.colour[alive]
+
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            for dx in range(self.size):
+                for dy in range(self.size):
+                    under = pixels[x + dx, y + dy]
+                    pixels[x + dx, y + dy] = under + (colour - under) * fade
+        finally:
+            del pixels
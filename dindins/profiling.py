@@ -0,0 +1,135 @@
+"""Profiling
+
+This file contains the startup profiler, used by python -m dindins --profile-startup to find what is slowing down the
+time it takes to get the window open. It times every module imported after it is installed, in the same way as
+python -X importtime, as well as phases of startup marked by the game, such as opening the window and showing the
+first frame.
+
+The profiler must be installed before the game is imported, so it does not import anything from the game or pygame
+itself.
+
+Author: Josh Rogers
+"""
+
+import sys
+import time
+from importlib.abc import MetaPathFinder
+
+
+class _TimedLoader:
+    """Loader that times another loader executing a module
+
+    While the module is executing, the real loader is put back on the module so anything looking at it sees the loader
+    it expects.
+    """
+    def __init__(self, profiler, loader):
+        self._profiler = profiler
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+
+        self._profiler._start(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._stop()
+
+
+class StartupProfiler(MetaPathFinder):
+    """Startup profiler
+
+    Attributes:
+        start: time.perf_counter() when the profiler was created
+        imports: List of (name, depth, self, cumulative) for each module imported, in the order they finished, with
+            times in seconds
+        phases: List of (phase, seconds) since the previous phase, in the order they were marked
+    """
+    def __init__(self):
+        """Init"""
+        self.start = time.perf_counter()
+        self.imports = []
+        self.phases = []
+
+        # [name, start, time spent importing children] of each import in progress
+        self._stack = []
+        self._last = self.start
+
+    def install(self):
+        """Starts timing imports"""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """Stops timing imports"""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        """Finds a module with the other finders and wraps its loader
+
+        Args:
+            fullname: Name of the module
+            path: Search path of the parent package
+            target: Module being reloaded
+
+        Returns:
+            importlib.machinery.ModuleSpec, or None if no other finder can find the module
+        """
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(self, spec.loader)
+                return spec
+
+        return None
+
+    def _start(self, name):
+        """Starts timing a module"""
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _stop(self):
+        """Stops timing the module on top of the stack"""
+        name, start, children = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][2] += cumulative
+        self.imports.append((name, len(self._stack), cumulative - children, cumulative))
+
+    def mark(self, phase):
+        """Marks the end of a phase of startup
+
+        Args:
+            phase: Name of the phase
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self, file=sys.stderr, limit=25):
+        """Prints the phases and the slowest imports
+
+        Args:
+            file: File to print to (defaults to sys.stderr)
+            limit: Number of imports to list (defaults to 25)
+        """
+        print('startup phase        |     ms', file=file)
+        for phase, seconds in self.phases:
+            print(f'{phase:<20} | {seconds * 1000:>6.1f}', file=file)
+        print(f'{"total":<20} | {(self._last - self.start) * 1000:>6.1f}', file=file)
+
+        print(file=file)
+        print('import time: self [us] | cumulative | imported package', file=file)
+        for name, depth, own, cumulative in sorted(self.imports, key=lambda entry: entry[3], reverse=True)[:limit]:
+            print(f'import time: {own * 1e6:>9.0f} | {cumulative * 1e6:>10.0f} | {"  " * depth}{name}', file=file)
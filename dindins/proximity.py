@@ -0,0 +1,152 @@
+"""Proximity
+
+This file contains the proximity index, which finds the interactable object the player would use by pressing space.
+The interaction area of each interactable, its rect scaled up by a ratio, is worked out once when it is added and
+bucketed into a grid of cells. Each frame only the interactables in the cells around the player are looked at, and
+only when the player has moved, turned around or an interactable has changed, so the result is always ready to use,
+such as for drawing a highlight around it.
+
+Author: Josh Rogers
+"""
+
+import pygame
+
+from dindins.settings import *
+from dindins.spatial import CellIndex
+
+# Way each direction faces
+FACING = {
+    'up': (0, -1),
+    'down': (0, 1),
+    'left': (-1, 0),
+    'right': (1, 0),
+}
+
+
+class Proximity(CellIndex):
+    """Proximity index of interactable objects
+
+    An interactable can be used when its interaction area overlaps the interaction area of the player, the same as
+    pygame.sprite.collide_rect_ratio(). Of those, the nearest in front of the player is picked, and only if none are in
+    front is the nearest behind them picked.
+
+    Attributes:
+        ratio: Amount the rects of the player and interactables are scaled by to get their interaction areas
+        nearest: Interactable nearest to the player as of the last update(), or None if there is nothing in reach
+    """
+    def __init__(self, static, cellsize=64, ratio=1.25):
+        """Init
+
+        Args:
+            static: StaticObjects store of the level
+            cellsize: Width and height in pixels of each cell (defaults to 64)
+            ratio: Amount rects are scaled by to get their interaction areas (defaults to 1.25)
+        """
+        super().__init__(static, cellsize)
+        self.ratio = ratio
+        self.nearest = None
+
+        self._state = None
+        self._cellrange = None
+        self._version = -1
+        self._candidates = set()
+
+    def area(self, object):
+        """Gets the interaction area of an object, its rect scaled around its center"""
+        rect = object.rect
+        return rect.inflate(rect.width * self.ratio - rect.width, rect.height * self.ratio - rect.height)
+
+    def remove(self, object):
+        super().remove(object)
+        if object is self.nearest:
+            self.nearest = None
+
+    def update(self, player, direction):
+        """Finds the interactable nearest the player
+
+        Args:
+            player: Sprite of the player
+            direction: Direction the player is facing, one of 'up', 'down', 'left' or 'right'
+
+        Returns:
+            Nearest interactable, or None if there is nothing in reach
+        """
+        moved = self.refresh()
+
+        rect = self.tostore(self.area(player))
+        state = (rect, direction)
+        changed = state != self._state
+        self._state = state
+
+        cells = self.cellrange(rect)
+        if cells != self._cellrange or self._version != self.version:
+            self._cellrange = cells
+            self._version = self.version
+            self._candidates = self.gather(cells)
+            changed = True
+
+        if changed or not moved.isdisjoint(self._candidates):
+            self.nearest = self._nearest(rect, direction)
+
+        return self.nearest
+
+    def _nearest(self, rect, direction):
+        """Picks the nearest of the candidates in reach
+
+        Args:
+            rect: Interaction area of the player, in store coordinates
+            direction: Direction the player is facing
+
+        Returns:
+            Nearest interactable, or None
+        """
+        fx, fy = FACING.get(direction, (0, 0))
+        x, y = rect.center
+        nearest = None
+        best = None
+        for object in self._candidates:
+            area = self.rect(object)
+            if not rect.colliderect(area):
+                continue
+
+            # Distance from the center of the player to the closest point of the interactable
+            dx = min(max(x, area.left), area.right) - x
+            dy = min(max(y, area.top), area.bottom) - y
+            behind = (area.centerx - x) * fx + (area.centery - y) * fy < 0
+            key = (behind, dx * dx + dy * dy, object.name)
+            if best is None or key < best:
+                best = key
+                nearest = object
+
+        return nearest
+
+
+class Highlight:
+    """Highlight around the nearest interactable
+
+    Drawn as a batched system of the game screen, after the game objects.
+
+    Attributes:
+        proximity: Proximity index to highlight the nearest interactable of
+        colour: Colour of the highlight
+        pause: Boolean indicating the highlight should not be shown, such as while a dialogue box is up
+    """
+    def __init__(self, proximity, colour=WHITE):
+        self.proximity = proximity
+        self.colour = colour
+        self.pause = False
+
+    def update(self):
+        """The proximity index is updated by the game screen, so there is nothing to do"""
+        pass
+
+    def draw(self, surface):
+        """Outlines the nearest interactable
+
+        Args:
+            surface: pygame.Surface to draw on
+        """
+        if self.pause or self.proximity.nearest is None:
+            return
+
+        pygame.draw.rect(surface, self.colour, self.proximity.nearest.rect, 1)
@@ -0,0 +1,305 @@
+"""Quests
+
+This file contains the objective engine. Objectives are declared as data, in the level, each with the condition that
+completes it and the actions run when it is completed. While an objective is the current one, its reactions also run
+their actions whenever their condition is met, without completing it. Conditions are met by the player interacting
+with an object, walking into a zone, or by the current objective having gone on for some time. Actions show dialogue,
+spawn objects, play sounds and effects, hide the player or end the game.
+
+Rather than every object checking the current objective when something happens, conditions are indexed by the event
+that meets them, and then by the objective they belong to. Each event only looks up the conditions of the current
+objective waiting on it, so a quest costs the same to follow however long it gets.
+
+Objectives are completed in order. A completed objective is removed from the list of objectives left, which is shared
+with the minimap, snapshots and the agent environment, so the first objective in the list is always the current one.
+
+Author: Josh Rogers
+"""
+
+import importlib
+
+import pygame
+
+from dindins.settings import *
+from dindins.events import HIDE, RENDER, OBJECTIVE, GAME_OVER, SOUND, EFFECT
+from dindins.gui import DialogueBox
+
+# Events that meet conditions
+INTERACTED = 0
+ENTERED = 1
+
+
+class Interacted:
+    """Condition met by the player interacting with an object
+
+    The actions run instead of the object's own interaction.
+    """
+    def __init__(self, name):
+        """Init
+
+        Args:
+            name: Name of the object
+        """
+        self.key = (INTERACTED, name)
+
+
+class Entered:
+    """Condition met by the player walking into a triggerable object"""
+    def __init__(self, name):
+        """Init
+
+        Args:
+            name: Name of the object
+        """
+        self.key = (ENTERED, name)
+
+
+class Timer:
+    """Condition met once the objective has gone on for a number of seconds, not counting time paused"""
+    def __init__(self, seconds, fps=FPS):
+        """Init
+
+        Args:
+            seconds: Seconds after the objective becomes the current objective
+            fps: Ticks per second (defaults to FPS)
+        """
+        self.key = None
+        self.ticks = max(int(seconds * fps), 1)
+
+
+class Dialogue:
+    """Action showing a dialogue box"""
+    def __init__(self, message):
+        """Init
+
+        Args:
+            message: Message in the dialogue box
+        """
+        self.message = message
+
+    def run(self, objects):
+        box = DialogueBox(self.message, (WIDTH / 2, HEIGHT * .8))
+        pygame.event.post(pygame.event.Event(RENDER, {'objects': [box]}))
+
+
+class Spawn:
+    """Action spawning an object, made when the action runs so each game gets its own"""
+    def __init__(self, type, pos, *args):
+        """Init
+
+        Args:
+            type: Class of the object, or its dotted path so it is only imported once it is spawned
+            pos: (x, y) level coordinates of the object
+            args: Arguments given to the class after the position
+        """
+        self.type = type
+        self.pos = pos
+        self.args = args
+
+    def run(self, objects):
+        if isinstance(self.type, str):
+            module, _, name = self.type.rpartition('.')
+            self.type = getattr(importlib.import_module(module), name)
+
+        offset = tuple(objects.static.offset)
+        object = self.type((self.pos[0] + offset[0], self.pos[1] + offset[1]), *self.args)
+        pygame.event.post(pygame.event.Event(RENDER, {'objects': [object], 'offset': offset}))
+
+
+class Hide:
+    """Action hiding the player under an object"""
+    def __init__(self, name):
+        """Init
+
+        Args:
+            name: Name of the object
+        """
+        self.name = name
+
+    def run(self, objects):
+        pygame.event.post(pygame.event.Event(HIDE, {'object': objects.get(self.name), 'move': False}))
+
+
+class Sound:
+    """Action playing a sound"""
+    def __init__(self, sound, priority=0):
+        """Init
+
+        Args:
+            sound: Name of the sound in SOUNDS
+            priority: Priority of the sound (defaults to 0)
+        """
+        self.sound = sound
+        self.priority = priority
+
+    def run(self, objects):
+        pygame.event.post(pygame.event.Event(SOUND, {'sound': self.sound, 'priority': self.priority}))
+
+
+class Effect:
+    """Action emitting a particle effect from an object"""
+    def __init__(self, effect, name):
+        """Init
+
+        Args:
+            effect: Name of the effect
+            name: Name of the object
+        """
+        self.effect = effect
+        self.name = name
+
+    def run(self, objects):
+        object = objects.get(self.name)
+        if object:
+            pygame.event.post(pygame.event.Event(EFFECT, {'effect': self.effect, 'pos': object.rect.center}))
+
+
+class GameOver:
+    """Action ending the game"""
+    def run(self, objects):
+        pygame.event.post(pygame.event.Event(GAME_OVER, {}))
+
+
+class Reaction:
+    """Actions run each time a condition is met while an objective is current"""
+    def __init__(self, condition, *actions):
+        """Init
+
+        Args:
+            condition: Interacted, Entered or Timer condition
+            actions: Actions to run
+        """
+        self.condition = condition
+        self.actions = actions
+
+
+class Objective:
+    """Objective declaration
+
+    Attributes:
+        name: Name of the objective
+        condition: Condition completing the objective, or None if it is never completed
+        actions: Actions run when the objective is completed
+        start: Actions run when the objective becomes the current objective
+        reactions: Reactions while the objective is current
+    """
+    def __init__(self, name, condition=None, *actions, start=(), reactions=()):
+        """Init
+
+        Args:
+            name: Name of the objective
+            condition: Interacted, Entered or Timer condition completing the objective (defaults to None)
+            actions: Actions to run when the objective is completed
+            start: Actions to run when the objective becomes the current objective (defaults to none)
+            reactions: Reactions while the objective is current (defaults to none)
+        """
+        self.name = name
+        self.condition = condition
+        self.actions = actions
+        self.start = start
+        self.reactions = reactions
+
+
+class Quest:
+    """Objective engine
+
+    Attributes:
+        objectives: List of the names of the objectives left, the first being the current objective
+        objects: ObjectsGroup of the level
+        ticks: Ticks the current objective has gone on for
+    """
+    def __init__(self, objectives, objects):
+        """Indexes the conditions and starts the first objective
+
+        Args:
+            objectives: Objective declarations, in order
+            objects: ObjectsGroup of the level
+        """
+        self.objectives = [objective.name for objective in objectives]
+        self.objects = objects
+        self.ticks = 0
+
+        self._declared = {objective.name: objective for objective in objectives}
+
+        # Actions to run, and whether they complete the objective, by event then objective
+        self._index = {}
+        self._timers = {}
+        for objective in objectives:
+            rules = [(reaction.condition, reaction.actions, False) for reaction in objective.reactions]
+            if objective.condition:
+                rules.append((objective.condition, objective.actions, True))
+
+            for condition, actions, completes in rules:
+                if isinstance(condition, Timer):
+                    self._timers.setdefault(objective.name, []).append((condition.ticks, actions, completes))
+                else:
+                    self._index.setdefault(condition.key, {}).setdefault(objective.name, []).append((actions, completes))
+
+        if self.objectives:
+            self._run(self._declared[self.objectives[0]].start)
+
+    def _run(self, actions):
+        for action in actions:
+            action.run(self.objects)
+
+    def _fire(self, rules):
+        """Runs the actions of rules met, posting OBJECTIVE if one completes the current objective"""
+        for actions, completes in rules:
+            self._run(actions)
+            if completes:
+                pygame.event.post(pygame.event.Event(OBJECTIVE, {'objective': self.objectives[0]}))
+
+    def _notify(self, key):
+        if not self.objectives:
+            return False
+
+        rules = self._index.get(key)
+        rules = rules and rules.get(self.objectives[0])
+        if not rules:
+            return False
+
+        self._fire(rules)
+        return True
+
+    def interact(self, name):
+        """Tells the engine the player interacted with an object
+
+        Args:
+            name: Name of the object
+
+        Returns:
+            True if the current objective handled the interaction, in which case the object's own interaction must
+            not happen
+        """
+        return self._notify((INTERACTED, name))
+
+    def enter(self, name):
+        """Tells the engine the player walked into a triggerable object
+
+        Args:
+            name: Name of the object
+        """
+        self._notify((ENTERED, name))
+
+    def update(self):
+        """Counts a tick of the current objective, running the actions of timers that have run out"""
+        self.ticks += 1
+        timers = self.objectives and self._timers.get(self.objectives[0])
+        if timers:
+            self._fire([(actions, completes) for ticks, actions, completes in timers if ticks == self.ticks])
+
+    def complete(self, name):
+        """Completes an objective, making the next objective current
+
+        Only the current objective can be completed, so an objective completed twice in a tick only counts once.
+
+        Args:
+            name: Name of the objective
+        """
+        if not self.objectives or self.objectives[0] != name:
+            return
+
+        self.objectives.pop(0)
+        self.ticks = 0
+        if self.objectives:
+            self._run(self._declared[self.objectives[0]].start)
@@ -1,9 +1,50 @@
-import pygame
+import os
 
 WIDTH = 1000
 HEIGHT = 800
 FPS = 30
-ASSETS = '../assets'
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+
+# Window scale, the game is rendered at WIDTH x HEIGHT then scaled up once per frame, with the GUI drawn on top at the
+# scaled resolution
+SCALE = 1
+
+# Frame pacing: wait for the display refresh, busy wait for accurate frame times, and the most renders to skip in a
+# row when the game can not keep up
+VSYNC = False
+BUSY_LOOP = False
+MAX_FRAMESKIP = 5
+
+# Recording: format frames are written in, 'png' or 'raw', and the most frames waiting to be written before frames
+# are dropped
+CAPTURE_FORMAT = 'png'
+CAPTURE_BUFFERS = 4
+
+# Use pixel masks rather than bounding boxes for collision
+PRECISE_COLLISION = False
+
+# Baked lighting of the house (requires NumPy), the time of day to show and where baked lightmaps are cached
+LIGHTING = False
+TIME_OF_DAY = 'day'
+LIGHTMAP_CACHE = os.path.join(ASSETS, 'lightmaps')
+
+# Particle effects, such as crumbs, dust and bursts (requires NumPy)
+PARTICLES = False
+
+# Seconds of snapshots kept to rewind the game by, 0 to turn rewinding off
+REWIND = 0
+
+# Two player mode: UDP port the host listens on and ticks between each snapshot sent to the second player
+NET_PORT = 7777
+NET_RATE = 1
+
+# Number of wandering NPCs to simulate in crowd mode (requires NumPy)
+CROWD = 0
+
+# Draw layers, objects on the OBJECT layer are also drawn in order of how far down the screen they reach
+FLOOR = 0
+WALL = 1
+OBJECT = 2
 
 # Colours
 BLACK = (0, 0, 0)
@@ -13,10 +54,7 @@ BLUE = (0, 0, 255)
 GREY = (192, 192, 192)
 WHITE = (255, 255, 255)
 
-# Custom events
-PAUSE = pygame.USEREVENT + 1
-RESUME = PAUSE + 1
-HIDE = RESUME + 1
-RENDER = HIDE + 1
-OBJECTIVE = RENDER + 1
-GAME_OVER = OBJECTIVE + 1
\ No newline at end of file
+# Sound effects preloaded by the game screen
+SOUNDS = {
+    'bang': f'{ASSETS}/sounds/bang.wav',
+}
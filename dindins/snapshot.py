@@ -0,0 +1,298 @@
+"""Snapshots
+
+This file contains snapshots of the state of a game, and the rewind buffer built on them. A snapshot holds everything
+that changes while playing: how far the world has moved, the position and animation of every object that is not in
+the static object store, the objectives left and how long the current one has gone on, stamina, whether Lucy is hiding
+or the game is paused, and how far each dialogue box has been typed. The house itself never changes, so static objects are never part of a snapshot.
+
+Objects, images and dialogue boxes are stored once in the tables of the Snapshots they were captured by, and snapshots
+only refer to them by number. This keeps a snapshot to a few dozen bytes, packed straight into a preallocated buffer,
+which is small and fast enough to capture every tick. As they refer to the tables, snapshots can only be restored into
+the game they were captured from.
+
+Rewind keeps the last few seconds of snapshots in a fixed size ring buffer, so the game can be stepped back instantly.
+It is turned off unless asked for, as recording costs a little every tick.
+
+Rewind with backspace after starting with:
+    python -m dindins --rewind seconds
+
+Author: Josh Rogers
+"""
+
+import struct
+
+import pygame
+
+from dindins.settings import *
+from dindins.events import PAUSE, RESUME, HIDE, RENDER, OBJECTIVE, GAME_OVER, SOUND, EFFECT
+from dindins.objects import Animated, SpawnTrigger
+
+# World offset, speed, stamina, flags, offset saved while hiding, objectives left, ticks of the current objective,
+# dialogue boxes and objects
+_HEADER = struct.Struct('<iibhBiiHIBH')
+
+# Direction, animation index, ticker, rate, pause and image of an animated object
+_ANIMATION = struct.Struct('<BBIBBH')
+
+# Id, flags and position of an object
+_OBJECT = struct.Struct('<HBhh')
+
+# Id, characters typed and finished of a dialogue box
+_DIALOGUE = struct.Struct('<HHB')
+
+_STATE = struct.Struct('<i')
+
+# Header flags
+BLOCKED = 1
+HIDING = 2
+PAUSED = 4
+GAMEOVER = 8
+TEMP = 16
+
+# Object flags
+ANIMATED = 1
+SPENT = 2
+
+# Directions, in the order they are stored
+DIRECTIONS = ('up', 'down', 'left', 'right')
+
+# Game events dropped when a snapshot is restored, so events posted after it was captured do not happen
+EVENTS = (PAUSE, RESUME, HIDE, RENDER, OBJECTIVE, GAME_OVER, SOUND, EFFECT)
+
+
+class Snapshots:
+    """Captures and restores snapshots of a game
+
+    Attributes:
+        screen: GameScreen the snapshots are of
+        objectives: Every objective of the game, in order
+        objects: Table of the objects and dialogue boxes that have been in game, indexed by their id in snapshots
+        images: Table of the images animated objects have shown, indexed by their id in snapshots
+    """
+    def __init__(self, screen):
+        """Init
+
+        Args:
+            screen: GameScreen to take snapshots of, before any objectives have been completed
+        """
+        self.screen = screen
+        self.objectives = list(screen.objectives)
+        self.objects = []
+        self.images = []
+
+        self._ids = {}
+        self._imageids = {}
+        self._spawns = {}
+        self._scratch = bytearray(4096)
+
+    def _id(self, object):
+        """Gets the id of an object, adding it to the table the first time it is seen"""
+        id = self._ids.get(object)
+        if id is None:
+            id = self._ids[object] = len(self.objects)
+            self.objects.append(object)
+            if isinstance(object, SpawnTrigger) and object.spawn:
+                self._spawns[id] = object.spawn
+        return id
+
+    def _imageid(self, image):
+        id = self._imageids.get(image)
+        if id is None:
+            id = self._imageids[image] = len(self.images)
+            self.images.append(image)
+        return id
+
+    def _packanimation(self, buffer, offset, sprite):
+        _ANIMATION.pack_into(
+            buffer, offset, DIRECTIONS.index(sprite.direction), sprite.index, sprite.ticker, sprite.rate, sprite.pause,
+            self._imageid(sprite.image)
+        )
+        return offset + _ANIMATION.size
+
+    def _unpackanimation(self, buffer, offset, sprite):
+        direction, sprite.index, sprite.ticker, sprite.rate, pause, image = _ANIMATION.unpack_from(buffer, offset)
+        sprite.direction = DIRECTIONS[direction]
+        sprite.pause = bool(pause)
+        sprite.image = self.images[image]
+        return offset + _ANIMATION.size
+
+    def pack_into(self, buffer, offset=0):
+        """Packs a snapshot of the game into a buffer
+
+        Args:
+            buffer: Writable buffer, such as a bytearray
+            offset: Position in the buffer to start at (defaults to 0)
+
+        Returns:
+            Size of the snapshot in bytes
+
+        Raises:
+            struct.error: The snapshot does not fit in the buffer
+        """
+        screen = self.screen
+        start = offset
+        objects = screen.gameobjects.sprites()
+
+        flags = (
+            BLOCKED * screen.stamina.blocked | HIDING * screen.hiding | PAUSED * screen.paused |
+            GAMEOVER * screen.gameover | TEMP * (screen.temp is not None)
+        )
+        temp = screen.temp or (0, 0)
+        objectives = 0
+        for bit, objective in enumerate(self.objectives):
+            if objective in screen.objectives:
+                objectives |= 1 << bit
+
+        ox, oy = screen.gameobjects.static.offset
+        _HEADER.pack_into(
+            buffer, offset, ox, oy, screen.speed, screen.stamina.stamina, flags, temp[0], temp[1], objectives,
+            screen.quest.ticks, len(screen.dialogue), len(objects)
+        )
+        offset = self._packanimation(buffer, offset + _HEADER.size, screen.player.sprite)
+
+        for box in screen.dialogue:
+            _DIALOGUE.pack_into(buffer, offset, self._id(box), len(box.text) - len(box.buffer), box.finished)
+            offset += _DIALOGUE.size
+
+        for object in objects:
+            animated = isinstance(object, Animated)
+            spent = isinstance(object, SpawnTrigger) and not object.spawn
+            _OBJECT.pack_into(
+                buffer, offset, self._id(object), ANIMATED * animated | SPENT * spent, object.rect.x - ox,
+                object.rect.y - oy
+            )
+            offset += _OBJECT.size
+            if animated:
+                offset = self._packanimation(buffer, offset, object)
+            for name in object.state:
+                _STATE.pack_into(buffer, offset, getattr(object, name))
+                offset += _STATE.size
+
+        return offset - start
+
+    def capture(self):
+        """Captures a snapshot of the game
+
+        Returns:
+            Bytes of the snapshot
+        """
+        size = self.pack_into(self._scratch)
+        return bytes(self._scratch[:size])
+
+    def restore(self, snapshot, offset=0):
+        """Puts the game back to how it was in a snapshot
+
+        Args:
+            snapshot: Buffer holding a snapshot captured by these Snapshots
+            offset: Position of the snapshot in the buffer (defaults to 0)
+        """
+        screen = self.screen
+        pygame.event.clear(EVENTS)
+
+        (x, y, screen.speed, screen.stamina.stamina, flags, tx, ty, objectives, screen.quest.ticks, dialogue,
+         count) = _HEADER.unpack_from(snapshot, offset)
+        offset = self._unpackanimation(snapshot, offset + _HEADER.size, screen.player.sprite)
+
+        screen.stamina.blocked = bool(flags & BLOCKED)
+        screen.hiding = bool(flags & HIDING)
+        screen.paused = bool(flags & PAUSED)
+        screen.gameover = bool(flags & GAMEOVER)
+        screen.temp = (tx, ty) if flags & TEMP else None
+        screen.objectives[:] = [objective for bit, objective in enumerate(self.objectives) if objectives & 1 << bit]
+        for system in screen.systems:
+            system.pause = screen.paused
+
+        # Move the world back
+        static = screen.gameobjects.static
+        if (x, y) != tuple(static.offset):
+            screen.gameobjects.move(x - static.offset[0], y - static.offset[1])
+
+        boxes = []
+        for _ in range(dialogue):
+            id, typed, finished = _DIALOGUE.unpack_from(snapshot, offset)
+            offset += _DIALOGUE.size
+            box = self.objects[id]
+            box.seek(typed)
+            box.finished = bool(finished)
+            boxes.append(box)
+        screen.dialogue[:] = boxes
+
+        # Objects, adding those that had left the game and removing those that had not joined it yet
+        present = set()
+        for _ in range(count):
+            id, objectflags, ox, oy = _OBJECT.unpack_from(snapshot, offset)
+            offset += _OBJECT.size
+            object = self.objects[id]
+            present.add(object)
+
+            if objectflags & ANIMATED:
+                offset = self._unpackanimation(snapshot, offset, object)
+            for name in object.state:
+                setattr(object, name, _STATE.unpack_from(snapshot, offset)[0])
+                offset += _STATE.size
+            if id in self._spawns:
+                object.spawn = () if objectflags & SPENT else self._spawns[id]
+
+            object.move(ox + x - object.rect.x, oy + y - object.rect.y)
+            if object not in screen.gameobjects:
+                screen.gameobjects.add(object)
+
+        for object in screen.gameobjects.sprites():
+            if object not in present:
+                screen.gameobjects.remove(object)
+
+
+class Rewind:
+    """Ring buffer of the last few seconds of snapshots
+
+    Snapshots are packed into slots of a single preallocated buffer, so recording allocates nothing.
+
+    Attributes:
+        snapshots: Snapshots used to capture and restore the game
+        capacity: Number of snapshots kept
+        slotsize: Most bytes a snapshot can take up
+        count: Number of snapshots currently kept
+    """
+    def __init__(self, snapshots, seconds=10, fps=FPS, slotsize=1024):
+        """Allocates the buffer
+
+        Args:
+            snapshots: Snapshots of the game
+            seconds: Seconds of snapshots to keep (defaults to 10)
+            fps: Snapshots recorded per second (defaults to FPS)
+            slotsize: Most bytes a snapshot can take up (defaults to 1024)
+        """
+        self.snapshots = snapshots
+        self.capacity = max(int(seconds * fps), 1)
+        self.slotsize = slotsize
+        self.count = 0
+        self.fps = fps
+
+        self._buffer = bytearray(self.capacity * slotsize)
+        self._head = 0
+
+    def record(self):
+        """Records a snapshot of the game, replacing the oldest once the buffer is full"""
+        self.snapshots.pack_into(self._buffer, self._head * self.slotsize)
+        self._head = (self._head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def rewind(self, seconds=1):
+        """Steps the game back, forgetting the snapshots after the one restored
+
+        Args:
+            seconds: Seconds to step back, limited to the oldest snapshot kept (defaults to 1)
+
+        Returns:
+            True if there was a snapshot to restore
+        """
+        if not self.count:
+            return False
+
+        # The newest snapshot is the current tick, so step back one more than asked
+        steps = min(max(int(seconds * self.fps), 1) + 1, self.count)
+        self._head = (self._head - steps) % self.capacity
+        self.count -= steps - 1
+        self.snapshots.restore(self._buffer, self._head * self.slotsize)
+        self._head = (self._head + 1) % self.capacity
+        return True
@@ -0,0 +1,167 @@
+"""Spatial Index
+
+This file contains the cell index used to find objects near an actor without looking at every object in the level.
+Objects are bucketed into a grid of cells by an area around them. Objects that move around the level by themselves are
+rebucketed when refresh() finds they have moved into different cells.
+
+Areas are kept in the coordinates of the static object store, which do not change as the camera moves the world, so
+the world moving does not cause any object to be rebucketed.
+
+Author: Josh Rogers
+"""
+
+
+class CellIndex:
+    """Cell index
+
+    Attributes:
+        static: StaticObjects store whose offset is used to convert screen coordinates to store coordinates
+        cellsize: Width and height in pixels of each cell
+        version: Changes every time an object is added, removed or changes cells, so users of the index know to gather
+            objects again
+    """
+    def __init__(self, static, cellsize=64):
+        """Init
+
+        Args:
+            static: StaticObjects store of the level
+            cellsize: Width and height in pixels of each cell (defaults to 64)
+        """
+        self.static = static
+        self.cellsize = cellsize
+        self.version = 0
+
+        self._cells = {}
+        self._objects = {}
+        self._moving = []
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, object):
+        return object in self._objects
+
+    def area(self, object):
+        """Gets the area an object is bucketed by
+
+        Args:
+            object: Object in the index
+
+        Returns:
+            pygame.Rect in screen coordinates, by default the rect of the object
+        """
+        return object.rect
+
+    def tostore(self, rect):
+        """Converts a rect from screen to store coordinates
+
+        Args:
+            rect: pygame.Rect in screen coordinates
+
+        Returns:
+            pygame.Rect in store coordinates
+        """
+        return rect.move(-self.static.offset[0], -self.static.offset[1])
+
+    def cellrange(self, rect):
+        """Gets the cells covered by a rect
+
+        Args:
+            rect: pygame.Rect in store coordinates
+
+        Returns:
+            Tuple of the (left, top, right, bottom) cells
+        """
+        size = self.cellsize
+        return rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size
+
+    def _bucket(self, object, cells, add):
+        """Adds or removes an object from the cells in a range"""
+        left, top, right, bottom = cells
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                if add:
+                    self._cells.setdefault((column, row), set()).add(object)
+                else:
+                    bucket = self._cells[(column, row)]
+                    bucket.discard(object)
+                    if not bucket:
+                        del self._cells[(column, row)]
+        self.version += 1
+
+    def add(self, object, moving=False):
+        """Adds an object
+
+        Args:
+            object: Object to add
+            moving: Boolean indicating the object moves around the level by itself, so it is checked for having moved
+                by refresh() (defaults to False)
+        """
+        rect = self.tostore(self.area(object))
+        cells = self.cellrange(rect)
+        self._objects[object] = [rect, cells]
+        self._bucket(object, cells, True)
+        if moving:
+            self._moving.append(object)
+
+    def remove(self, object):
+        """Removes an object
+
+        Args:
+            object: Object to remove
+        """
+        rect, cells = self._objects.pop(object)
+        self._bucket(object, cells, False)
+        if object in self._moving:
+            self._moving.remove(object)
+
+    def rect(self, object):
+        """Gets the area of an object in the index
+
+        Args:
+            object: Object in the index
+
+        Returns:
+            pygame.Rect in store coordinates, as of the last refresh()
+        """
+        return self._objects[object][0]
+
+    def refresh(self):
+        """Updates the areas of moving objects, rebucketing those that have changed cells
+
+        Returns:
+            Set of the objects that have moved
+        """
+        moved = set()
+        for object in self._moving:
+            entry = self._objects[object]
+            rect = self.tostore(self.area(object))
+            if rect != entry[0]:
+                entry[0] = rect
+                moved.add(object)
+                cells = self.cellrange(rect)
+                if cells != entry[1]:
+                    self._bucket(object, entry[1], False)
+                    self._bucket(object, cells, True)
+                    entry[1] = cells
+
+        return moved
+
+    def gather(self, cells):
+        """Gets the objects in a range of cells
+
+        Args:
+            cells: Tuple of the (left, top, right, bottom) cells
+
+        Returns:
+            Set of objects
+        """
+        objects = set()
+        left, top, right, bottom = cells
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                bucket = self._cells.get((column, row))
+                if bucket:
+                    objects.update(bucket)
+
+        return objects
@@ -0,0 +1,372 @@
+"""Static Objects
+
+This file contains the compact store used for static objects, such as floor tiles, walls and furniture that can not be
+interacted with. Rather than a sprite per object, each with its own dictionary, rects and group memberships, the store
+keeps parallel arrays of positions, bounding boxes, flags and ids into shared lists of images and names.
+
+Objects are bucketed by area so drawing and collision queries only look at objects near the area of interest. Moving
+the world only changes the offset of the store, rather than every object in it.
+
+Objects are sorted into draw order once, the first time the store is read after objects have been added. As this
+renumbers the objects, StaticObject views from before objects were added should not be kept.
+
+Author: Josh Rogers
+"""
+
+from array import array
+
+import pygame
+
+from dindins.settings import OBJECT
+from dindins.collision import fingerprint, getmask
+
+# Flags
+BOX = 1
+PRECISE = 2
+
+
+class StaticObject:
+    """View of an object in the store
+
+    A lightweight stand in for a BaseObject, created when an object is returned from a query. It has the attributes
+    used by collision and navigation, read from the store as they are accessed so they are always up to date with the
+    offset of the store.
+    """
+    __slots__ = ('store', 'index')
+
+    interactable = False
+    triggerable = False
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, StaticObject) and self.store is other.store and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+
+    @property
+    def name(self):
+        return self.store.names[self.store.name[self.index]]
+
+    @property
+    def image(self):
+        return self.store.images[self.store.asset[self.index]]
+
+    @property
+    def rect(self):
+        store = self.store
+        i = self.index
+        width, height = store.images[store.asset[i]].get_size()
+        return pygame.Rect(store.x[i] + store.offset[0], store.y[i] + store.offset[1], width, height)
+
+    @property
+    def boundingbox(self):
+        store = self.store
+        i = self.index
+        if not store.flags[i] & BOX:
+            return None
+        return pygame.Rect(store.bx[i] + store.offset[0], store.by[i] + store.offset[1], store.bw[i], store.bh[i])
+
+    @property
+    def mask(self):
+        store = self.store
+        if not store.flags[self.index] & PRECISE:
+            return None
+        return getmask(store.images[store.asset[self.index]])
+
+
+class StaticObjects:
+    """Static object store
+
+    Attributes:
+        x: Array of the left of each object
+        y: Array of the top of each object
+        bx: Array of the left of each bounding box
+        by: Array of the top of each bounding box
+        bw: Array of the width of each bounding box
+        bh: Array of the height of each bounding box
+        flags: Array of flags for each object
+        layer: Array of the draw layer of each object
+        seq: Array of the order each object was added to its group, used to keep draw order stable
+        asset: Array of the index of each object's image in images
+        name: Array of the index of each object's name in names
+        images: List of the unique images used by objects
+        names: List of the unique names used by objects
+        offset: [x, y] the world has moved since objects were added
+        bucketsize: Width and height in pixels of the buckets objects are sorted into
+    """
+    def __init__(self, bucketsize=256):
+        """Init
+
+        Args:
+            bucketsize: Width and height in pixels of the buckets objects are sorted into (defaults to 256)
+        """
+        self.x = array('i')
+        self.y = array('i')
+        self.bx = array('i')
+        self.by = array('i')
+        self.bw = array('i')
+        self.bh = array('i')
+        self.flags = array('B')
+        self.layer = array('B')
+        self.seq = array('I')
+        self.asset = array('H')
+        self.name = array('H')
+
+        self.images = []
+        self.names = []
+        self.offset = [0, 0]
+        self.bucketsize = bucketsize
+
+        self._buckets = {}
+        self._assets = {}
+        self._surfaces = []
+        self._fingerprints = {}
+        self._names = {}
+        self._sorted = True
+
+    def __len__(self):
+        return len(self.x)
+
+    def _assetid(self, image):
+        """Gets the index of an image, adding it if it is new"""
+        asset = self._assets.get(id(image))
+        if asset is None:
+            key = fingerprint(image)
+            asset = self._fingerprints.get(key)
+            if asset is None:
+                asset = len(self.images)
+                self.images.append(image)
+                self._fingerprints[key] = asset
+            # Keep the surface alive so its id is not reused
+            self._assets[id(image)] = asset
+            self._surfaces.append(image)
+
+        return asset
+
+    def _nameid(self, name):
+        """Gets the index of a name, adding it if it is new"""
+        nameid = self._names.get(name)
+        if nameid is None:
+            nameid = len(self.names)
+            self.names.append(name)
+            self._names[name] = nameid
+
+        return nameid
+
+    def _bucketrange(self, rect):
+        """Gets the buckets covered by a rect in store coordinates"""
+        size = self.bucketsize
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield column, row
+
+    def add(self, object, seq=None):
+        """Copies an object into the store
+
+        The object itself is not kept, so it can be discarded once added.
+
+        Args:
+            object: BaseObject to add
+            seq: Order the object was added to its group (defaults to the number of objects in the store)
+        """
+        index = len(self)
+        rect = object.rect.move(-self.offset[0], -self.offset[1])
+        self.x.append(rect.x)
+        self.y.append(rect.y)
+
+        box = object.boundingbox
+        if box:
+            box = box.move(-self.offset[0], -self.offset[1])
+            self.bx.append(box.x)
+            self.by.append(box.y)
+            self.bw.append(box.width)
+            self.bh.append(box.height)
+            area = rect.union(box)
+        else:
+            self.bx.append(0)
+            self.by.append(0)
+            self.bw.append(0)
+            self.bh.append(0)
+            area = rect
+
+        self.flags.append((BOX if box else 0) | (PRECISE if object.mask is not None else 0))
+        self.layer.append(object.layer)
+        self.seq.append(index if seq is None else seq)
+        self.asset.append(self._assetid(object.image))
+        self.name.append(self._nameid(object.name))
+
+        self._bucket(index, area)
+        self._sorted = False
+
+    def _bucket(self, index, area):
+        """Adds an object to the buckets covering an area in store coordinates"""
+        for bucket in self._bucketrange(area):
+            if bucket not in self._buckets:
+                self._buckets[bucket] = array('I')
+            self._buckets[bucket].append(index)
+
+    def key(self, index):
+        """Gets the draw order key of an object
+
+        Objects are drawn by layer, then by the bottom of their image on the OBJECT layer, then in the order they were
+        added. The bottom is in store coordinates, which are the screen coordinates before the world moved.
+
+        Args:
+            index: Index of the object
+
+        Returns:
+            Tuple (layer, bottom, seq)
+        """
+        layer = self.layer[index]
+        bottom = self.y[index] + self.images[self.asset[index]].get_height() if layer == OBJECT else 0
+        return layer, bottom, self.seq[index]
+
+    def sort(self):
+        """Sorts the objects into draw order"""
+        if self._sorted:
+            return
+        self._sorted = True
+
+        order = sorted(range(len(self)), key=self.key)
+        for attribute in ('x', 'y', 'bx', 'by', 'bw', 'bh', 'flags', 'layer', 'seq', 'asset', 'name'):
+            values = getattr(self, attribute)
+            setattr(self, attribute, array(values.typecode, [values[i] for i in order]))
+
+        self._buckets = {}
+        for i in range(len(self)):
+            width, height = self.images[self.asset[i]].get_size()
+            area = pygame.Rect(self.x[i], self.y[i], width, height)
+            if self.flags[i] & BOX:
+                area.union_ip(pygame.Rect(self.bx[i], self.by[i], self.bw[i], self.bh[i]))
+            self._bucket(i, area)
+
+    def move(self, x, y):
+        """Shifts every object in the store
+
+        Args:
+            x: Pixel value to move the objects horizontally
+            y: Pixel value to move the objects vertically
+        """
+        self.offset[0] += x
+        self.offset[1] += y
+
+    def bounds(self):
+        """Gets the area covered by every object in the store
+
+        Returns:
+            pygame.Rect in screen coordinates
+        """
+        self.sort()
+        sizes = [image.get_size() for image in self.images]
+        left = min(self.x)
+        top = min(self.y)
+        right = max(x + sizes[asset][0] for x, asset in zip(self.x, self.asset))
+        bottom = max(y + sizes[asset][1] for y, asset in zip(self.y, self.asset))
+        return pygame.Rect(left + self.offset[0], top + self.offset[1], right - left, bottom - top)
+
+    def indices(self, area):
+        """Gets the objects that may be within an area
+
+        Args:
+            area: pygame.Rect in screen coordinates
+
+        Returns:
+            Sorted list of the index of each object in the buckets covering the area, in draw order
+        """
+        self.sort()
+        area = area.move(-self.offset[0], -self.offset[1])
+        found = set()
+        for bucket in self._bucketrange(area):
+            objects = self._buckets.get(bucket)
+            if objects:
+                found.update(objects)
+
+        return sorted(found)
+
+    def query(self, area):
+        """Gets the objects whose image or bounding box is within an area
+
+        Args:
+            area: pygame.Rect in screen coordinates
+
+        Returns:
+            List of StaticObject
+        """
+        objects = []
+        for i in self.indices(area):
+            object = StaticObject(self, i)
+            box = object.boundingbox
+            if area.colliderect(object.rect) or (box and area.colliderect(box)):
+                objects.append(object)
+
+        return objects
+
+    def colliders(self, area=None):
+        """Gets the objects with a bounding box
+
+        Args:
+            area: pygame.Rect in screen coordinates to limit the search to (defaults to None, for every object)
+
+        Returns:
+            List of StaticObject
+        """
+        self.sort()
+        if area is None:
+            return [StaticObject(self, i) for i in range(len(self)) if self.flags[i] & BOX]
+
+        objects = []
+        for i in self.indices(area):
+            if self.flags[i] & BOX:
+                object = StaticObject(self, i)
+                if area.colliderect(object.boundingbox):
+                    objects.append(object)
+
+        return objects
+
+    def get(self, objectname):
+        """Gets the first object with a name
+
+        Args:
+            objectname: Name of the object
+
+        Returns:
+            StaticObject, or None if there is no object with the name
+        """
+        self.sort()
+        nameid = self._names.get(objectname)
+        if nameid is not None:
+            for i in range(len(self)):
+                if self.name[i] == nameid:
+                    return StaticObject(self, i)
+
+        return None
+
+    def buildmasks(self):
+        """Enables precise collision on every object with a bounding box
+
+        As with BaseObject.buildmask(), the bounding box is replaced by the rect of the image.
+        """
+        self.sort()
+        for i in range(len(self)):
+            if self.flags[i] & BOX:
+                self.bx[i] = self.x[i]
+                self.by[i] = self.y[i]
+                self.bw[i], self.bh[i] = self.images[self.asset[i]].get_size()
+                self.flags[i] |= PRECISE
+
+    def draw(self, surface):
+        """Draws the objects within a surface
+
+        Args:
+            surface: pygame.Surface to draw on
+        """
+        x, y = self.offset
+        images = self.images
+        surface.blits(
+            [(images[self.asset[i]], (self.x[i] + x, self.y[i] + y)) for i in self.indices(surface.get_rect())],
+            doreturn=False
+        )
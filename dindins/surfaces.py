@@ -0,0 +1,192 @@
+"""Surfaces
+
+This file contains the surface pool and the surface allocation tracker.
+
+Every pygame.Surface owns a pixel buffer, so creating one every time a short lived widget such as a dialogue box
+appears means allocating, and later freeing, a fresh buffer. The surface pool keeps surfaces that are no longer needed,
+so the next widget of the same size leases one rather than allocating.
+
+The allocation tracker, used by python -m dindins --track-surfaces, counts every surface made each frame by the line of
+the game that made it. It replaces pygame.Surface with a subclass that records where it was created, so it must be
+installed before the game is imported for subclasses of pygame.Surface, such as the screens and GUI objects, to be
+counted. Surfaces made by pygame itself are counted where font rendering, image loading, transforms, copies and
+conversions are called.
+
+Author: Josh Rogers
+"""
+
+import os
+import sys
+from collections import Counter
+
+import pygame
+
+
+class SurfacePool:
+    """Pool of reusable surfaces
+
+    Attributes:
+        limit: Most free surfaces of each size and flags kept
+        allocated: Number of surfaces the pool has had to make
+        leased: Number of surfaces leased
+    """
+    def __init__(self, limit=4):
+        """Init
+
+        Args:
+            limit: Most free surfaces of each size and flags kept (defaults to 4)
+        """
+        self.limit = limit
+        self.allocated = 0
+        self.leased = 0
+        self._free = {}
+
+    def lease(self, size, flags=0):
+        """Leases a surface, making one only if there is no free surface of the same size and flags
+
+        The contents of a leased surface are left over from whoever had it last.
+
+        Args:
+            size: (width, height) of the surface
+            flags: pygame surface flags, such as pygame.SRCALPHA (defaults to 0)
+
+        Returns:
+            pygame.Surface
+        """
+        self.leased += 1
+        free = self._free.get((tuple(size), flags))
+        if free:
+            return free.pop()
+
+        self.allocated += 1
+        return pygame.Surface(size, flags)
+
+    def release(self, surface):
+        """Returns a leased surface to the pool
+
+        Args:
+            surface: pygame.Surface from lease(), which must not be used again
+        """
+        key = (surface.get_size(), surface.get_flags() & pygame.SRCALPHA)
+        free = self._free.setdefault(key, [])
+        if len(free) < self.limit:
+            free.append(surface)
+
+
+# Pool shared by the GUI
+pool = SurfacePool()
+
+
+class AllocationTracker:
+    """Surface allocation tracker
+
+    Attributes:
+        frames: Number of frames marked with frame()
+        total: Counter of the surfaces made at each call site over every frame
+        peak: Counter of the most surfaces made at each call site in a single frame
+        current: Counter of the surfaces made at each call site in the current frame
+    """
+    # pygame functions that return new surfaces, by module
+    FUNCTIONS = {
+        pygame.image: ('load', 'frombytes', 'fromstring', 'frombuffer'),
+        pygame.transform: ('scale', 'smoothscale', 'scale2x', 'rotate', 'rotozoom', 'flip'),
+    }
+
+    # Surface methods that return new surfaces
+    METHODS = ('copy', 'convert', 'convert_alpha')
+
+    def __init__(self, root=None):
+        """Init
+
+        Args:
+            root: Directory of the code whose call sites are counted, others are counted against the first line of
+                that code in the stack (defaults to the dindins package)
+        """
+        self.root = root or os.path.dirname(os.path.abspath(__file__))
+        self.frames = 0
+        self.total = Counter()
+        self.peak = Counter()
+        self.current = Counter()
+        self._originals = {}
+
+    def _site(self):
+        """Gets the first line of game code in the stack, outside of this file and of surface constructors"""
+        frame = sys._getframe(2)
+        while frame:
+            code = frame.f_code
+            if code.co_filename != __file__ and code.co_filename.startswith(self.root):
+                if code.co_name != '__init__' or not isinstance(frame.f_locals.get('self'), pygame.Surface):
+                    return f'{os.path.relpath(code.co_filename, self.root)}:{frame.f_lineno} {code.co_name}'
+            frame = frame.f_back
+        return 'pygame'
+
+    def _count(self):
+        self.current[self._site()] += 1
+
+    def install(self):
+        """Starts tracking, must be called before the game is imported to track subclasses of pygame.Surface"""
+        tracker = self
+        original = pygame.Surface
+
+        class Surface(original):
+            def __init__(self, *args, **kwargs):
+                tracker._count()
+                super().__init__(*args, **kwargs)
+
+        for name in self.METHODS:
+            def method(self, *args, _name=name, **kwargs):
+                tracker._count()
+                return getattr(original, _name)(self, *args, **kwargs)
+            setattr(Surface, name, method)
+
+        class Font(pygame.font.Font):
+            def render(self, *args, **kwargs):
+                tracker._count()
+                return super().render(*args, **kwargs)
+
+        self._originals[(pygame, 'Surface')] = original
+        self._originals[(pygame.font, 'Font')] = pygame.font.Font
+        pygame.Surface = Surface
+        pygame.font.Font = Font
+
+        for module, names in self.FUNCTIONS.items():
+            for name in names:
+                function = getattr(module, name, None)
+                if function is None:
+                    continue
+
+                def wrapper(*args, _function=function, **kwargs):
+                    tracker._count()
+                    return _function(*args, **kwargs)
+
+                self._originals[(module, name)] = function
+                setattr(module, name, wrapper)
+
+    def uninstall(self):
+        """Stops tracking, surfaces of classes defined while tracking was installed are still counted"""
+        for (module, name), original in self._originals.items():
+            setattr(module, name, original)
+        self._originals = {}
+
+    def frame(self):
+        """Marks the end of a frame"""
+        self.frames += 1
+        self.total.update(self.current)
+        for site, count in self.current.items():
+            if count > self.peak[site]:
+                self.peak[site] = count
+        self.current.clear()
+
+    def report(self, file=sys.stderr, limit=20):
+        """Prints the call sites that made the most surfaces
+
+        Args:
+            file: File to print to (defaults to sys.stderr)
+            limit: Most call sites to print (defaults to 20)
+        """
+        frames = max(self.frames, 1)
+        print(f'Surfaces made over {self.frames} frames: {sum(self.total.values())} '
+              f'({sum(self.total.values()) / frames:.2f} per frame)', file=file)
+        print(f'{"per frame":>10} {"peak":>6} {"total":>7}  call site', file=file)
+        for site, count in self.total.most_common(limit):
+            print(f'{count / frames:>10.2f} {self.peak[site]:>6} {count:>7}  {site}', file=file)
@@ -0,0 +1,116 @@
+"""Trigger Zones
+
+This file contains the trigger zone index, which tracks which triggerable objects each actor, such as the player, is
+standing in. Rather than testing every trigger against the player every frame, zones are bucketed into a grid of cells
+and each actor only looks at the zones in the cells it covers. Those candidates are only gathered again when the actor
+moves into different cells, or when a zone is added, removed or moves between cells, and are only tested when the
+actor or one of them has moved. An actor standing still, or walking through cells with no zones, costs next to nothing.
+
+Zones are told when an actor enters, stays in and exits them with their on_enter(), on_stay() and on_exit() methods,
+so a trigger fires once when the player walks into it rather than every frame they overlap.
+
+Author: Josh Rogers
+"""
+
+from dindins.spatial import CellIndex
+
+
+class _Actor:
+    """State of an actor"""
+    __slots__ = ('rect', 'cells', 'version', 'candidates', 'inside')
+
+    def __init__(self):
+        self.rect = None
+        self.cells = None
+        self.version = -1
+        self.candidates = ()
+        self.inside = set()
+
+
+class TriggerZones(CellIndex):
+    """Trigger zone index"""
+    def __init__(self, static, cellsize=64):
+        """Init
+
+        Args:
+            static: StaticObjects store of the level
+            cellsize: Width and height in pixels of each cell (defaults to 64)
+        """
+        super().__init__(static, cellsize)
+        self._actors = {}
+
+    def remove(self, zone):
+        """Removes a zone
+
+        Actors in the zone are not told they have left it.
+
+        Args:
+            zone: Triggerable object
+        """
+        super().remove(zone)
+        for actor in self._actors.values():
+            actor.inside.discard(zone)
+
+    def inside(self, actor):
+        """Gets the zones an actor is in
+
+        Args:
+            actor: Sprite of the actor
+
+        Returns:
+            Set of zones
+        """
+        state = self._actors.get(actor)
+        return set(state.inside) if state else set()
+
+    def update(self, actors):
+        """Updates which zones each actor is in
+
+        Calls on_exit() on zones actors have left, on_enter() on zones actors have walked into and on_stay() on zones
+        actors were already in.
+
+        Args:
+            actors: Sprites of the actors, usually just the player
+
+        Returns:
+            List of the zones walked into
+        """
+        moved = self.refresh()
+        entered = []
+
+        for actor in actors:
+            state = self._actors.get(actor)
+            if state is None:
+                state = self._actors[actor] = _Actor()
+
+            rect = self.tostore(actor.rect)
+            changed = rect != state.rect
+            state.rect = rect
+
+            # Gather the zones in the cells the actor covers
+            cells = self.cellrange(rect)
+            if cells != state.cells or state.version != self.version:
+                state.cells = cells
+                state.version = self.version
+                state.candidates = self.gather(cells)
+                changed = True
+
+            # Only test again if something has moved
+            if changed or not moved.isdisjoint(state.candidates):
+                inside = {zone for zone in state.candidates if rect.colliderect(self.rect(zone))}
+            else:
+                inside = state.inside
+
+            for zone in state.inside - inside:
+                zone.on_exit(actor)
+
+            for zone in list(inside):
+                if zone in state.inside:
+                    zone.on_stay(actor)
+                else:
+                    zone.on_enter(actor)
+                    entered.append(zone)
+
+            state.inside = inside
+
+        return entered